@@ -9,63 +9,105 @@ import cv2
 import joblib
 import numpy as np
 import os
-import threading
-import pygame
 import time
-from gtts import gTTS
-import queue  # Prevent overlapping speech
-import tempfile
 from kivy.app import App
 from kivy.core.text import LabelBase  
-from conversion import RealTimeRecognition
-from sklearn.preprocessing import StandardScaler
+from conversion import RealTimeRecognition, MODEL_PATH, SCALER_PATH, PCA_PATH, PIPELINE_PATH, ARTIFACT_PATH, ONLINE_MODEL_PATH
+from model_artifact import LazyPredictor, read_meta, pipeline_uses_pca
+import startup_profile
+from pipeline import RecognitionPipeline, AdaptiveRate
+from recognition_server import RemoteRecognition
+from tts_cache import prewarm_in_background
+from audio_worker import get_audio_worker
+from stage_metrics import get_stage_metrics, log
+from frame_source import open_source
 
 # Register Kannada Font
-LabelBase.register(name="KannadaFont", fn_regular="NotoSansKannada-Regular.ttf")
-
-# Speech Queue to Prevent Overlapping Speech
-speech_queue = queue.Queue()
+with startup_profile.span("font:KannadaFont", "font"):
+    LabelBase.register(name="KannadaFont", fn_regular="NotoSansKannada-Regular.ttf")
 
 def speak_kannada(text):
-    """Converts text to Kannada speech and plays it asynchronously without overlap."""
+    """Queues text on the shared audio worker, which plays it without overlap."""
     # Ensure text is a string
     text = str(text)
     if text and text.strip() and text != "None":
-        print(f"🗣 Speaking: {text}")
-
-        def play_audio():
-            try:
-                pygame.mixer.init()
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_audio:
-                    audio_path = temp_audio.name
-                tts = gTTS(text=text, lang='kn')
-                tts.save(audio_path)
-                pygame.mixer.music.load(audio_path)
-                pygame.mixer.music.play()
-                while pygame.mixer.music.get_busy():
-                    time.sleep(0.1)
-                pygame.mixer.quit()
-                time.sleep(0.5)  # Ensure file is not deleted while playing
-                os.remove(audio_path)
-            except Exception as e:
-                print(f"⚠️ Voice Output Error: {e}")
-
-        # Add to queue only if not already busy
-        if speech_queue.qsize() == 0:
-            speech_queue.put(play_audio)
-
-def process_speech_queue(dt):
-    """Process queued speech commands safely."""
-    if not speech_queue.empty():
-        task = speech_queue.get()
-        threading.Thread(target=task, daemon=True).start()
-
-Clock.schedule_interval(process_speech_queue, 1.0)
+        get_audio_worker().speak(text)
+
+class PreviewRenderer:
+    """Uploads camera frames into one reusable texture per resolution.
+
+    Frames are blitted as BGR straight from the NumPy buffer (no colour conversion, no
+    `tobytes()` copy), and the camera flip is applied through the texture coordinates
+    instead of copying the pixels.
+    """
+
+    def __init__(self, image_widget, flip_code=-1, metrics=None):
+        self.image_widget = image_widget
+        self.flip_code = flip_code
+        self.texture = None
+        self.metrics = metrics or get_stage_metrics()
+
+    def _create_texture(self, width, height):
+        texture = Texture.create(size=(width, height), colorfmt='bgr')
+        # Same on-screen result as cv2.flip(frame, flip_code) followed by an upload
+        if self.flip_code in (0, -1):
+            texture.flip_vertical()
+        if self.flip_code in (1, -1):
+            texture.flip_horizontal()
+        return texture
+
+    def render(self, frame):
+        """Blit a BGR frame into the cached texture and redraw the image widget."""
+        start = self.metrics.now()
+        height, width = frame.shape[:2]
+        if self.texture is None or self.texture.size != (width, height):
+            self.texture = self._create_texture(width, height)
+            self.image_widget.texture = self.texture
+
+        if not frame.flags['C_CONTIGUOUS']:
+            frame = np.ascontiguousarray(frame)
+        self.texture.blit_buffer(frame.data, colorfmt='bgr', bufferfmt='ubyte')
+        self.image_widget.canvas.ask_update()
+        self.metrics.record("texture_upload", start)
+        self.metrics.tick("render")
+
 
 class DisplayScreen(Screen):
-    def __init__(self, **kwargs):
+    def __init__(self, pipelined=True, server_url=None, metrics_overlay=None, source=None,
+                 idle_after=None, watch_fps=2.0, inference_width=None, crop_padding=None, **kwargs):
         super().__init__(**kwargs)
 
+        # Idle kiosks drop to a low-rate watch mode after `idle_after` seconds without a hand
+        if idle_after is None:
+            idle_after = float(os.environ.get("SIGNCONNECT_IDLE_AFTER", 10.0))
+        self.idle_after = idle_after
+        self.watch_fps = watch_fps
+        self.rate = None
+
+        # Hand-tracker speed knobs (see conversion.HandTracker); unset means full-frame, full-resolution
+        if inference_width is None and os.environ.get("SIGNCONNECT_INFERENCE_WIDTH"):
+            inference_width = int(os.environ["SIGNCONNECT_INFERENCE_WIDTH"])
+        if crop_padding is None and os.environ.get("SIGNCONNECT_CROP_PADDING"):
+            crop_padding = float(os.environ["SIGNCONNECT_CROP_PADDING"])
+        self.inference_width = inference_width
+        self.crop_padding = crop_padding
+
+        # Frame source spec: camera index, video file, image directory or "synthetic"
+        self.source = source if source is not None else os.environ.get("SIGNCONNECT_SOURCE", "0")
+
+        # Per-stage latency histograms; the overlay shows them live (SIGNCONNECT_METRICS_OVERLAY=1)
+        self.metrics = get_stage_metrics()
+        if metrics_overlay is None:
+            metrics_overlay = os.environ.get("SIGNCONNECT_METRICS_OVERLAY") == "1"
+
+        # Client mode: recognition runs on a shared recognition_server.py backend
+        self.server_url = server_url or os.environ.get("SIGNCONNECT_SERVER")
+
+        # Pipelined mode runs capture and recognition off the UI thread
+        self.pipelined = pipelined
+        self.pipeline = None
+        self.last_frame_seq = 0
+
         # To store last spoken sign to avoid repeating speech
         self.last_spoken_sign = None
 
@@ -81,6 +123,19 @@ class DisplayScreen(Screen):
         )
         layout.add_widget(self.kannada_label)
 
+        self.metrics_label = None
+        if metrics_overlay:
+            self.metrics_label = Label(
+                text="",
+                font_size=12,
+                size_hint=(1, 0.15),
+                halign='left',
+                valign='top',
+                color=(1, 1, 0, 1)
+            )
+            self.metrics_label.bind(size=lambda label, size: setattr(label, 'text_size', size))
+            layout.add_widget(self.metrics_label)
+
         # Buttons
         self.start_button = Button(text="Start Sign Recognition", size_hint=(1, 0.1))
         self.start_button.bind(on_press=self.start_recognition)
@@ -93,6 +148,10 @@ class DisplayScreen(Screen):
         # Camera Feed
         self.img = Image(size_hint=(1, 1))
         layout.add_widget(self.img)
+        # Fix camera orientation (adjust as necessary; here we flip both axes)
+        self.flip_code = -1
+        self.preview = PreviewRenderer(self.img, self.flip_code, self.metrics)
+        self.flip_buffer = None
 
         # Back Button
         self.back_button = Button(
@@ -105,15 +164,63 @@ class DisplayScreen(Screen):
 
         self.add_widget(layout)
 
-        # Load Model & Scaler
-        BASE_PATH = r"C:\Users\Kingshuk Maji\Documents\Sign_Connect\Sign Connect"
-        MODEL_PATH = os.path.join(BASE_PATH, "Models", "SVM", "svm_model.pkl")
-        SCALER_PATH = os.path.join(BASE_PATH, "Models", "SVM", "scaler.pkl")
+        self.recognition = None
+        self.video_capture = None
+        self.model = None
+        self.scaler = None
+        self.pca = None
+        self.predictor = None
+        self.online_predictor = None  # Set while the online model knows signs the SVM does not
+        self.online_mtime = None
+        if self.server_url:
+            print(f"✅ Using recognition server at {self.server_url}")
+
+    def load_model(self):
+        """Load the classifier, then pick up signs added with "Add Sign (Quick)" since the last full training."""
+        if not self.load_base_model():
+            return False
+        self.load_online_model()
+        return True
+
+    def load_online_model(self):
+        """Use the online model while it knows signs the SVM has not been trained on (reloaded when it changes)."""
+        from incremental_training import load_online_model
+
+        if not os.path.exists(ONLINE_MODEL_PATH):
+            self.online_predictor, self.online_mtime = None, None
+            return
+        mtime = os.path.getmtime(ONLINE_MODEL_PATH)
+        if mtime == self.online_mtime:
+            return
+        self.online_mtime = mtime
+        known_classes = self.model.classes_ if self.model is not None else read_meta(ARTIFACT_PATH)["classes"]
+        self.online_predictor = load_online_model(ONLINE_MODEL_PATH, known_classes)
+        if self.online_predictor is not None:
+            print(f"✅ Using the online model ({len(self.online_predictor.classes_)} signs, including quickly added ones)")
+            prewarm_in_background(self.online_predictor)  # Cache speech for the new sign labels
+
+    def load_base_model(self):
+        """Load the classifier on first use instead of at app start.
+
+        Prefers the memory-mapped model artifact; falls back to the pickled model & scaler (and
+        PCA, if training recorded it as part of the pipeline).
+        """
+        if self.model is not None or self.predictor is not None:
+            return True
+
+        if os.path.exists(ARTIFACT_PATH):
+            self.predictor = LazyPredictor(ARTIFACT_PATH)
+            prewarm_in_background(self.predictor)  # Loads the artifact and caches speech for every sign label
+            return True
+
+        from sklearn.preprocessing import StandardScaler
 
         try:
-            self.model = joblib.load(MODEL_PATH) if os.path.exists(MODEL_PATH) else None
+            with startup_profile.span("model:svm_model.pkl", "model"):
+                self.model = joblib.load(MODEL_PATH) if os.path.exists(MODEL_PATH) else None
             if self.model:
                 print("✅ Model loaded successfully!")
+                prewarm_in_background(self.model)  # Cache speech for every sign label
             else:
                 print(f"❌ Error: Model file '{MODEL_PATH}' not found.")
         except Exception as e:
@@ -121,55 +228,122 @@ class DisplayScreen(Screen):
             self.model = None
 
         try:
-            self.scaler = joblib.load(SCALER_PATH) if os.path.exists(SCALER_PATH) else StandardScaler()
+            with startup_profile.span("model:scaler.pkl", "model"):
+                self.scaler = joblib.load(SCALER_PATH) if os.path.exists(SCALER_PATH) else StandardScaler()
         except Exception as e:
             print(f"⚠️ Error loading scaler: {e}")
             self.scaler = StandardScaler()
 
-        self.recognition = None
-        self.video_capture = None
+        # ✅ PCA only when training says the model was fitted behind it
+        try:
+            with startup_profile.span("model:pca.pkl", "model"):
+                self.pca = joblib.load(PCA_PATH) if pipeline_uses_pca(PIPELINE_PATH) else None
+        except Exception as e:
+            print(f"⚠️ Error loading PCA: {e}")
+            self.pca = None
+
+        startup_profile.flush("model_loaded")
+        return self.model is not None
 
     def start_recognition(self, instance):
         """Start real-time recognition."""
-        if not self.model:
+        if not self.server_url and not self.load_model():
             print("❌ Error: Model is not loaded. Cannot start recognition.")
             return
 
-        self.stop_button.disabled = False
-        self.start_button.disabled = True
-        self.recognition = RealTimeRecognition(self.model, self.scaler)
-
-        self.video_capture = cv2.VideoCapture(0)
+        # The screen owns the camera: it is opened once here and shared with the recogniser
+        self.video_capture = open_source(self.source)
         if not self.video_capture.isOpened():
             print("❌ Error: Webcam not accessible.")
-            self.start_button.disabled = False
-            self.stop_button.disabled = True
+            self.video_capture = None
             return
 
-        Clock.schedule_interval(self.update_recognition, 1.0 / 30.0)
+        self.stop_button.disabled = False
+        self.start_button.disabled = True
+        if self.server_url:
+            self.recognition = RemoteRecognition(self.server_url)
+        else:
+            # Speech is driven from this screen, so the recogniser itself stays silent
+            self.recognition = RealTimeRecognition(self.model, self.scaler, self.pca, speak=False,
+                                                   predictor=self.online_predictor or self.predictor,
+                                                   inference_width=self.inference_width, crop_padding=self.crop_padding,
+                                                   metrics=self.metrics, video_capture=self.video_capture)
+
+        self.rate = AdaptiveRate(idle_after=self.idle_after, watch_fps=self.watch_fps)
+        if self.pipelined:
+            self.pipeline = RecognitionPipeline(
+                self.video_capture,
+                self.recognition,
+                on_result=self.show_recognition_result,
+                flip_code=self.flip_code,
+                dispatch=lambda callback, *args: Clock.schedule_once(lambda dt: callback(*args)),
+                metrics=self.metrics,
+                rate=self.rate,
+            )
+            self.last_frame_seq = 0
+            self.pipeline.start()
+            Clock.schedule_interval(self.render_preview, 1.0 / 30.0)
+        else:
+            Clock.schedule_interval(self.update_recognition, 1.0 / 30.0)
+
+        if self.metrics_label:
+            Clock.schedule_interval(self.update_metrics_overlay, 0.5)
 
     def stop_recognition(self, instance):
         """Stop recognition and release the camera."""
+        Clock.unschedule(self.update_recognition)
+        Clock.unschedule(self.render_preview)
+        Clock.unschedule(self.update_metrics_overlay)
+        if self.pipeline:
+            self.pipeline.stop()
+            self.pipeline = None
         if self.video_capture and self.video_capture.isOpened():
             self.video_capture.release()
+        self.video_capture = None
         self.stop_button.disabled = True
         self.start_button.disabled = False
-        Clock.unschedule(self.update_recognition)
+
+    def render_preview(self, dt):
+        """Render stage of the pipelined mode: show the newest captured frame, if any."""
+        if not self.pipeline:
+            return
+
+        seq, frame = self.pipeline.latest_frame(self.last_frame_seq)
+        if frame is None:
+            return
+
+        self.last_frame_seq = seq
+        self.display_frame(frame)
 
     def update_recognition(self, dt):
         """Update the UI with the Kannada sign and display the webcam feed."""
         if not self.video_capture:
             return
 
+        start = self.metrics.now()
         ret, frame = self.video_capture.read()
         if not ret:
-            print("❌ Error: Unable to read frame.")
+            log.error("frame_read_failed", stage="update_recognition")
             return
-
-        # Fix camera orientation (adjust as necessary; here we flip vertically)
-        frame = cv2.flip(frame, -1)
-        _, kannada_sign = self.recognition.process_frame(frame)
-
+        start = self.metrics.record("capture", start)
+        self.metrics.tick("capture")
+
+        # Recognition sees the flipped frame; the preview flips through texture coordinates
+        if self.flip_buffer is None or self.flip_buffer.shape != frame.shape:
+            self.flip_buffer = frame.copy()
+        flipped = cv2.flip(frame, self.flip_code, dst=self.flip_buffer)
+        self.metrics.record("flip", start)
+
+        # In watch mode most ticks only refresh the preview
+        if self.rate.due():
+            started = time.monotonic()
+            _, kannada_sign = self.recognition.process_frame(flipped)
+            self.rate.update(getattr(self.recognition, "hand_present", True), started)
+            self.show_recognition_result(kannada_sign)
+        self.display_frame(frame)
+
+    def show_recognition_result(self, kannada_sign):
+        """Update the label and speech output for a recognised sign (UI thread only)."""
         # Ensure kannada_sign is a string
         kannada_sign = str(kannada_sign)
 
@@ -181,15 +355,23 @@ class DisplayScreen(Screen):
 
         # Trigger speech output only if the sign has changed
         if kannada_sign and kannada_sign != "None" and kannada_sign != self.last_spoken_sign:
+            start = self.metrics.now()
             speak_kannada(kannada_sign)
+            self.metrics.record("tts_enqueue", start)
             self.last_spoken_sign = kannada_sign
 
-        # Display the webcam feed
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        buf = frame.tobytes()
-        texture = Texture.create(size=(frame.shape[1], frame.shape[0]), colorfmt='rgb')
-        texture.blit_buffer(buf, colorfmt='rgb', bufferfmt='ubyte')
-        self.img.texture = texture
+    def update_metrics_overlay(self, dt):
+        """Refresh the on-screen latency overlay (twice a second, not per frame)."""
+        if self.metrics_label:
+            text = self.metrics.overlay_text()
+            if self.rate:
+                stats = self.rate.stats()
+                text = f"mode {stats['mode']}  duty cycle {stats['duty_cycle']:.0%}\n{text}"
+            self.metrics_label.text = text
+
+    def display_frame(self, frame):
+        """Display the (unflipped, BGR) webcam feed."""
+        self.preview.render(frame)
 
     def go_back_to_second(self, instance):
         """Navigate back to the second screen."""
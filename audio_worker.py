@@ -0,0 +1,174 @@
+import io
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from tts_cache import get_tts_cache
+
+# ✅ **Priorities** (lower value plays first)
+PRIORITY_EMERGENCY = 0
+PRIORITY_SIGN = 10
+
+
+class AudioWorker:
+    """One long-lived playback thread that owns the pygame mixer.
+
+    Requests go into a priority queue and wake the worker immediately. Emergency phrases
+    jump the queue and interrupt a sign that is currently playing. Sign utterances are
+    coalesced (only the newest pending sign is kept) and dropped if they went stale
+    before playback could start.
+    """
+
+    def __init__(self, cache=None, max_sign_age=2.0, lang="kn"):
+        self.cache = cache
+        self.max_sign_age = max_sign_age
+        self.lang = lang
+
+        self._heap = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._preempt = threading.Event()
+        self._playing_priority = None
+        self._running = False
+        self._thread = None
+
+        # ✅ **Metrics**
+        self.played = 0
+        self.dropped_stale = 0
+        self.coalesced = 0
+        self.preempted = 0
+        self.latencies = deque(maxlen=200)  # seconds from request to playback start
+
+    def start(self):
+        """Start the worker thread (idempotent)."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="audio-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stop the worker after interrupting any current playback."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._preempt.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def speak(self, text, priority=PRIORITY_SIGN):
+        """Queue an utterance; returns immediately."""
+        text = str(text).strip()
+        if not text or text == "None":
+            return
+
+        with self._cond:
+            if priority >= PRIORITY_SIGN:
+                # Coalesce: a newer sign makes any sign still waiting obsolete
+                before = len(self._heap)
+                self._heap = [item for item in self._heap if item[0] < PRIORITY_SIGN]
+                if len(self._heap) != before:
+                    heapq.heapify(self._heap)
+                    self.coalesced += before - len(self._heap)
+
+            heapq.heappush(self._heap, (priority, next(self._counter), time.monotonic(), text))
+
+            if self._playing_priority is not None and priority < self._playing_priority:
+                self._preempt.set()
+            self._cond.notify()
+
+    def speak_emergency(self, text):
+        """Queue an emergency phrase that preempts sign speech."""
+        self.speak(text, PRIORITY_EMERGENCY)
+
+    @property
+    def queue_depth(self):
+        with self._cond:
+            return len(self._heap)
+
+    def metrics(self):
+        """Snapshot of queue depth, counters and playback latency (ms)."""
+        latencies = sorted(self.latencies)
+        pick = lambda q: round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 1) if latencies else None
+        return {
+            "queue_depth": self.queue_depth,
+            "played": self.played,
+            "dropped_stale": self.dropped_stale,
+            "coalesced": self.coalesced,
+            "preempted": self.preempted,
+            "latency_p50_ms": pick(0.5),
+            "latency_p95_ms": pick(0.95),
+        }
+
+    def _next_item(self):
+        """Block until there is something worth playing; returns None on shutdown."""
+        with self._cond:
+            while self._running:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                priority, _, requested_at, text = heapq.heappop(self._heap)
+                if priority >= PRIORITY_SIGN and time.monotonic() - requested_at > self.max_sign_age:
+                    self.dropped_stale += 1
+                    continue
+                self._playing_priority = priority
+                self._preempt.clear()
+                return priority, requested_at, text
+            return None
+
+    def _run(self):
+        import pygame
+
+        try:
+            pygame.mixer.init()
+        except Exception as e:
+            print(f"⚠️ Audio device unavailable: {e}")
+
+        cache = self.cache or get_tts_cache()
+        while True:
+            item = self._next_item()
+            if item is None:
+                break
+            _, requested_at, text = item
+
+            try:
+                data, extension = cache.get(text, lang=self.lang)
+                if not pygame.mixer.get_init():
+                    pygame.mixer.init()
+                pygame.mixer.music.load(io.BytesIO(data), extension)
+                pygame.mixer.music.play()
+                self.latencies.append(time.monotonic() - requested_at)
+                self.played += 1
+                print(f"🗣 Speaking: {text}")
+
+                while pygame.mixer.music.get_busy():
+                    if self._preempt.wait(0.02):
+                        pygame.mixer.music.stop()
+                        self.preempted += 1
+                        break
+            except Exception as e:
+                print(f"⚠️ Voice Output Error: {e}")
+            finally:
+                with self._cond:
+                    self._playing_priority = None
+
+        if pygame.mixer.get_init():
+            pygame.mixer.quit()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_audio_worker():
+    """Shared, already-started audio worker for the whole process (reported in the stage metrics)."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            from stage_metrics import get_stage_metrics
+            _worker = AudioWorker()
+            _worker.start()
+            get_stage_metrics().add_source("audio", _worker.metrics)
+        return _worker
@@ -0,0 +1,217 @@
+import os
+import csv
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import joblib
+import numpy as np
+from compiled_model import compile_predictor
+from feature_extraction import extract_landmark_chunk
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+# ✅ **Input Discovery**
+def list_images(directory):
+    """Return the sorted image paths of a frame directory."""
+    return sorted(
+        os.path.join(directory, f) for f in os.listdir(directory)
+        if f.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+
+def split_range(total, parts):
+    """Split range(total) into at most `parts` contiguous (start, stop) segments."""
+    parts = max(1, min(parts, total))
+    bounds = np.linspace(0, total, parts + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+# ✅ **Worker Functions (run in separate processes)**
+def seek_exact(capture, frame_index):
+    """Position `capture` on `frame_index`; returns False if the video ends before it.
+
+    Seeking is approximate for many codecs, so a seek that does not land exactly on the
+    frame falls back to decoding sequentially from the start of the file.
+    """
+    if frame_index == 0:
+        return True
+    capture.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+    if int(capture.get(cv2.CAP_PROP_POS_FRAMES)) == frame_index:
+        return True
+    capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    if int(capture.get(cv2.CAP_PROP_POS_FRAMES)) != 0:
+        return False
+    for _ in range(frame_index):
+        if not capture.grab():
+            return False
+    return True
+
+
+def extract_video_segment(video_path, start, stop):
+    """Extract landmarks for frames [start, stop) of a video with a video-mode tracker.
+
+    `stop=None` reads to the end of the file (the frame count in the header is only an
+    estimate). Returns only the frames actually read.
+    """
+    from conversion import HandTracker, detect_hand_landmarks
+
+    tracker = HandTracker()
+    capture = cv2.VideoCapture(video_path)
+    features, found = [], []
+    if seek_exact(capture, start):
+        while stop is None or start + len(features) < stop:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            features.append(detect_hand_landmarks(frame, tracker)[0])
+            found.append(tracker.tracking)
+
+    capture.release()
+    tracker.close()
+    return start, np.array(features, dtype=np.float32).reshape(-1, 63), np.array(found, dtype=bool)
+
+
+# ✅ **Parallel Landmark Extraction**
+def extract_landmarks(source, workers=None, fps=30.0):
+    """Return (timestamps, features (N, 63), hand_found (N,)) for a video file or frame directory."""
+    workers = workers or os.cpu_count() or 1
+
+    if os.path.isdir(source):
+        image_paths = list_images(source)
+        total = len(image_paths)
+        jobs = [(extract_landmark_chunk, image_paths[a:b], a) for a, b in split_range(total, workers * 4)]
+    else:
+        capture = cv2.VideoCapture(source)
+        if not capture.isOpened():
+            raise FileNotFoundError(f"Cannot open video: {source}")
+        total = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))  # Header estimate, only used to split
+        fps = capture.get(cv2.CAP_PROP_FPS) or fps
+        capture.release()
+        # One contiguous segment per worker so tracking can carry the hand ROI between frames;
+        # the last one reads to the real end of the file
+        segments = split_range(max(total, 1), workers)
+        jobs = [(extract_video_segment, source, a, b) for a, b in segments[:-1]]
+        jobs.append((extract_video_segment, source, segments[-1][0], None))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(job[0], *job[1:]) for job in jobs]
+        results = sorted((future.result() for future in futures), key=lambda result: result[0])
+
+    # Stitch the segments in frame order. A segment that stopped early (a frame that would not
+    # decode) leaves a gap before the next one: re-read it from where that segment really
+    # ended, and mark frames that still can't be read as "no hand" so timestamps stay aligned
+    features, found = [], []
+    position = 0
+    for start, chunk, chunk_found in results:
+        if not len(chunk):
+            continue  # Starts past the real end of the video (the header over-counted)
+        if start > position:
+            _, gap, gap_found = extract_video_segment(source, position, start)
+            missing = start - position - len(gap)
+            if missing:
+                print(f"⚠️ Warning: {missing} frames before frame {start} could not be read; "
+                      f"they are marked as no hand.")
+                gap = np.concatenate([gap, np.zeros((missing, 63), dtype=np.float32)])
+                gap_found = np.concatenate([gap_found, np.zeros(missing, dtype=bool)])
+            features.append(gap)
+            found.append(gap_found)
+        features.append(chunk)
+        found.append(chunk_found)
+        position = start + len(chunk)
+    features = np.concatenate(features) if features else np.zeros((0, 63), dtype=np.float32)
+    found = np.concatenate(found) if found else np.zeros(0, dtype=bool)
+
+    timestamps = np.arange(len(features)) / fps
+    return timestamps, features, found
+
+
+# ✅ **Vectorised Classification**
+def classify_batch(predictor, features, found, batch_size=4096):
+    """Classify all frames with a hand in large batches; frames without a hand get 'None'."""
+    signs = np.full(len(features), "None", dtype=object)
+    scores = np.zeros(len(features), dtype=np.float32)
+    indices = np.flatnonzero(found)
+
+    for i in range(0, len(indices), batch_size):
+        batch = indices[i:i + batch_size]
+        labels, best = predictor.predict_with_scores(features[batch])
+        signs[batch] = labels
+        scores[batch] = best
+
+    return signs, scores
+
+
+# ✅ **Timeline Output**
+def write_timeline(output_path, timestamps, signs, scores):
+    """Write the per-frame timeline as JSONL or CSV, chosen by file extension."""
+    rows = (
+        {"frame": i, "timestamp": round(float(t), 4), "sign": str(s), "score": round(float(c), 4)}
+        for i, (t, s, c) in enumerate(zip(timestamps, signs, scores))
+    )
+
+    if output_path.lower().endswith(".csv"):
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["frame", "timestamp", "sign", "score"])
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(output_path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def run_batch(source, output_path, model, scaler, pca=None, workers=None, fps=30.0):
+    """Run the whole offline pass and return a throughput summary."""
+    predictor = compile_predictor(model, scaler, pca)
+    if predictor is None:
+        raise RuntimeError("Model could not be compiled for batch classification.")
+
+    started = time.perf_counter()
+    timestamps, features, found = extract_landmarks(source, workers, fps)
+    extracted = time.perf_counter()
+    signs, scores = classify_batch(predictor, features, found)
+    classified = time.perf_counter()
+    write_timeline(output_path, timestamps, signs, scores)
+
+    total_time = time.perf_counter() - started
+    duration = float(timestamps[-1]) if len(timestamps) else 0.0
+    return {
+        "frames": len(timestamps),
+        "frames_with_hand": int(found.sum()),
+        "extract_seconds": round(extracted - started, 3),
+        "classify_seconds": round(classified - extracted, 4),
+        "total_seconds": round(total_time, 3),
+        "fps": round(len(timestamps) / total_time, 1) if total_time else 0.0,
+        "realtime_factor": round(duration / total_time, 2) if total_time else 0.0,
+    }
+
+
+# ✅ **Command Line Entry Point**
+if __name__ == "__main__":
+    from conversion import MODEL_PATH, SCALER_PATH, PCA_PATH, PIPELINE_PATH
+    from model_artifact import pipeline_uses_pca
+
+    parser = argparse.ArgumentParser(description="Offline sign recognition over a video file or frame directory.")
+    parser.add_argument("source", help="Video file or directory of frame images")
+    parser.add_argument("output", help="Timeline output (.jsonl or .csv)")
+    parser.add_argument("--workers", type=int, default=None, help="Landmark extraction processes")
+    parser.add_argument("--fps", type=float, default=30.0, help="Frame rate assumed for image directories")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--scaler", default=SCALER_PATH)
+    parser.add_argument("--pca", default=None,
+                        help="PCA the model was trained behind (default: pca.pkl if training's pipeline.json lists it)")
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    scaler = joblib.load(args.scaler)
+    if args.pca is None:
+        args.pca = PCA_PATH if pipeline_uses_pca(PIPELINE_PATH) else None
+    pca = joblib.load(args.pca) if args.pca else None
+
+    summary = run_batch(args.source, args.output, model, scaler, pca, args.workers, args.fps)
+    print(f"✅ Timeline written to: {args.output}")
+    for key, value in summary.items():
+        print(f"   {key}: {value}")
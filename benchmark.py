@@ -0,0 +1,300 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import cv2
+import joblib
+import numpy as np
+from batch_recognition import list_images
+from compiled_model import compile_predictor
+from frame_source import FrameListSource, synthetic_frames
+from stage_metrics import StageMetrics
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(APP_DIR, "benchmark_baseline.json")
+DEFAULT_TOLERANCE = 0.2  # 20 % slower (or less throughput) than the baseline is a regression
+
+
+# ✅ **Fake Tracker** (the fake camera is frame_source.FrameListSource)
+class CannedTracker:
+    """HandTracker stand-in that replays recorded landmark rows instead of running MediaPipe."""
+
+    def __init__(self, landmarks):
+        self.landmarks = landmarks
+        self.index = 0
+        self.tracking = False
+
+    def detect(self, frame):
+        row = self.landmarks[self.index % len(self.landmarks)].reshape(1, -1)
+        self.index += 1
+        self.tracking = bool(np.any(row))
+        return row
+
+    def close(self):
+        pass
+
+
+# ✅ **Inputs: synthetic frames, recorded clips, canned landmarks**
+def load_clip(source, limit=300):
+    """Read up to `limit` BGR frames from a recorded video file or frame directory."""
+    if os.path.isdir(source):
+        frames = [cv2.imread(path) for path in list_images(source)[:limit]]
+        return [frame for frame in frames if frame is not None]
+
+    capture = cv2.VideoCapture(source)
+    frames = []
+    while len(frames) < limit:
+        ret, frame = capture.read()
+        if not ret:
+            break
+        frames.append(frame)
+    capture.release()
+    return frames
+
+
+def canned_landmarks(scaler=None, count=500, seed=0):
+    """Landmark rows spread like the training data (around the scaler's mean), with some no-hand rows."""
+    rng = np.random.default_rng(seed)
+    if scaler is not None and hasattr(scaler, "mean_"):
+        rows = scaler.mean_ + rng.standard_normal((count, len(scaler.mean_))) * scaler.scale_ * 0.5
+    else:
+        rows = rng.uniform(0.2, 0.8, (count, 63))
+        rows[:, 2::3] = rng.uniform(-0.1, 0.1, (count, 21))
+    rows[::10] = 0.0  # Every tenth frame has no hand
+    return rows.astype(np.float32)
+
+
+# ✅ **Measurement Helpers**
+def summarize(latencies, elapsed, items=None):
+    """Throughput and latency percentiles for a list of per-call latencies (seconds)."""
+    latencies = np.asarray(latencies) * 1000.0
+    p50, p95, p99 = np.percentile(latencies, (50, 95, 99))
+    items = items if items is not None else len(latencies)
+    return {
+        "count": int(len(latencies)),
+        "throughput_per_s": round(items / elapsed, 1) if elapsed > 0 else None,
+        "mean_ms": round(float(latencies.mean()), 4),
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+    }
+
+
+def time_calls(function, inputs, warmup=10):
+    """Call `function` on every input (after a warm-up) and summarise the latencies."""
+    for item in inputs[:warmup]:
+        function(item)
+    latencies = np.zeros(len(inputs))
+    started = time.perf_counter()
+    for i, item in enumerate(inputs):
+        call_started = time.perf_counter()
+        function(item)
+        latencies[i] = time.perf_counter() - call_started
+    return summarize(latencies, time.perf_counter() - started)
+
+
+# ✅ **Benchmarks**
+def bench_classifier(model, scaler, pca, predictor, landmarks):
+    """The classifier alone: compiled predictor (single row and batched) and the sklearn path."""
+    results = {}
+    hands = landmarks[np.any(landmarks != 0, axis=1)]
+    rows = [row.reshape(1, -1) for row in hands]
+
+    if predictor is not None:
+        results["classifier.compiled.single"] = time_calls(predictor.predict_with_scores, rows)
+        batches = [hands[i:i + 256] for i in range(0, len(hands), 256)] * 5
+        summary = time_calls(predictor.predict_with_scores, batches, warmup=1)
+        started = time.perf_counter()
+        for batch in batches:
+            predictor.predict_with_scores(batch)
+        summary["throughput_per_s"] = round(sum(len(b) for b in batches) / (time.perf_counter() - started), 1)
+        results["classifier.compiled.batch256"] = summary
+
+    if model is not None and scaler is not None:
+        def sklearn_predict(row):
+            if pca is not None:
+                row = pca.transform(row)
+            return model.predict(scaler.transform(row))
+        results["classifier.sklearn.single"] = time_calls(sklearn_predict, rows[:200])
+    return results
+
+
+def bench_detect(frames):
+    """detect_hand_landmarks: static detector per frame vs. the video-mode HandTracker."""
+    from conversion import HandTracker, detect_hand_landmarks
+
+    results = {"detect.static": time_calls(detect_hand_landmarks, frames, warmup=3)}
+    tracker = HandTracker()
+    results["detect.tracker"] = time_calls(lambda frame: detect_hand_landmarks(frame, tracker), frames, warmup=3)
+    tracker.close()
+    return results
+
+
+def bench_process_frame(frames, model, scaler, pca, predictor, landmarks=None, name="process_frame"):
+    """End-to-end read → flip → process_frame through a fake camera, with per-stage percentiles.
+
+    With `landmarks`, MediaPipe is replaced by a CannedTracker so only the classifier,
+    debouncer and bookkeeping are measured.
+    """
+    from conversion import RealTimeRecognition
+
+    metrics = StageMetrics()
+    tracker = CannedTracker(landmarks) if landmarks is not None else None  # No MediaPipe import at all
+    recognition = RealTimeRecognition(model, scaler, pca, speak=False, predictor=predictor,
+                                      metrics=metrics, video_capture=FrameListSource(frames), tracker=tracker)
+
+    def step(_):
+        start = metrics.now()
+        ret, frame = recognition.video_capture.read()
+        start = metrics.record("capture", start)
+        frame = cv2.flip(frame, 1)
+        metrics.record("flip", start)
+        recognition.process_frame(frame)
+
+    summary = time_calls(step, list(range(max(len(frames), 200 if landmarks is not None else 0))), warmup=5)
+    summary["stages"] = metrics.snapshot()["stages"]
+    recognition.video_capture.release()
+    return {name: summary}
+
+
+def bench_pipeline(frames, model, scaler, pca, predictor, seconds=3.0, fps=30.0):
+    """The threaded capture → recognition pipeline fed by a camera paced at `fps`."""
+    from conversion import RealTimeRecognition
+    from pipeline import RecognitionPipeline
+
+    metrics = StageMetrics()
+    camera = FrameListSource(frames, fps=fps)  # Blocks like a real camera
+    recognition = RealTimeRecognition(model, scaler, pca, speak=False, predictor=predictor,
+                                      metrics=metrics, video_capture=camera)
+    pipeline = RecognitionPipeline(camera, recognition, metrics=metrics)
+    pipeline.start()
+    time.sleep(seconds)
+    pipeline.stop()
+    camera.release()
+
+    snapshot = metrics.snapshot()
+    return {"pipeline": {
+        "camera_fps": fps,
+        "captured": pipeline.captured_frames,
+        "recognized": pipeline.recognized_frames,
+        "dropped": pipeline.inference_buffer.dropped,
+        "throughput_per_s": round(pipeline.recognized_frames / seconds, 1),
+        "fps": snapshot["fps"],
+        "stages": snapshot["stages"],
+    }}
+
+
+# ✅ **Baselines & Regression Flags**
+def environment():
+    return {
+        "machine": platform.node(),
+        "platform": platform.platform(),
+        "python": sys.version.split()[0],
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Return human-readable regressions of `results` against a stored baseline."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            if key in current and key in previous and current[key] > previous[key] * (1 + tolerance):
+                regressions.append(f"{name} {key}: {previous[key]} → {current[key]}")
+        before, after = previous.get("throughput_per_s"), current.get("throughput_per_s")
+        if before and after is not None and after < before * (1 - tolerance):
+            regressions.append(f"{name} throughput_per_s: {before} → {after}")
+    return regressions
+
+
+def print_results(results):
+    for name, summary in results.items():
+        line = f"   {name:<30} {summary.get('throughput_per_s') or 0:>10.1f}/s"
+        if "p50_ms" in summary:
+            line += f"  p50 {summary['p50_ms']:8.3f}  p95 {summary['p95_ms']:8.3f}  p99 {summary['p99_ms']:8.3f} ms"
+        print(line)
+        for stage, stats in summary.get("stages", {}).items():
+            print(f"      {stage:<16} p50 {stats['p50_ms']:8.3f}  p95 {stats['p95_ms']:8.3f}  p99 {stats['p99_ms']:8.3f} ms")
+
+
+# ✅ **Command Line Entry Point**
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Camera-free benchmarks for the recognition pipeline.")
+    parser.add_argument("--model", default=os.path.join(APP_DIR, "svm_model.pkl"))
+    parser.add_argument("--scaler", default=os.path.join(APP_DIR, "scaler.pkl"))
+    parser.add_argument("--pca", default=None, help="Apply PCA like conversion.py's CLI does")
+    parser.add_argument("--artifact", default=None, help="Use a model artifact instead of compiling the pickles")
+    parser.add_argument("--clip", default=None, help="Recorded video file or frame directory (default: synthetic frames)")
+    parser.add_argument("--landmarks", default=None, help="(N, 63) .npy of canned landmark rows")
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--seconds", type=float, default=3.0, help="Duration of the threaded pipeline run")
+    parser.add_argument("--only", nargs="+", choices=("classifier", "detect", "process_frame", "pipeline"))
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--output", default=None, help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    model = joblib.load(args.model) if os.path.exists(args.model) else None
+    scaler = joblib.load(args.scaler) if os.path.exists(args.scaler) else None
+    pca = joblib.load(args.pca) if args.pca else None
+    if args.artifact:
+        from model_artifact import load_artifact
+        predictor = load_artifact(args.artifact)
+    else:
+        predictor = compile_predictor(model, scaler, pca) if model is not None else None
+    if predictor is None and model is None:
+        print("❌ ERROR: No model to benchmark!")
+        raise SystemExit(1)
+
+    frames = load_clip(args.clip, args.frames) if args.clip else synthetic_frames(args.frames)
+    landmarks = np.load(args.landmarks) if args.landmarks else canned_landmarks(scaler)
+    print(f"⏱ {len(frames)} frames ({'clip' if args.clip else 'synthetic'}), {len(landmarks)} canned landmark rows")
+
+    selected = args.only or ("classifier", "detect", "process_frame", "pipeline")
+    results = {}
+    if "classifier" in selected:
+        results.update(bench_classifier(model, scaler, pca, predictor, landmarks))
+    # The canned process_frame run needs no MediaPipe, so it still runs where MediaPipe is missing
+    frame_benches = []
+    if "detect" in selected:
+        frame_benches.append(lambda: bench_detect(frames))
+    if "process_frame" in selected:
+        frame_benches.append(lambda: bench_process_frame(frames, model, scaler, pca, predictor, landmarks, "process_frame.canned"))
+        frame_benches.append(lambda: bench_process_frame(frames, model, scaler, pca, predictor))
+    if "pipeline" in selected:
+        frame_benches.append(lambda: bench_pipeline(frames, model, scaler, pca, predictor, args.seconds))
+    for bench in frame_benches:
+        try:
+            results.update(bench())
+        except ImportError as e:
+            print(f"⚠️ Skipping a frame benchmark ({e}); the other results are still valid.")
+
+    print_results(results)
+    report = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Baseline saved to: {args.baseline}")
+        raise SystemExit(0)
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("environment", {}).get("machine") != report["environment"]["machine"]:
+            print("⚠️ Baseline was recorded on a different machine; comparisons are only indicative.")
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"❌ Regression: {regression}")
+        if not regressions:
+            print(f"✅ No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+        raise SystemExit(1 if regressions else 0)
@@ -0,0 +1,228 @@
+import numpy as np
+
+
+# ✅ **Fold Preprocessing Into One Affine Map**
+def fold_preprocessing(n_features, scaler=None, pca=None):
+    """Collapse PCA followed by StandardScaler (the order used in `process_frame`) into x @ A + c.
+
+    Both transforms are affine, so evaluating them on the zero vector and the identity
+    matrix recovers the exact map regardless of whitening or with_mean/with_std options.
+    """
+    basis = np.vstack([np.zeros((1, n_features)), np.eye(n_features)])
+    if pca is not None:
+        basis = pca.transform(basis)
+    if scaler is not None:
+        basis = scaler.transform(basis)
+    offset = basis[0]
+    return basis[1:] - offset, offset
+
+
+def can_compile(model):
+    """Whether `from_sklearn` supports this (fitted or unfitted) estimator."""
+    from sklearn.svm import SVC
+    from sklearn.linear_model import LogisticRegression
+
+    if isinstance(model, SVC):
+        return model.kernel in ("linear", "rbf")
+    return isinstance(model, LogisticRegression)
+
+
+# ✅ **Compiled SVM Predictor**
+class CompiledPredictor:
+    """NumPy re-implementation of (PCA →) StandardScaler → SVC or LogisticRegression with all constants precomputed.
+
+    For `kernel='linear'` (what `training.py` trains) everything folds into a single float32
+    weight matrix and bias, so one matmul yields every one-vs-one decision value. RBF models
+    (the shipped `svm_model.pkl`) keep the folded preprocessing and evaluate the kernel
+    against the support vectors in one batched matmul. Logistic regression (kernel
+    "logistic" here) folds like the linear SVM, into one column of logits per class.
+    """
+
+    def __init__(self, classes, kernel, weights, bias, pair_index, n_features_in, gamma=None,
+                 support_vectors=None, sv_sq_norms=None, preprocess_weights=None, preprocess_bias=None):
+        self.classes_ = np.asarray(classes)
+        self.kernel = kernel
+        self.weights = weights
+        self.bias = bias
+        self.pair_index = pair_index
+        self.gamma = gamma
+        self.support_vectors = support_vectors
+        self.sv_sq_norms = sv_sq_norms
+        self.preprocess_weights = preprocess_weights
+        self.preprocess_bias = preprocess_bias
+        self.n_features_in_ = n_features_in
+
+    @classmethod
+    def from_sklearn(cls, model, scaler=None, pca=None, dtype=np.float32):
+        """Compile a fitted sklearn SVC or LogisticRegression plus its scaler/PCA into a CompiledPredictor."""
+        if not can_compile(model):
+            raise ValueError(f"Unsupported model for compilation: {model}")
+
+        n_features = pca.n_features_in_ if pca is not None else model.n_features_in_
+        A, c = fold_preprocessing(n_features, scaler, pca)
+
+        if not hasattr(model, "kernel"):
+            # logits(x) = f(x) @ coef_.T + intercept_; a binary model's single logit becomes [0, z]
+            coef, intercept = model.coef_, model.intercept_
+            if len(model.classes_) == 2:
+                coef = np.vstack([np.zeros_like(coef), coef])
+                intercept = np.concatenate([[0.0], intercept])
+            weights = A @ coef.T
+            bias = c @ coef.T + intercept
+            return cls(model.classes_, "logistic", weights.astype(dtype), bias.astype(dtype), None, n_features)
+
+        n_classes = len(model.classes_)
+        pair_index = np.array([(i, j) for i in range(n_classes) for j in range(i + 1, n_classes)])
+        # sklearn flips the sign of binary models so positive means classes_[1]; undo it
+        sign = -1.0 if n_classes == 2 else 1.0
+
+        if model.kernel == "linear":
+            # decision_ovo(x) = f(x) @ coef_.T + intercept_  with  f(x) = x @ A + c
+            weights = sign * (A @ model.coef_.T)
+            bias = sign * (c @ model.coef_.T + model.intercept_)
+            return cls(model.classes_, "linear", weights.astype(dtype), bias.astype(dtype), pair_index, n_features)
+        else:
+            # Expand the libsvm one-vs-one dual coefficients into one (n_SV, n_pairs) matrix.
+            starts = np.concatenate([[0], np.cumsum(model.n_support_)])
+            dual = np.zeros((model.support_vectors_.shape[0], len(pair_index)))
+            for k, (i, j) in enumerate(pair_index):
+                sv_i = slice(starts[i], starts[i + 1])
+                sv_j = slice(starts[j], starts[j + 1])
+                dual[sv_i, k] = model.dual_coef_[j - 1, sv_i]
+                dual[sv_j, k] = model.dual_coef_[i, sv_j]
+
+            support_vectors = model.support_vectors_
+            return cls(
+                model.classes_, "rbf",
+                weights=(sign * dual).astype(dtype),
+                bias=(sign * model.intercept_).astype(dtype),
+                pair_index=pair_index,
+                n_features_in=n_features,
+                gamma=dtype(model._gamma),
+                support_vectors=support_vectors.astype(dtype),
+                sv_sq_norms=(support_vectors ** 2).sum(axis=1).astype(dtype),
+                preprocess_weights=A.astype(dtype),
+                preprocess_bias=c.astype(dtype),
+            )
+
+    def ovo_decision_function(self, X):
+        """Return the (n_samples, n_pairs) one-vs-one decision values, as libsvm computes them."""
+        X = np.asarray(X, dtype=self.weights.dtype).reshape(-1, self.n_features_in_)
+
+        if self.kernel == "linear":
+            return X @ self.weights + self.bias
+
+        Z = X @ self.preprocess_weights + self.preprocess_bias
+        sq_dist = (Z ** 2).sum(axis=1)[:, None] - 2.0 * (Z @ self.support_vectors.T) + self.sv_sq_norms
+        K = np.exp(-self.gamma * np.maximum(sq_dist, 0.0))
+        return K @ self.weights + self.bias
+
+    def _votes(self, ovo):
+        """Count one-vs-one wins per class (positive decision → first class of the pair)."""
+        votes = np.zeros((ovo.shape[0], len(self.classes_)), dtype=ovo.dtype)
+        positive = ovo > 0
+        np.add.at(votes.T, self.pair_index[:, 0], positive.T)
+        np.add.at(votes.T, self.pair_index[:, 1], ~positive.T)
+        return votes
+
+    def decision_function(self, X):
+        """Return one-vs-rest scores (n_samples, n_classes), matching SVC(decision_function_shape='ovr').
+
+        For logistic models these are the per-class logits.
+        """
+        if self.kernel == "logistic":
+            X = np.asarray(X, dtype=self.weights.dtype).reshape(-1, self.n_features_in_)
+            return X @ self.weights + self.bias
+        ovo = self.ovo_decision_function(X)
+        votes = self._votes(ovo)
+
+        confidences = np.zeros_like(votes)
+        np.add.at(confidences.T, self.pair_index[:, 0], ovo.T)
+        np.add.at(confidences.T, self.pair_index[:, 1], -ovo.T)
+        # Same squashing sklearn applies so confidences never override a vote difference
+        return votes + confidences / (3 * (np.abs(confidences) + 1))
+
+    def predict(self, X):
+        """Predict class labels for a batch of raw (1, 63)-style feature rows."""
+        if self.kernel == "logistic":
+            return self.classes_[np.argmax(self.decision_function(X), axis=1)]
+        votes = self._votes(self.ovo_decision_function(X))
+        return self.classes_[np.argmax(votes, axis=1)]
+
+    def predict_with_scores(self, X):
+        """Return (labels, confidence in [0, 1]) for each row (see `ovr_confidence`; softmax for logistic)."""
+        scores = self.decision_function(X)
+        best = np.argmax(scores, axis=1)
+        if self.kernel == "logistic":
+            exp = np.exp(scores - scores[np.arange(len(best)), best][:, None])
+            return self.classes_[best], 1.0 / exp.sum(axis=1)
+        return self.classes_[best], ovr_confidence(scores[np.arange(len(best)), best], len(self.classes_))
+
+    def verify(self, model, scaler=None, pca=None, X=None, n_samples=256, atol=1e-3):
+        """Parity check against the original sklearn objects; returns (agreement, max_abs_error)."""
+        if X is None:
+            # Synthetic rows around the training distribution the preprocessing was fitted on
+            mean, scale = 0.0, 1.0
+            if pca is not None:
+                mean, scale = pca.mean_, np.sqrt(pca.explained_variance_.mean())
+            elif scaler is not None:
+                mean, scale = scaler.mean_, scaler.scale_
+            X = np.random.default_rng(0).normal(size=(n_samples, self.n_features_in_)) * scale + mean
+
+        reference = np.asarray(X, dtype=np.float64)
+        if pca is not None:
+            reference = pca.transform(reference)
+        if scaler is not None:
+            reference = scaler.transform(reference)
+
+        expected_labels = model.predict(reference)
+        expected_scores = model.decision_function(reference)
+
+        agreement = float(np.mean(self.predict(X) == expected_labels))
+        if self.kernel == "logistic":
+            logits = self.decision_function(X)
+            compiled_scores = logits[:, 1] - logits[:, 0] if expected_scores.ndim == 1 else logits
+            max_error = float(np.max(np.abs(compiled_scores - expected_scores)))
+        elif expected_scores.ndim == 1:
+            max_error = float(np.max(np.abs(-self.ovo_decision_function(X)[:, 0] - expected_scores)))
+        elif model.decision_function_shape == "ovr":
+            max_error = float(np.max(np.abs(self.decision_function(X) - expected_scores)))
+        else:
+            max_error = float(np.max(np.abs(self.ovo_decision_function(X) - expected_scores)))
+
+        if max_error > atol:
+            print(f"⚠️ Compiled predictor differs from sklearn by {max_error:.2e} (agreement {agreement:.1%})")
+        return agreement, max_error
+
+
+# ✅ **Confidence Scores** (comparable across models and with the fixed 1.0 of no-hand frames)
+def ovr_confidence(best_scores, n_classes):
+    """Winning one-vs-rest score (votes + squashed confidence) as a share of the n-1 possible votes."""
+    return np.clip(np.asarray(best_scores) / max(1, n_classes - 1), 0.0, 1.0)
+
+
+def sklearn_confidence(model, X):
+    """[0, 1] confidence of an uncompiled sklearn model's predictions for the rows of X."""
+    n_classes = len(model.classes_)
+    if hasattr(model, "kernel") and n_classes > 2:
+        scores = model.decision_function(X)
+        return ovr_confidence(scores.max(axis=1), n_classes)
+    try:
+        return model.predict_proba(X).max(axis=1)
+    except (AttributeError, NotImplementedError):  # e.g. SVC(probability=False) with two classes
+        return np.ones(len(X))
+
+
+def compile_predictor(model, scaler=None, pca=None):
+    """Compile and parity-check a model; returns None if it can't be compiled faithfully."""
+    try:
+        predictor = CompiledPredictor.from_sklearn(model, scaler, pca)
+        agreement, _ = predictor.verify(model, scaler, pca)
+    except Exception as e:
+        print(f"⚠️ Compiled predictor unavailable, using sklearn: {e}")
+        return None
+
+    if agreement < 0.99:
+        print(f"⚠️ Compiled predictor agreement too low ({agreement:.1%}), using sklearn.")
+        return None
+    return predictor
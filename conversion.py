@@ -1,141 +1,341 @@
 import os
+import time
+import argparse
 import cv2
 import joblib
 import numpy as np
-import mediapipe as mp
-import tempfile
-import pygame
-import time
 import threading
-from sklearn.preprocessing import StandardScaler
-from gtts import gTTS  # ✅ Text-to-Speech for Kannada
-
-# ✅ **Initialize MediaPipe Hand Tracking**
-mp_hands = mp.solutions.hands.Hands(
-    static_image_mode=True,
-    max_num_hands=1,
-    min_detection_confidence=0.7
-)
+from tts_cache import prewarm_in_background  # ✅ Cached Kannada TTS
+from audio_worker import get_audio_worker  # ✅ Single playback thread
+from compiled_model import compile_predictor, sklearn_confidence
+from model_artifact import LazyPredictor, pipeline_uses_pca
+from sign_events import SignEventEngine
+from stage_metrics import get_stage_metrics, log
+from frame_source import open_source
+from pipeline import AdaptiveRate
+from feature_extraction import landmark_array
+
+# ✅ **MediaPipe Hand Tracking** (static mode, used for dataset images)
+# MediaPipe is imported and its graph built on first use, so importing this module
+# (e.g. for benchmarks or the compiled classifier) does not pay for it.
+mp_hands = None
+_mp_hands_lock = threading.Lock()
+
+
+def new_static_hands():
+    """A fresh static-image MediaPipe Hands instance (one per thread; the graph is not thread-safe)."""
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(
+        static_image_mode=True,
+        max_num_hands=1,
+        min_detection_confidence=0.7
+    )
+
+
+def get_static_hands():
+    """Shared static-image MediaPipe Hands instance, created on first call."""
+    global mp_hands
+    if mp_hands is None:
+        with _mp_hands_lock:
+            if mp_hands is None:
+                mp_hands = new_static_hands()
+    return mp_hands
+
+# ✅ **Streaming Hand Tracker for Live Video**
+class HandTracker:
+    """Video-mode hand tracking: one MediaPipe Hands instance per stream.
+
+    With `static_image_mode=False` MediaPipe only runs the palm detector until a hand is
+    found, then follows it by reusing the previous frame's hand ROI. When the hand is lost
+    (or tracking confidence drops) it falls back to full detection on the next frame.
+
+    Inference can run at a lower resolution than the preview: `inference_width` downscales
+    the frame, and `crop_padding` (a fraction of the hand size) restricts MediaPipe to the
+    area around the previous hand box. Cropping and MediaPipe's own ROI tracking are
+    mutually exclusive (its ROI would refer to the previous, differently placed crop), so
+    with `crop_padding` set MediaPipe runs in static-image mode on each crop and the crop
+    itself does the tracking. Landmarks are always returned in full-frame normalised
+    coordinates. With `metrics` set, the resize/colour conversion and the
+    MediaPipe call are timed as the "convert" and "mediapipe" stages.
+    """
+
+    def __init__(self, min_detection_confidence=0.7, min_tracking_confidence=0.5,
+                 inference_width=None, crop_padding=None, metrics=None):
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.inference_width = inference_width
+        self.crop_padding = crop_padding
+        self.hands = None
+        self.tracking = False  # True while the previous frame's ROI is being reused
+        self.last_box = None   # Normalised (x1, y1, x2, y2) of the tracked hand
+        self.lost_count = 0
+        self.rgb_buffer = None  # Reused destination of the BGR → RGB conversion
+        self.metrics = metrics
+        self.reset()
+
+    def reset(self):
+        """Drop any tracked ROI so the next frame runs full palm detection."""
+        import mediapipe as mp
+
+        if self.hands is not None:
+            self.hands.close()
+        self.hands = mp.solutions.hands.Hands(
+            static_image_mode=self.crop_padding is not None,  # See the class docstring
+            max_num_hands=1,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence
+        )
+        self.tracking = False
+        self.last_box = None
+
+    def to_rgb(self, frame):
+        """Convert a BGR frame to RGB into a buffer reused across frames."""
+        if self.rgb_buffer is None or self.rgb_buffer.shape != frame.shape:
+            self.rgb_buffer = np.empty_like(frame)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.rgb_buffer)
+
+    def inference_region(self, frame_shape):
+        """Pixel region (x0, y0, x1, y1) MediaPipe should look at for the next frame."""
+        height, width = frame_shape[:2]
+        if self.crop_padding is None or self.last_box is None:
+            return 0, 0, width, height
+
+        bx1, by1, bx2, by2 = self.last_box
+        cx, cy = (bx1 + bx2) / 2 * width, (by1 + by2) / 2 * height
+        size = max((bx2 - bx1) * width, (by2 - by1) * height) * (1 + 2 * self.crop_padding)
+        x0, y0 = int(max(0, cx - size / 2)), int(max(0, cy - size / 2))
+        x1, y1 = int(min(width, cx + size / 2)), int(min(height, cy + size / 2))
+        if x1 - x0 < 32 or y1 - y0 < 32:
+            return 0, 0, width, height
+        return x0, y0, x1, y1
+
+    def process(self, rgb_frame):
+        """Run MediaPipe on an RGB frame and update the tracking state."""
+        results = self.hands.process(rgb_frame)
+
+        if results.multi_hand_landmarks:
+            self.tracking = True
+        else:
+            if self.tracking:
+                self.lost_count += 1  # MediaPipe re-detects automatically on the next frame
+            self.tracking = False
+            self.last_box = None  # Next frame uses the whole image again
+
+        return results
+
+    def detect(self, frame):
+        """Landmarks for a BGR frame as a (1, 63) array in full-frame coordinates."""
+        full_height, full_width = frame.shape[:2]
+        x0, y0, x1, y1 = self.inference_region(frame.shape)
+        region = frame[y0:y1, x0:x1]
+        metrics = self.metrics
+        start = metrics.now() if metrics else 0.0
+
+        if self.inference_width and region.shape[1] > self.inference_width:
+            scale = self.inference_width / region.shape[1]
+            size = (self.inference_width, max(1, round(region.shape[0] * scale)))
+            region = cv2.resize(region, size, interpolation=cv2.INTER_AREA)
+
+        rgb = self.to_rgb(region)
+        if metrics:
+            start = metrics.record("convert", start)
+        results = self.process(rgb)
+        if metrics:
+            metrics.record("mediapipe", start)
+        if not results.multi_hand_landmarks:
+            return np.zeros((1, 63))
+
+        landmarks = landmark_array(results.multi_hand_landmarks[0])
+
+        # Map region-normalised coordinates back to the full frame (z scales with width)
+        region_width, region_height = x1 - x0, y1 - y0
+        landmarks[:, 0] = (x0 + landmarks[:, 0] * region_width) / full_width
+        landmarks[:, 1] = (y0 + landmarks[:, 1] * region_height) / full_height
+        landmarks[:, 2] *= region_width / full_width
+
+        self.last_box = (*landmarks[:, :2].min(axis=0), *landmarks[:, :2].max(axis=0))
+        return landmarks.reshape(1, -1)
+
+    def close(self):
+        """Release the MediaPipe graph."""
+        if self.hands is not None:
+            self.hands.close()
+            self.hands = None
 
 # ✅ **Set Paths**
 BASE_PATH = r"C:\Users\Kingshuk Maji\Documents\Sign_Connect\Sign Connect"
 MODEL_PATH = os.path.join(BASE_PATH, "Models", "SVM", "svm_model.pkl")
 SCALER_PATH = os.path.join(BASE_PATH, "Models", "SVM", "scaler.pkl")
 PCA_PATH = os.path.join(BASE_PATH, "Models", "SVM", "pca.pkl")
+PIPELINE_PATH = os.path.join(BASE_PATH, "Models", "SVM", "pipeline.json")  # Written by training.py: is PCA part of the model?
+ARTIFACT_PATH = os.path.join(BASE_PATH, "Models", "SVM", "svm_artifact")  # Exported by model_artifact.py
+ONLINE_MODEL_PATH = os.path.join(BASE_PATH, "Models", "SVM", "online_model.pkl")  # Written by "Add Sign (Quick)"
 
 # ✅ **Function to Extract Hand Landmarks**
-def detect_hand_landmarks(frame):
-    """Extracts hand landmarks from a frame and returns (1, 63) NumPy array."""
+def detect_hand_landmarks(frame, tracker=None, hands=None):
+    """Extracts hand landmarks from a frame and returns (1, 63) NumPy array.
+
+    Pass a `HandTracker` for live video; without one the static-image detector runs on every call
+    (the shared one, or `hands` from `new_static_hands()` when several threads detect at once).
+    """
     if frame is None:
-        print("❌ ERROR: Frame is empty!")
+        log.error("empty_frame")
         return np.zeros((1, 63))  # Prevents crashes
 
-    results = mp_hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    if tracker:
+        return tracker.detect(frame)
+
+    results = (hands or get_static_hands()).process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
 
     if results.multi_hand_landmarks:
-        hand_landmarks = results.multi_hand_landmarks[0]
-        landmarks = np.array([[lmk.x, lmk.y, lmk.z] for lmk in hand_landmarks.landmark])
-        return landmarks.flatten().reshape(1, -1)  # Convert (21,3) → (1,63)
+        landmarks = landmark_array(results.multi_hand_landmarks[0])
+        return landmarks.reshape(1, -1)  # Convert (21,3) → (1,63)
 
     return np.zeros((1, 63))  # Prevents crashes if no hand is detected
 
 # ✅ **Improved Speech Output Function**
 def speak_kannada(text):
-    """Converts Kannada text to speech and plays the sound asynchronously."""
+    """Queues Kannada text on the shared audio worker (returns immediately)."""
     if text and text.strip():  # ✅ Prevent empty speech
-        print(f"🗣 Speaking: {text}")
-
-        def play_audio():
-            try:
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_audio:
-                    audio_path = temp_audio.name
-
-                tts = gTTS(text=text, lang='kn')
-                tts.save(audio_path)
-
-                pygame.mixer.init()
-                pygame.mixer.music.load(audio_path)
-                pygame.mixer.music.play()
-
-                while pygame.mixer.music.get_busy():
-                    time.sleep(0.1)  # ✅ Prevents UI freezing
-
-                pygame.mixer.quit()
-                time.sleep(0.5)  # Prevent premature file deletion
-                os.remove(audio_path)
-            except Exception as e:
-                print(f"⚠️ Voice Output Error: {e}")
-
-        threading.Thread(target=play_audio, daemon=True).start()
+        get_audio_worker().speak(text)
 
 # ✅ **Real-Time Recognition Class**
 class RealTimeRecognition:
-    def __init__(self, model, scaler, pca=None):
+    def __init__(self, model, scaler, pca=None, tracking=True, compiled=True, debounce=True, speak=True,
+                 inference_width=None, crop_padding=None, predictor=None, metrics=None, video_capture=None,
+                 tracker=None):
         self.model = model
         self.scaler = scaler
         self.pca = pca
-        self.video_capture = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-
-        if not self.video_capture.isOpened():
-            print("❌ ERROR: Webcam not accessible! Try restarting your system.")
-            exit()
+        # ✅ Sliding-window vote between raw predictions and UI/TTS consumers
+        self.events = SignEventEngine() if debounce else None
+        self.last_event = None
+        self.hand_present = False  # Whether the last processed frame had a hand (drives AdaptiveRate)
+        self.speak = speak
+        # ✅ PCA + scaler + SVM folded into precomputed NumPy arrays (None → sklearn path)
+        # A ready predictor (e.g. a memory-mapped model artifact) skips compilation entirely
+        if predictor is not None:
+            self.predictor = predictor
+        else:
+            self.predictor = compile_predictor(model, scaler, pca) if compiled and model is not None else None
+        # ✅ Per-stage latency histograms (shared with the pipeline and the UI overlay)
+        self.metrics = metrics or get_stage_metrics()
+        # ✅ Live video uses its own tracker; tracking=False restores per-frame full detection
+        # Anything with a HandTracker-style detect(frame) can be injected (benchmarks replay canned landmarks)
+        if tracker is not None:
+            self.tracker = tracker
+        else:
+            self.tracker = HandTracker(inference_width=inference_width, crop_padding=crop_padding,
+                                       metrics=self.metrics) if tracking else None
+        # ✅ The camera is owned by whoever opened it (a frame_source.FrameSource);
+        # run_webcam() opens the default webcam only if nothing was handed in
+        self.video_capture = video_capture
 
     def process_frame(self, frame):
-        """Extracts features, scales them, applies PCA (if used), and predicts Kannada sign."""
-        feature = detect_hand_landmarks(frame)
-
-        # ✅ **Fix: Ensure PCA is applied safely**
-        if self.pca:
-            try:
-                if feature.shape[1] == self.pca.n_components_:
-                    feature = self.pca.transform(feature)
-                else:
-                    print("⚠️ PCA: Feature size mismatch. Skipping PCA transformation.")
-            except Exception as e:
-                print(f"⚠️ PCA Transformation Error: {e}")
-                return "None", "None"
-
-        # ✅ **Fix: Handle feature size safely**
+        """Extracts features, scales them, applies PCA (if used), and predicts Kannada sign.
+
+        Returns (raw per-frame prediction, stable sign). With debouncing enabled the stable
+        sign only changes when the event engine emits an event, and speech follows events.
+        """
+        feature = detect_hand_landmarks(frame, self.tracker)
+        self.hand_present = bool(np.any(feature))
+
+        # ✅ **No hand → no sign** (classifying an all-zero vector only produces flicker)
+        if not self.hand_present:
+            predicted_sign, score = "None", 1.0
+        else:
+            predicted_sign, score = self.classify(feature)
+
+        self.metrics.tick("recognition")
+
+        # ✅ **Debounce: only a real change of sign produces an event**
+        if self.events is None:
+            kannada_sign = predicted_sign
+            self.last_event = None
+            log.info("recognized_sign", sign=predicted_sign, score=round(score, 3))
+            if self.speak and kannada_sign and kannada_sign != "None":
+                self.enqueue_speech(kannada_sign)
+            return predicted_sign, kannada_sign
+
+        self.last_event = self.events.update(predicted_sign, score)
+        kannada_sign = self.events.current
+        if self.last_event:
+            log.info("recognized_sign", sign=kannada_sign, previous=self.last_event.previous,
+                     score=round(self.last_event.score, 3))
+            if self.speak and kannada_sign != "None":
+                self.enqueue_speech(kannada_sign)
+
+        return predicted_sign, kannada_sign
+
+    def enqueue_speech(self, text):
+        """Hand a sign to the audio worker (timed as the "tts_enqueue" stage)."""
+        start = self.metrics.now()
+        speak_kannada(text)
+        self.metrics.record("tts_enqueue", start)
+
+    def classify(self, feature):
+        """Predicts the sign for one (1, 63) feature row; returns (sign, score)."""
+        start = self.metrics.now()
+
+        # ✅ **Fast Path: compiled predictor, one matmul instead of three sklearn calls**
+        # PCA and scaling are folded into the predictor, so the whole call is one "predict" stage
+        if self.predictor is not None:
+            labels, scores = self.predictor.predict_with_scores(feature)
+            self.metrics.record("predict", start)
+            return labels[0], float(scores[0])
+
+        # ✅ **sklearn Path** (models are trained on these same 63 landmark values, in this order)
         try:
-            if feature.shape[1] != self.scaler.n_features_in_:
-                print("⚠️ Scaling Error: Feature shape mismatch. Adjusting feature shape...")
-                feature = np.zeros((1, self.scaler.n_features_in_))  # Fix shape
-            
+            if self.pca:
+                feature = self.pca.transform(feature)
+                start = self.metrics.record("pca", start)
             feature = self.scaler.transform(feature)
+            start = self.metrics.record("scale", start)
             prediction = self.model.predict(feature)
-            predicted_sign = prediction[0] if prediction else "None"
-
-            # ✅ **Fix: Kannada Prediction is Direct**
-            kannada_sign = predicted_sign  
-
-            print(f"🔮 Recognized Sign: {predicted_sign}")
-
-            # ✅ **Fix: Speak the Kannada sign**
-            if kannada_sign and kannada_sign != "None":
-                speak_kannada(kannada_sign)
-
-            return predicted_sign, kannada_sign
+            score = float(sklearn_confidence(self.model, feature)[0])
+            self.metrics.record("predict", start)
+            return prediction[0], score
         except Exception as e:
-            print(f"❌ Model Prediction Error: {e}")
-            return "None", "None"
+            log.error("prediction_error", error=e)
+            return "None", 0.0
+
+    def run_webcam(self, source=0, rate=None):
+        """Runs real-time recognition on the given frame source (default: the first webcam).
+
+        The preview always runs at camera rate; `rate` (an AdaptiveRate) thins out
+        recognition to watch mode while no hand is around.
+        """
+        rate = rate or AdaptiveRate()
+        kannada_sign = "None"
+        if self.video_capture is None:
+            self.video_capture = open_source(source)
+        if not self.video_capture.isOpened():
+            print("❌ ERROR: Frame source not accessible!")
+            return
 
-    def run_webcam(self):
-        """Runs real-time recognition using webcam."""
         while True:
+            start = self.metrics.now()
             ret, frame = self.video_capture.read()
             if not ret:
                 print("❌ ERROR: Cannot read webcam frame!")
                 break
+            start = self.metrics.record("capture", start)
+            self.metrics.tick("capture")
 
             frame = cv2.flip(frame, 1)
-            predicted_sign, kannada_sign = self.process_frame(frame)
+            self.metrics.record("flip", start)
+            if rate.due():
+                started = time.monotonic()
+                predicted_sign, kannada_sign = self.process_frame(frame)
+                rate.update(self.hand_present, started)
 
             # ✅ **Fix: Ensure correct Kannada sign is displayed**
-            if not kannada_sign or kannada_sign == "None":
-                kannada_sign = "No Sign Detected"
+            shown_sign = kannada_sign
+            if not shown_sign or shown_sign == "None":
+                shown_sign = "No Sign Detected"
 
             # Display prediction
-            cv2.putText(frame, f"Prediction: {kannada_sign}", (10, 30),
+            cv2.putText(frame, f"Prediction: {shown_sign}", (10, 30),
                         cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
 
             cv2.imshow("Real-Time Hand Sign Recognition", frame)
@@ -144,20 +344,44 @@ class RealTimeRecognition:
                 break
 
         self.video_capture.release()
+        if self.tracker:
+            self.tracker.close()
         cv2.destroyAllWindows()
 
 # ✅ **Run the Steps**
 if __name__ == "__main__":
-    if os.path.exists(MODEL_PATH) and os.path.exists(SCALER_PATH):
+    parser = argparse.ArgumentParser(description="Real-time Kannada sign recognition.")
+    parser.add_argument("--source", default="0", help="Camera index, video file, image directory or 'synthetic'")
+    args = parser.parse_args()
+
+    from incremental_training import load_online_model
+
+    if os.path.exists(ARTIFACT_PATH):
+        from model_artifact import read_meta
+
+        # ✅ Quickly added signs live in the online model until the next full training
+        predictor = load_online_model(ONLINE_MODEL_PATH, read_meta(ARTIFACT_PATH)["classes"])
+        if predictor is not None:
+            print(f"✅ Using the online model ({len(predictor.classes_)} signs, including quickly added ones)")
+        else:
+            predictor = LazyPredictor(ARTIFACT_PATH)
+        prewarm_in_background(predictor)  # ✅ Loads the model and synthesises every sign label
+        recognizer = RealTimeRecognition(None, None, predictor=predictor)
+        recognizer.run_webcam(args.source)
+    elif os.path.exists(MODEL_PATH) and os.path.exists(SCALER_PATH):
         model = joblib.load(MODEL_PATH)
         scaler = joblib.load(SCALER_PATH)
         print("✅ Model and Scaler loaded successfully!")
 
-        pca = joblib.load(PCA_PATH) if os.path.exists(PCA_PATH) else None
+        pca = joblib.load(PCA_PATH) if pipeline_uses_pca(PIPELINE_PATH) else None
         if pca:
             print("✅ PCA Model loaded successfully!")
 
-        recognizer = RealTimeRecognition(model, scaler, pca)
-        recognizer.run_webcam()
+        online_model = load_online_model(ONLINE_MODEL_PATH, model.classes_)
+        if online_model is not None:
+            print(f"✅ Using the online model ({len(online_model.classes_)} signs, including quickly added ones)")
+        prewarm_in_background(online_model or model)  # ✅ Synthesise every sign label ahead of time
+        recognizer = RealTimeRecognition(model, scaler, pca, predictor=online_model)
+        recognizer.run_webcam(args.source)
     else:
         print("❌ ERROR: Model or Scaler file is missing!")
\ No newline at end of file
@@ -1,39 +1,160 @@
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.video import Video
+from kivy.uix.gridlayout import GridLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
+from kivy.uix.image import Image
+from kivy.uix.behaviors import ButtonBehavior
 from kivy.uix.screenmanager import Screen
 from kivy.clock import Clock
+from kivy.app import App
 import os
+import tempfile
+import threading
+from audio_worker import get_audio_worker
+
+# ✅ Emergency media: the configured directory, or the copy bundled with the app
+EMERGENCY_DIR = r"C:\Users\Kingshuk Maji\Documents\Sign_Connect\Sign Connect\Emergency"
+BUNDLED_EMERGENCY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Emergency")
+THUMBNAIL_DIR_NAME = "emergency_thumbnails"
+THUMBNAIL_SIZE = 240
+
+VIDEO_EXTENSIONS = ('.gif', '.mp4')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+# ✅ Phrases spoken for the emergency media, in Kannada like the recogniser's sign labels.
+# Keyed by file name without extension (any case); media without an entry stays silent.
+EMERGENCY_PHRASES = {
+    "food": "ನನಗೆ ಆಹಾರ ಬೇಕು",
+    "help": "ದಯವಿಟ್ಟು ಸಹಾಯ ಮಾಡಿ",
+    "lost": "ನಾನು ದಾರಿ ತಪ್ಪಿದ್ದೇನೆ",
+    "water": "ನನಗೆ ನೀರು ಬೇಕು",
+    "restroom": "ಶೌಚಾಲಯ ಎಲ್ಲಿದೆ?",
+}
+
+
+def media_caption(media_path):
+    """Caption of a tile: the file name without extension."""
+    return os.path.splitext(os.path.basename(media_path))[0].replace('_', ' ')
+
+
+def media_phrase(media_path):
+    """Kannada phrase spoken for a tile, or None if the clip has no curated phrase."""
+    stem = os.path.splitext(os.path.basename(media_path))[0]
+    return EMERGENCY_PHRASES.get(stem.lower())
+
+
+def thumbnail_dir():
+    """Writable cache folder for thumbnails: the app's user data dir (the media folder may be read-only)."""
+    app = App.get_running_app()
+    base = app.user_data_dir if app is not None else tempfile.gettempdir()
+    return os.path.join(base, THUMBNAIL_DIR_NAME)
+
+
+def thumbnail_path(media_path, cache_dir):
+    """Where the cached thumbnail of a media file lives."""
+    return os.path.join(cache_dir, f"{os.path.basename(media_path)}.png")
+
+
+def ensure_thumbnail(media_path, cache_dir):
+    """Create the thumbnail once (or again if the media changed); returns its path or None."""
+    import cv2
+
+    thumb_path = thumbnail_path(media_path, cache_dir)
+    if os.path.exists(thumb_path) and os.path.getmtime(thumb_path) >= os.path.getmtime(media_path):
+        return thumb_path
+
+    if media_path.lower().endswith(VIDEO_EXTENSIONS):
+        capture = cv2.VideoCapture(media_path)
+        ret, frame = capture.read()  # First frame is enough for a still preview
+        capture.release()
+        if not ret:
+            frame = None
+    else:
+        frame = cv2.imread(media_path)
+
+    if frame is None and media_path.lower().endswith('.gif'):
+        from PIL import Image as PILImage  # Fallback when OpenCV has no GIF decoder
+        import numpy as np
+        with PILImage.open(media_path) as gif:
+            frame = cv2.cvtColor(np.array(gif.convert('RGB')), cv2.COLOR_RGB2BGR)
+
+    if frame is None:
+        print(f"⚠️ Warning: Could not create thumbnail for {media_path}.")
+        return None
+
+    height, width = frame.shape[:2]
+    scale = THUMBNAIL_SIZE / max(height, width)
+    if scale < 1:
+        frame = cv2.resize(frame, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+
+    # imencode + open() also works for non-ASCII paths, which cv2.imwrite does not on Windows
+    ok, png = cv2.imencode('.png', frame)
+    try:
+        if not ok:
+            raise OSError("PNG encoding failed")
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(thumb_path, 'wb') as f:
+            f.write(png.tobytes())
+    except OSError as e:
+        print(f"⚠️ Warning: Could not save thumbnail for {media_path}: {e}")
+        return None
+    return thumb_path
+
+
+class MediaTile(ButtonBehavior, BoxLayout):
+    """Static thumbnail + caption; tapping it selects the clip for playback."""
+
+    def __init__(self, media_path, **kwargs):
+        super().__init__(orientation='vertical', **kwargs)
+        self.media_path = media_path
+        self.thumbnail = Image(size_hint=(1, 0.8), allow_stretch=True, keep_ratio=True)
+        self.add_widget(self.thumbnail)
+        self.add_widget(Label(
+            text=media_caption(media_path),
+            size_hint=(1, 0.2),
+            halign='center'
+        ))
+
 
 class EmergencyScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         layout = BoxLayout(orientation='vertical', spacing=10, padding=20)
 
-        # ✅ Ensure emergency GIF directory exists
-        emergency_gif_dir = r"C:\Users\Kingshuk Maji\Documents\Sign_Connect\Sign Connect\Emergency"
+        # Only the selected clip decodes; everything else is a cached still image
+        self.player = None
+        self.tiles = []
+        self.player_box = BoxLayout(size_hint=(1, 0))
+        layout.add_widget(self.player_box)
+
+        emergency_dir = EMERGENCY_DIR if os.path.exists(EMERGENCY_DIR) else BUNDLED_EMERGENCY_DIR
 
-        if not os.path.exists(emergency_gif_dir):
-            print(f"❌ Error: Directory '{emergency_gif_dir}' not found.")
+        if not os.path.exists(emergency_dir):
+            print(f"❌ Error: Directory '{emergency_dir}' not found.")
             error_label = Label(text="Emergency GIF directory not found!", size_hint=(1, 0.6))
             layout.add_widget(error_label)
         else:
-            # ✅ Load GIFs dynamically from the directory
-            gif_paths = [os.path.join(emergency_gif_dir, f) for f in os.listdir(emergency_gif_dir) if f.endswith('.gif')]
+            # ✅ Load all emergency media (GIF, MP4 and images) from the directory
+            media_paths = sorted(
+                os.path.join(emergency_dir, f) for f in os.listdir(emergency_dir)
+                if f.lower().endswith(VIDEO_EXTENSIONS + IMAGE_EXTENSIONS)
+            )
 
-            if not gif_paths:
-                error_label = Label(text="No GIFs found in the directory.", size_hint=(1, 0.6))
+            if not media_paths:
+                error_label = Label(text="No emergency media found in the directory.", size_hint=(1, 0.6))
                 layout.add_widget(error_label)
             else:
-                for gif_path in gif_paths:
-                    gif_box = BoxLayout(orientation='vertical', size_hint=(1, 0.6))
-                    gif = Video(source=gif_path, options={'eos': 'loop'}, size_hint=(1, 0.8))
-                    gif.state = 'play'  # ✅ Ensure GIF plays automatically
-                    gif_label = Label(text=os.path.splitext(os.path.basename(gif_path))[0], size_hint=(1, 0.2), halign='center')
-                    gif_box.add_widget(gif)
-                    gif_box.add_widget(gif_label)
-                    layout.add_widget(gif_box)
+                grid = GridLayout(cols=3, spacing=10, size_hint=(1, 0.8))
+                for media_path in media_paths:
+                    tile = MediaTile(media_path)
+                    tile.bind(on_release=self.select_media)
+                    grid.add_widget(tile)
+                    self.tiles.append(tile)
+                layout.add_widget(grid)
+
+                # ✅ Thumbnails are built off the UI thread the first time, then reused from disk
+                threading.Thread(target=self.load_thumbnails, args=(thumbnail_dir(),), daemon=True).start()
 
         # ✅ Add Back Button
         back_button = Button(text="⬅ Back to Home", size_hint=(1, 0.1), background_color=(1, 0.3, 0.3, 1))
@@ -42,6 +163,44 @@ class EmergencyScreen(Screen):
 
         self.add_widget(layout)
 
+    def load_thumbnails(self, cache_dir):
+        """Generate/find every thumbnail and hand it to its tile on the UI thread."""
+        for tile in self.tiles:
+            thumb_path = ensure_thumbnail(tile.media_path, cache_dir)
+            if thumb_path:
+                Clock.schedule_once(lambda dt, tile=tile, path=thumb_path: setattr(tile.thumbnail, 'source', path))
+
+    def select_media(self, tile):
+        """Show the selected media large and speak its phrase (if it has one) ahead of any queued sign speech."""
+        self.stop_playback()
+        phrase = media_phrase(tile.media_path)
+        if phrase:
+            get_audio_worker().speak_emergency(phrase)
+
+        if tile.media_path.lower().endswith(VIDEO_EXTENSIONS):
+            from kivy.uix.video import Video
+            self.player = Video(source=tile.media_path, options={'eos': 'loop'}, state='play')
+        else:
+            self.player = Image(source=tile.media_path, allow_stretch=True, keep_ratio=True)
+
+        self.player_box.add_widget(self.player)
+        self.player_box.size_hint_y = 0.6
+
+    def stop_playback(self):
+        """Stop and release the currently selected clip, if any."""
+        if self.player is None:
+            return
+        if hasattr(self.player, 'unload'):
+            self.player.state = 'stop'
+            self.player.unload()
+        self.player_box.remove_widget(self.player)
+        self.player_box.size_hint_y = 0
+        self.player = None
+
+    def on_leave(self, *args):
+        """Nothing keeps decoding once the screen is not visible."""
+        self.stop_playback()
+
     def back_to_second_page(self, instance):
         """Navigate back to the second page safely."""
         if "second" in self.manager.screen_names:
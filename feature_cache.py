@@ -0,0 +1,134 @@
+import os
+import json
+import time
+import shutil
+import numpy as np
+from feature_extraction import file_digest
+
+
+# ✅ **Per-Image Feature Cache**
+# <cache_dir>/<extractor version>/index.json          – image path → content hash, size, mtime
+# <cache_dir>/<extractor version>/<hh>/<sha256>.npy   – the features extracted from that content
+class FeatureCache:
+    """Content-addressed cache of per-image features, so retraining only extracts what changed.
+
+    Entries are keyed by the SHA-256 of the image bytes under a directory named after the
+    extractor version, so renamed/moved images are reused, edited images are re-extracted,
+    and a new extractor (landmark layout, MediaPipe release) starts a fresh cache.
+    File size + mtime are kept in the index to skip re-hashing untouched images.
+    """
+
+    def __init__(self, cache_dir, version):
+        self.cache_dir = cache_dir
+        self.version = version
+        self.root = os.path.join(cache_dir, version)
+        self.index_path = os.path.join(self.root, "index.json")
+        os.makedirs(self.root, exist_ok=True)
+        self.index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _feature_path(self, digest):
+        return os.path.join(self.root, digest[:2], f"{digest}.npy")
+
+    def content_key(self, image_path):
+        """SHA-256 of the image, reusing the indexed hash while size and mtime are unchanged."""
+        stat = os.stat(image_path)
+        entry = self.index.get(image_path)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["sha256"]
+        return file_digest(image_path)
+
+    def _store(self, digest, features):
+        """Write one image's features atomically."""
+        path = self._feature_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp.npy"
+        np.save(tmp_path, np.ascontiguousarray(features))
+        os.replace(tmp_path, path)
+
+    def update(self, image_paths, extractor_factory, progress=None, cancel=None):
+        """Bring the cache in line with `image_paths`: extract new/changed images, drop deleted ones.
+
+        `extractor_factory()` is only called (and the detector only loaded) if something has to be
+        extracted. Returns counts of reused, extracted and removed entries.
+        """
+        started = time.perf_counter()
+        keys = {path: self.content_key(path) for path in image_paths}
+
+        # Identical images (copies across classes) are extracted once
+        missing = {}
+        for path, digest in keys.items():
+            if digest not in missing and not os.path.exists(self._feature_path(digest)):
+                missing[digest] = path
+        missing_paths = list(missing.values())
+
+        extracted = 0
+        if missing_paths:
+            extractor = extractor_factory()
+            for index, features in extractor.iter_features(missing_paths, progress, cancel):
+                self._store(keys[missing_paths[index]], features)
+                extracted += 1
+
+        # Index only what is cached now (a cancelled run keeps its partial progress)
+        previous = self.index
+        self.index = {}
+        for path, digest in keys.items():
+            if os.path.exists(self._feature_path(digest)):
+                stat = os.stat(path)
+                self.index[path] = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        removed = len(set(previous) - set(keys))
+        self._save_index()
+        self._prune(set(keys.values()))
+
+        stats = {
+            "images": len(image_paths),
+            "reused": len(self.index) - extracted,
+            "extracted": extracted,
+            "removed": removed,
+            "seconds": round(time.perf_counter() - started, 2),
+        }
+        print(f"✅ Feature cache: {stats['reused']} reused, {stats['extracted']} extracted, "
+              f"{stats['removed']} removed in {stats['seconds']}s")
+        return stats
+
+    def _prune(self, live_digests):
+        """Delete feature files no image refers to any more, and caches of older extractor versions."""
+        for folder in os.listdir(self.root):
+            folder_path = os.path.join(self.root, folder)
+            if not os.path.isdir(folder_path):
+                continue
+            for filename in os.listdir(folder_path):
+                if filename.endswith(".npy") and filename[:-4] not in live_digests:
+                    os.remove(os.path.join(folder_path, filename))
+
+        for version in os.listdir(self.cache_dir):
+            if version != self.version and os.path.isdir(os.path.join(self.cache_dir, version)):
+                shutil.rmtree(os.path.join(self.cache_dir, version), ignore_errors=True)
+
+    def features(self, image_path):
+        """Cached feature rows of one image, or None if it has not been extracted."""
+        entry = self.index.get(image_path)
+        if entry is None:
+            return None
+        return np.load(self._feature_path(entry["sha256"]))
+
+    def export(self, samples, store):
+        """Stream the cached features of [(image_path, label_id), ...] into a FeatureStore, one image at a time."""
+        for image_path, label_id in samples:
+            rows = self.features(image_path)
+            if rows is not None and len(rows):
+                store.append(rows, label_id)
+        store.flush()
+        return len(store)
@@ -0,0 +1,146 @@
+import os
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+# ✅ **Dataset Discovery**
+def list_dataset(data_path):
+    """Return (class names, [(image_path, label_id), ...]) for a Datasets/<class>/<image> tree."""
+    classes = sorted(
+        name for name in os.listdir(data_path)
+        if os.path.isdir(os.path.join(data_path, name))
+    )
+    samples = []
+    for label_id, sign_name in enumerate(classes):
+        sign_path = os.path.join(data_path, sign_name)
+        for filename in sorted(os.listdir(sign_path)):
+            if filename.lower().endswith(IMAGE_EXTENSIONS):
+                samples.append((os.path.join(sign_path, filename), label_id))
+    return classes, samples
+
+
+def decode_image(image_path):
+    """Decode one image, or None (with a warning) if it can't be read."""
+    image = cv2.imread(image_path)
+    if image is None:
+        print(f"⚠️ Warning: Could not read {image_path}. Skipping.")
+    return image
+
+
+# ✅ **Content Hashing** (keys of the feature cache)
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ✅ **MediaPipe Landmark Features** (what the live path classifies)
+LANDMARK_DIM = 63  # 21 hand landmarks × (x, y, z)
+LANDMARK_VERSION = 1  # Bump when the landmark layout or detector settings change
+
+
+def landmark_array(hand_landmarks):
+    """(21, 3) x/y/z array of one MediaPipe hand; flattened, this is the 63-value feature row."""
+    return np.array([[lmk.x, lmk.y, lmk.z] for lmk in hand_landmarks.landmark])
+
+
+def extract_landmark_chunk(image_paths, start, hands=None):
+    """Worker task: landmarks of independent images with the static detector of `conversion`.
+
+    `hands` is the calling thread's own detector (see `conversion.new_static_hands`); without
+    it the module's shared detector is used. Returns (start, features float32 (n, 63),
+    hand_found (n,)); rows without a hand are zero.
+    """
+    from conversion import detect_hand_landmarks
+
+    features = np.zeros((len(image_paths), LANDMARK_DIM), dtype=np.float32)
+    for offset, image_path in enumerate(image_paths):
+        image = decode_image(image_path)
+        if image is not None:
+            features[offset] = detect_hand_landmarks(image, hands=hands)[0]
+    found = np.any(features != 0, axis=1)
+    return start, features, found
+
+
+def landmark_version():
+    """Identifies everything that changes landmark features: code version and MediaPipe release."""
+    from importlib import metadata
+    try:
+        mediapipe_version = metadata.version("mediapipe")
+    except metadata.PackageNotFoundError:
+        mediapipe_version = "unknown"
+    return f"landmarks-v{LANDMARK_VERSION}-mediapipe-{mediapipe_version}"
+
+
+class LandmarkExtractor:
+    """Dataset images → the same (1, 63) landmark rows `detect_hand_landmarks` gives the live path.
+
+    Chunks of images go to a pool of threads, each reusing its own static-image detector
+    (MediaPipe and OpenCV release the GIL while they work). Threads rather than processes:
+    training runs inside the Kivy app, and spawned workers would re-import `main.py`.
+    `iter_features` is what the feature cache consumes: an image yields one row, or none
+    if no hand (or no readable image) was found.
+    """
+
+    feature_dim = LANDMARK_DIM
+
+    def __init__(self, workers=None, chunk_size=32):
+        self.version = landmark_version()
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._local = threading.local()
+        self._detectors = []
+        self._detectors_lock = threading.Lock()
+
+    def _extract_chunk(self, image_paths, start):
+        """Pool task: extract one chunk with this thread's detector (created on its first chunk)."""
+        hands = getattr(self._local, "hands", None)
+        if hands is None:
+            from conversion import new_static_hands
+            hands = self._local.hands = new_static_hands()
+            with self._detectors_lock:
+                self._detectors.append(hands)
+        return extract_landmark_chunk(image_paths, start, hands)
+
+    def close(self):
+        """Release every thread's MediaPipe graph."""
+        with self._detectors_lock:
+            detectors, self._detectors = self._detectors, []
+        for hands in detectors:
+            hands.close()
+
+    def iter_features(self, image_paths, progress=None, cancel=None):
+        """Yield (index, landmarks (0 or 1, 63) float32) for every image, in order."""
+        try:
+            yield from self._iter_features(image_paths, progress, cancel)
+        finally:
+            self.close()
+
+    def _iter_features(self, image_paths, progress, cancel):
+        done = 0
+        self._local = threading.local()  # Fresh detectors for the new pool's threads
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="landmarks") as pool:
+            futures = [
+                pool.submit(self._extract_chunk, image_paths[start:start + self.chunk_size], start)
+                for start in range(0, len(image_paths), self.chunk_size)
+            ]
+            for future in futures:
+                if cancel is not None and cancel.is_set():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    print("⚠️ Feature extraction cancelled.")
+                    return
+                start, features, found = future.result()
+                for offset, has_hand in enumerate(found):
+                    yield start + offset, features[offset:offset + 1] if has_hand else features[:0]
+
+                done += len(features)
+                if progress:
+                    progress(done, len(image_paths))
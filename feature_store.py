@@ -0,0 +1,150 @@
+import os
+import json
+import shutil
+import numpy as np
+
+# ✅ **Store Layout**
+# <store>/meta.json     – dtype, feature dim, row count, capacity, class names
+# <store>/features.dat  – (capacity, feature_dim) raw rows, memory-mapped
+# <store>/labels.dat    – (capacity,) int32 label ids, memory-mapped
+DEFAULT_CHUNK_ROWS = 4096
+
+
+class FeatureStore:
+    """Append-only, memory-mapped feature matrix with a label column.
+
+    Rows are written straight into preallocated files that grow by `chunk_rows` at a
+    time, so building a dataset never holds more than one chunk in Python memory, and
+    readers stream it back in batches. Only `meta.json` says how many rows are valid,
+    and it is rewritten after the data, so an interrupted append never exposes garbage.
+    """
+
+    def __init__(self, path, feature_dim=None, dtype=np.float32, chunk_rows=DEFAULT_CHUNK_ROWS):
+        self.path = path
+        self.meta_path = os.path.join(path, "meta.json")
+        self.chunk_rows = chunk_rows
+
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+            if feature_dim is not None and feature_dim != self.meta["feature_dim"]:
+                raise ValueError(f"Feature store {path} has dim {self.meta['feature_dim']}, not {feature_dim}")
+        else:
+            if feature_dim is None:
+                raise ValueError(f"Feature store {path} does not exist; feature_dim is required to create it")
+            os.makedirs(path, exist_ok=True)
+            self.meta = {"dtype": np.dtype(dtype).str, "feature_dim": int(feature_dim), "rows": 0,
+                         "capacity": 0, "classes": []}
+            self._save_meta()
+
+        self.dtype = np.dtype(self.meta["dtype"])
+        self.feature_dim = self.meta["feature_dim"]
+        self._features = None
+        self._labels = None
+        self._map()
+
+    @classmethod
+    def create(cls, path, feature_dim, dtype=np.float32, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Start an empty store at `path`, replacing any previous one."""
+        shutil.rmtree(path, ignore_errors=True)
+        return cls(path, feature_dim, dtype, chunk_rows)
+
+    def _save_meta(self):
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False)
+        os.replace(tmp_path, self.meta_path)
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _map(self):
+        """(Re)open the memory maps at the current capacity."""
+        capacity = self.meta["capacity"]
+        if capacity == 0:
+            self._features = np.zeros((0, self.feature_dim), dtype=self.dtype)
+            self._labels = np.zeros(0, dtype=np.int32)
+            return
+        self._features = np.memmap(self._file("features.dat"), dtype=self.dtype, mode="r+",
+                                   shape=(capacity, self.feature_dim))
+        self._labels = np.memmap(self._file("labels.dat"), dtype=np.int32, mode="r+", shape=(capacity,))
+
+    def _grow(self, needed_rows):
+        """Extend both files to hold at least `needed_rows`, in whole chunks."""
+        capacity = self.meta["capacity"]
+        if needed_rows <= capacity:
+            return
+        new_capacity = -(-needed_rows // self.chunk_rows) * self.chunk_rows
+        self._features = self._labels = None  # Release the maps before resizing the files
+        for name, row_bytes in (("features.dat", self.dtype.itemsize * self.feature_dim), ("labels.dat", 4)):
+            with open(self._file(name), "ab") as f:
+                f.truncate(new_capacity * row_bytes)
+        self.meta["capacity"] = new_capacity
+        self._map()
+
+    # ✅ **Writing**
+    def append(self, rows, labels):
+        """Append (n, feature_dim) rows with their integer labels."""
+        rows = np.asarray(rows).reshape(-1, self.feature_dim)
+        if not len(rows):
+            return
+        start = self.meta["rows"]
+        self._grow(start + len(rows))
+        self._features[start:start + len(rows)] = rows
+        self._labels[start:start + len(rows)] = labels
+        self.meta["rows"] = start + len(rows)
+
+    def set_classes(self, classes):
+        self.meta["classes"] = list(classes)
+
+    def flush(self):
+        """Persist the data, then the row count that makes it visible."""
+        if self.meta["capacity"]:
+            self._features.flush()
+            self._labels.flush()
+        self._save_meta()
+
+    # ✅ **Reading**
+    def __len__(self):
+        return self.meta["rows"]
+
+    @property
+    def classes(self):
+        return self.meta["classes"]
+
+    @property
+    def features(self):
+        """Memory-mapped (rows, feature_dim) view; slicing it only reads the touched pages."""
+        return self._features[:len(self)]
+
+    @property
+    def labels(self):
+        return self._labels[:len(self)]
+
+    def label_index(self):
+        """{label id: row indices} without touching the feature file."""
+        labels = np.asarray(self.labels)
+        return {int(label): np.flatnonzero(labels == label) for label in np.unique(labels)}
+
+    def iter_batches(self, batch_size=DEFAULT_CHUNK_ROWS, indices=None, dtype=None):
+        """Yield (X, y) batches of all rows, or of `indices` (sorted within each batch), converted to `dtype`."""
+        total = len(self) if indices is None else len(indices)
+        for start in range(0, total, batch_size):
+            if indices is None:
+                rows = slice(start, start + batch_size)
+            else:
+                rows = np.sort(indices[start:start + batch_size])  # Sorted reads are sequential on disk
+            X = self._features[rows]
+            yield (X.astype(dtype) if dtype is not None else np.array(X)), np.array(self._labels[rows])
+
+    def take(self, indices, dtype=None):
+        """Load the given rows into memory, e.g. one split of a train/test partition."""
+        indices = np.sort(indices)
+        X = np.empty((len(indices), self.feature_dim), dtype=dtype or self.dtype)
+        y = np.empty(len(indices), dtype=np.int32)
+        offset = 0
+        for X_batch, y_batch in self.iter_batches(indices=indices, dtype=dtype):
+            X[offset:offset + len(X_batch)] = X_batch
+            y[offset:offset + len(y_batch)] = y_batch
+            offset += len(X_batch)
+        return X, y
@@ -0,0 +1,240 @@
+import os
+import abc
+import time
+import cv2
+import numpy as np
+from stage_metrics import log
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+# ✅ **Default Capture Format** (MJPG lets USB webcams deliver 640x480@30 without choking the bus)
+DEFAULT_WIDTH = 640
+DEFAULT_HEIGHT = 480
+DEFAULT_FPS = 30
+DEFAULT_FOURCC = "MJPG"
+
+
+class FrameSource(abc.ABC):
+    """Abstract base with the read()/isOpened()/release() API of cv2.VideoCapture.
+
+    Everything that consumes frames (RealTimeRecognition, RecognitionPipeline, the Kivy
+    screen) takes one of these, so a device is opened exactly once by whoever owns it.
+    """
+
+    @abc.abstractmethod
+    def read(self):
+        """Return (ok, frame) like cv2.VideoCapture.read()."""
+
+    def isOpened(self):
+        return False
+
+    def release(self):
+        pass
+
+    def get(self, prop):
+        return 0.0
+
+    def set(self, prop, value):
+        return False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class _PacedSource(FrameSource):
+    """Shared pacing for recorded sources so they behave like a camera (one frame per 1/fps)."""
+
+    def __init__(self, fps=None):
+        self.fps = fps
+        self._next_frame_at = None
+
+    def _wait_for_next_frame(self):
+        if not self.fps:
+            return
+        now = time.perf_counter()
+        if self._next_frame_at is None:
+            self._next_frame_at = now
+        self._next_frame_at += 1.0 / self.fps
+        if self._next_frame_at > now:
+            time.sleep(self._next_frame_at - now)
+        else:
+            self._next_frame_at = now  # Fell behind: don't try to catch up with a burst
+
+
+# ✅ **Webcam**
+class WebcamSource(FrameSource):
+    """Opens a camera once and negotiates format, resolution, frame rate and buffering.
+
+    `buffer_size=1` keeps the driver from queueing stale frames, so every read returns the
+    freshest one. Backends that ignore the setting are reported once on open.
+    """
+
+    def __init__(self, index=0, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, fps=DEFAULT_FPS,
+                 fourcc=DEFAULT_FOURCC, buffer_size=1, backend=None):
+        if backend is None:
+            backend = cv2.CAP_DSHOW if os.name == "nt" else cv2.CAP_ANY
+        self.index = index
+        self.capture = cv2.VideoCapture(index, backend)
+        if not self.capture.isOpened():
+            print(f"❌ ERROR: Webcam {index} not accessible! Try restarting your system.")
+            return
+
+        if fourcc:
+            self.capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        if width and height:
+            self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps:
+            self.capture.set(cv2.CAP_PROP_FPS, fps)
+        if buffer_size and not self.capture.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size):
+            print("⚠️ Camera backend ignores the buffer size; frames may lag slightly.")
+
+        print(f"✅ Webcam {index}: {self.describe()}")
+
+    def describe(self):
+        """The format the driver actually agreed to."""
+        code = int(self.capture.get(cv2.CAP_PROP_FOURCC))
+        fourcc = "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)) if code else "?"
+        return (f"{int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))}x{int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))}"
+                f" @ {self.capture.get(cv2.CAP_PROP_FPS):.0f} fps, {fourcc}, buffer {int(self.capture.get(cv2.CAP_PROP_BUFFERSIZE))}")
+
+    def read(self):
+        return self.capture.read()
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def release(self):
+        self.capture.release()
+
+    def get(self, prop):
+        return self.capture.get(prop)
+
+    def set(self, prop, value):
+        return self.capture.set(prop, value)
+
+
+# ✅ **Recorded Video File**
+class VideoFileSource(_PacedSource):
+    """Plays a video file, paced at its native frame rate unless `realtime=False`."""
+
+    def __init__(self, path, realtime=True, loop=False):
+        self.path = path
+        self.loop = loop
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            print(f"❌ ERROR: Video file '{path}' could not be opened.")
+        super().__init__((self.capture.get(cv2.CAP_PROP_FPS) or DEFAULT_FPS) if realtime else None)
+
+    def read(self):
+        self._wait_for_next_frame()
+        ret, frame = self.capture.read()
+        if not ret and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.capture.read()
+        return ret, frame
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def release(self):
+        self.capture.release()
+
+    def get(self, prop):
+        return self.capture.get(prop)
+
+
+# ✅ **In-Memory Frames** (image directories, synthetic clips, benchmarks)
+class FrameListSource(_PacedSource):
+    """Serves a list of BGR frames, optionally looping and paced at `fps`."""
+
+    def __init__(self, frames, fps=None, loop=True):
+        super().__init__(fps)
+        self.frames = list(frames)
+        self.loop = loop
+        self.index = 0
+        self.opened = bool(self.frames)
+
+    def read(self):
+        if not self.opened or (not self.loop and self.index >= len(self.frames)):
+            return False, None
+        self._wait_for_next_frame()
+        frame = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        return True, frame.copy()  # A real camera hands out a fresh buffer every time
+
+    def isOpened(self):
+        return self.opened
+
+    def release(self):
+        self.opened = False
+
+    def get(self, prop):
+        if not self.frames:
+            return 0.0
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps or 0)
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.frames[0].shape[1])
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.frames[0].shape[0])
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.frames))
+        return 0.0
+
+
+class ImageDirectorySource(FrameListSource):
+    """Serves the images of a directory in name order (decoded once, up front)."""
+
+    def __init__(self, directory, fps=DEFAULT_FPS, loop=False):
+        paths = sorted(
+            os.path.join(directory, f) for f in os.listdir(directory)
+            if f.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        frames = []
+        for path in paths:
+            frame = cv2.imread(path)
+            if frame is None:
+                log.warning("unreadable_image", path=path)
+                continue
+            frames.append(frame)
+        super().__init__(frames, fps, loop)
+
+
+def synthetic_frames(count=60, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, seed=0):
+    """Deterministic noisy frames with a skin-coloured blob moving across them."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(count):
+        frame = rng.integers(0, 60, (height, width, 3), dtype=np.uint8)
+        cx = int(width * (0.3 + 0.4 * i / max(1, count - 1)))
+        cy = int(height * 0.5)
+        cv2.ellipse(frame, (cx, cy), (width // 10, height // 6), 0, 0, 360, (120, 160, 220), -1)
+        frames.append(frame)
+    return frames
+
+
+class SyntheticSource(FrameListSource):
+    """Endless generated frames for running the app or the pipeline without any camera."""
+
+    def __init__(self, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, fps=DEFAULT_FPS, count=60, seed=0):
+        super().__init__(synthetic_frames(count, width, height, seed), fps, loop=True)
+
+
+# ✅ **Factory**
+def open_source(spec=0, **options):
+    """Open a frame source from a spec: camera index, "synthetic", an image directory or a video file.
+
+    `options` go to the matching source class (e.g. width/height/fps/fourcc/buffer_size
+    for a webcam, realtime/loop for a video file).
+    """
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return WebcamSource(int(spec), **options)
+    if spec == "synthetic":
+        return SyntheticSource(**options)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, **options)
+    return VideoFileSource(spec, **options)
@@ -0,0 +1,203 @@
+import os
+import time
+import threading
+import joblib
+import numpy as np
+
+DEFAULT_EPOCHS = 5         # Passes over the store per consolidation
+NEGATIVES_PER_SIGN = 2000  # Rows of other signs replayed from the feature store when a sign is added
+CONSOLIDATE_AFTER = 3      # Incremental additions before a full background consolidation
+
+
+# ✅ **Online One-vs-Rest Linear Model**
+class OnlineSignModel:
+    """One binary SGD linear classifier per sign, so a new sign is added without retraining the rest.
+
+    Adding a sign trains one new classifier (the new samples against a replayed sample of
+    the other signs) and gives every existing classifier a few partial_fit passes over
+    the same rows. Prediction takes the highest decision value. Features are
+    standardised with statistics frozen at the last consolidation.
+    """
+
+    def __init__(self, feature_dim, alpha=1e-4):
+        self.feature_dim = feature_dim
+        self.alpha = alpha
+        self.models = {}
+        self.mean_ = np.zeros(feature_dim, dtype=np.float32)
+        self.scale_ = np.ones(feature_dim, dtype=np.float32)
+        self.additions_since_consolidation = 0
+        self.consolidated_at = None
+
+    @property
+    def classes_(self):
+        return np.array(list(self.models))
+
+    @property
+    def n_features_in_(self):
+        return self.feature_dim
+
+    def _new_classifier(self):
+        from sklearn.linear_model import SGDClassifier
+        return SGDClassifier(loss="hinge", alpha=self.alpha, average=True)
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float32) - self.mean_) / self.scale_
+
+    def fit_scaling(self, store, batch_size=4096):
+        """Streaming mean / std over a FeatureStore (the only pass that touches every row)."""
+        total = np.zeros(self.feature_dim, dtype=np.float64)
+        total_sq = np.zeros(self.feature_dim, dtype=np.float64)
+        for X, _ in store.iter_batches(batch_size, dtype=np.float64):
+            total += X.sum(axis=0)
+            total_sq += (X ** 2).sum(axis=0)
+        n = max(1, len(store))
+        mean = total / n
+        std = np.sqrt(np.maximum(total_sq / n - mean ** 2, 0.0))
+        self.mean_ = mean.astype(np.float32)
+        self.scale_ = np.where(std > 1e-6, std, 1.0).astype(np.float32)
+
+    @staticmethod
+    def _balanced_weights(is_sign):
+        """Sample weights under which positives and negatives weigh the same in total."""
+        positives = max(1, int(is_sign.sum()))
+        negatives = max(1, len(is_sign) - positives)
+        return np.where(is_sign, len(is_sign) / (2.0 * positives), len(is_sign) / (2.0 * negatives))
+
+    def _partial_fit(self, sign, X, is_sign):
+        """One balanced pass of one classifier."""
+        self.models[sign].partial_fit(X, is_sign, classes=np.array([False, True]),
+                                      sample_weight=self._balanced_weights(is_sign))
+
+    def add_sign(self, sign, X_sign, X_others, y_others, epochs=DEFAULT_EPOCHS, seed=0):
+        """Learn a new sign (or refresh an existing one) from its rows plus replayed rows of other signs.
+
+        The sign's own binary problem is small enough to fit to convergence in memory. Every
+        existing classifier then takes a few balanced passes over the same replayed rows,
+        where the new sign's rows are negatives, so none of them keeps claiming the new sign.
+        """
+        rng = np.random.default_rng(seed)
+        X = self.transform(np.vstack([X_sign, X_others]))
+        y = np.concatenate([np.full(len(X_sign), sign, dtype=object), np.asarray(y_others, dtype=object)])
+
+        self.models[sign] = self._new_classifier()
+        self.models[sign].set_params(random_state=seed)
+        self.models[sign].fit(X, y == sign, sample_weight=self._balanced_weights(y == sign))
+
+        for _ in range(epochs):
+            order = rng.permutation(len(X))
+            for other in self.models:
+                if other != sign:
+                    self._partial_fit(other, X[order], y[order] == other)
+        self.additions_since_consolidation += 1
+
+    def consolidate(self, store, epochs=DEFAULT_EPOCHS, batch_size=4096, seed=0, cancel=None):
+        """Full retrain of every classifier from the whole store, streamed in batches."""
+        rng = np.random.default_rng(seed)
+        self.fit_scaling(store, batch_size)
+        classes = store.classes
+        self.models = {sign: self._new_classifier() for sign in classes}
+
+        batches = [(start, min(start + batch_size, len(store))) for start in range(0, len(store), batch_size)]
+        for _ in range(epochs):
+            for start, stop in (batches[i] for i in rng.permutation(len(batches))):
+                if cancel is not None and cancel.is_set():
+                    return False
+                X = self.transform(store.features[start:stop])
+                y = np.asarray(store.labels[start:stop])
+                order = rng.permutation(len(X))
+                X, y = X[order], y[order]
+                for label_id, sign in enumerate(classes):
+                    self._partial_fit(sign, X, y == label_id)
+
+        self.additions_since_consolidation = 0
+        self.consolidated_at = time.time()
+        return True
+
+    def decision_function(self, X):
+        X = self.transform(X).reshape(-1, self.feature_dim)
+        return np.column_stack([model.decision_function(X) for model in self.models.values()])
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.decision_function(X), axis=1)]
+
+    def predict_with_scores(self, X):
+        """Return (labels, confidence in [0, 1]), like CompiledPredictor, so it can stand in for one.
+
+        The confidence is the logistic of the winning classifier's margin: 0.5 on its
+        decision boundary, approaching 1 as the row moves clearly onto the sign's side.
+        """
+        scores = self.decision_function(X)
+        best = np.argmax(scores, axis=1)
+        margins = scores[np.arange(len(best)), best]
+        return self.classes_[best], 1.0 / (1.0 + np.exp(-margins))
+
+
+# ✅ **Replay Sampling**
+def sample_rows(store, exclude_label=None, limit=NEGATIVES_PER_SIGN, seed=0):
+    """Random (rows, sign names) of the store (optionally not of one label), read straight from the memory map."""
+    labels = np.asarray(store.labels)
+    candidates = np.flatnonzero(labels != exclude_label) if exclude_label is not None else np.arange(len(store))
+    if len(candidates) > limit:
+        candidates = np.random.default_rng(seed).choice(candidates, limit, replace=False)
+    candidates = np.sort(candidates)
+    return np.asarray(store.features[candidates]), np.array(store.classes, dtype=object)[labels[candidates]]
+
+
+def load_online_model(path, known_classes):
+    """The saved online model if it knows signs the main classifier was not trained on, else None.
+
+    Signs added with "Add Sign (Quick)" only exist in the online model until the next full
+    training, so the live path uses it exactly while that is the case.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        model = joblib.load(path)
+    except Exception as e:
+        print(f"⚠️ Error loading online model: {e}")
+        return None
+    if not set(map(str, model.classes_)) - set(map(str, known_classes)):
+        return None
+    return model
+
+
+def save_model(model, path):
+    """Write the model next to the old one, then swap it in (readers never see a partial pickle)."""
+    tmp_path = f"{path}.tmp"
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, path)
+
+
+# ✅ **Background Consolidation**
+class Consolidator:
+    """Runs at most one full consolidation at a time on a background thread."""
+
+    def __init__(self, model_path):
+        self.model_path = model_path
+        self.thread = None
+        self.cancel = threading.Event()
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def maybe_start(self, model, store, on_done=None, force=False):
+        """Start consolidating when enough incremental additions have piled up (or when forced)."""
+        additions = model.additions_since_consolidation if model is not None else 0
+        if self.running or not (force or additions >= CONSOLIDATE_AFTER):
+            return False
+        self.cancel.clear()
+        self.thread = threading.Thread(target=self._run, args=(store.feature_dim, store, on_done), daemon=True)
+        self.thread.start()
+        return True
+
+    def _run(self, feature_dim, store, on_done):
+        started = time.perf_counter()
+        fresh = OnlineSignModel(feature_dim)
+        if not fresh.consolidate(store, cancel=self.cancel):
+            print("⚠️ Consolidation cancelled.")
+            return
+        save_model(fresh, self.model_path)
+        print(f"✅ Consolidated {len(fresh.models)} signs from {len(store)} rows in {time.perf_counter() - started:.1f}s")
+        if on_done:
+            on_done(fresh)
@@ -1,6 +1,13 @@
+import startup_profile
+startup_profile.install_from_env()  # ✅ Must run before the heavy imports below
+
 import json
 import os
+import importlib
+import threading
 from kivy.app import App
+from kivy.clock import Clock
+from kivy.properties import AliasProperty
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.textinput import TextInput
@@ -11,10 +18,6 @@ from kivy.uix.popup import Popup
 from kivy.uix.image import Image
 from kivy.uix.tabbedpanel import TabbedPanel, TabbedPanelItem
 from kivymd.app import MDApp
-from Second_page import SecondPageScreen
-from Display import DisplayScreen
-from emergency import EmergencyScreen
-from training import LearningScreen
 from kivy.core.window import Window
 
 # Constants
@@ -169,16 +172,81 @@ class AuthScreen(Screen):
         popup = Popup(title=title, content=Label(text=message, font_size=18), size_hint=(0.8, 0.4))
         popup.open()
 
+class LazyScreenManager(ScreenManager):
+    """ScreenManager whose screens are registered as (module, class) factories.
+
+    A screen's module is only imported, and the screen only constructed, the first time
+    it is navigated to (or looked up), so heavy dependencies such as MediaPipe, sklearn
+    or matplotlib stay out of the app's startup path.
+    """
+
+    def __init__(self, **kwargs):
+        self.factories = {}
+        super().__init__(**kwargs)
+
+    def register(self, name, module_name, class_name):
+        """Register a screen to be built on first use."""
+        self.factories[name] = (module_name, class_name)
+
+    def build_screen(self, name):
+        """Import the screen's module and construct it (main thread only)."""
+        module_name, class_name = self.factories.pop(name)
+        with startup_profile.span(f"screen:{name}", "screen"):
+            screen_class = getattr(importlib.import_module(module_name), class_name)
+            self.add_widget(screen_class(name=name))
+
+    def _get_screen_names(self):
+        return [screen.name for screen in self.screens] + list(self.factories)
+
+    screen_names = AliasProperty(_get_screen_names, bind=("screens",))
+
+    def has_screen(self, name):
+        return name in self.factories or super().has_screen(name)
+
+    def get_screen(self, name):
+        if name in self.factories:
+            self.build_screen(name)
+        return super().get_screen(name)
+
+    def prefetch(self, build=()):
+        """Import every registered module in the background, then build `build` screens on the UI thread."""
+        modules = {module_name for module_name, _ in self.factories.values()}
+
+        def import_modules():
+            for module_name in modules:
+                try:
+                    importlib.import_module(module_name)
+                except Exception as e:
+                    print(f"⚠️ Prefetch of '{module_name}' failed: {e}")
+            for name in build:
+                Clock.schedule_once(lambda dt, name=name: name in self.factories and self.build_screen(name))
+            # Runs after the builds above; adds the prefetch spans to the startup report
+            Clock.schedule_once(lambda dt: startup_profile.flush("prefetch_done"))
+
+        threading.Thread(target=import_modules, name="screen-prefetch", daemon=True).start()
+
+
 class SignConnectApp(MDApp):  
     def build(self):
-        sm = ScreenManager()
-        sm.add_widget(AuthScreen(name="auth"))
-        sm.add_widget(SecondPageScreen(name="second"))
-        sm.add_widget(DisplayScreen(name="conversion_screen"))
-        sm.add_widget(EmergencyScreen(name="emergency_screen"))
-        sm.add_widget(LearningScreen(name="learning_screen"))
+        sm = LazyScreenManager()
+        with startup_profile.span("screen:auth", "screen"):
+            sm.add_widget(AuthScreen(name="auth"))
+        sm.register("second", "Second_page", "SecondPageScreen")
+        sm.register("conversion_screen", "Display", "DisplayScreen")
+        sm.register("emergency_screen", "emergency", "EmergencyScreen")
+        sm.register("learning_screen", "training", "LearningScreen")
         return sm
 
+    def on_start(self):
+        Window.bind(on_flip=self.on_first_frame)
+        # Once the login screen is up, warm the other screens' imports in the background
+        Clock.schedule_once(lambda dt: self.root.prefetch(build=("second",)), 0.5)
+
+    def on_first_frame(self, *args):
+        """Close the startup timeline once the login UI has actually been drawn."""
+        Window.unbind(on_flip=self.on_first_frame)
+        startup_profile.first_frame_rendered()
+
 
 if __name__ == "__main__":
     SignConnectApp().run()
@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import shutil
+import argparse
+import threading
+import numpy as np
+from compiled_model import CompiledPredictor
+import startup_profile
+
+# ✅ **Artifact Layout**
+# <artifact>/meta.json         – format version, class names, feature dim, kernel, preprocessing
+# <artifact>/<array>.npy       – float32 arrays of the compiled predictor (memory-mappable)
+FORMAT_VERSION = 1
+ARRAY_FIELDS = ("weights", "bias", "pair_index", "support_vectors", "sv_sq_norms",
+                "preprocess_weights", "preprocess_bias")
+
+
+def export_artifact(artifact_path, model, scaler=None, pca=None):
+    """Compile the sklearn pipeline and write it as a versioned directory of .npy arrays."""
+    predictor = CompiledPredictor.from_sklearn(model, scaler, pca)
+    agreement, max_error = predictor.verify(model, scaler, pca)
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "kernel": predictor.kernel,
+        "gamma": float(predictor.gamma) if predictor.gamma is not None else None,
+        "classes": [str(c) for c in predictor.classes_],
+        "feature_dim": int(predictor.n_features_in_),
+        "preprocessing": ["pca", "scaler"] if pca is not None else ["scaler"],
+        "parity": {"agreement": agreement, "max_abs_error": max_error},
+        "arrays": [],
+    }
+
+    tmp_path = f"{artifact_path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for field in ARRAY_FIELDS:
+        array = getattr(predictor, field)
+        if array is None:
+            continue
+        np.save(os.path.join(tmp_path, f"{field}.npy"), np.ascontiguousarray(array))
+        meta["arrays"].append(field)
+
+    with open(os.path.join(tmp_path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    # Directories cannot be replaced in one atomic step, so move the old version aside
+    # first: a reader sees the old artifact, briefly no artifact (and falls back to the
+    # pickles), or the new one, but never a half-written directory.
+    old_path = f"{artifact_path}.old"
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(artifact_path):
+        os.replace(artifact_path, old_path)
+    try:
+        os.replace(tmp_path, artifact_path)
+    except OSError:
+        if os.path.exists(old_path):
+            os.replace(old_path, artifact_path)  # Keep serving the previous version
+        raise
+    shutil.rmtree(old_path, ignore_errors=True)
+    return meta
+
+
+def read_meta(artifact_path):
+    """Read and validate the metadata header of an artifact."""
+    with open(os.path.join(artifact_path, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported model artifact version: {meta.get('format_version')}")
+    return meta
+
+
+def load_artifact(artifact_path, mmap=True):
+    """Load an artifact as a CompiledPredictor; arrays are memory-mapped read-only by default.
+
+    Memory-mapped arrays are backed by the page cache, so every process that loads the
+    same artifact shares one physical copy of the weights.
+    """
+    meta = read_meta(artifact_path)
+    arrays = {
+        field: np.load(os.path.join(artifact_path, f"{field}.npy"), mmap_mode="r" if mmap else None)
+        for field in meta["arrays"]
+    }
+    gamma = np.float32(meta["gamma"]) if meta.get("gamma") is not None else None
+    return CompiledPredictor(
+        np.array(meta["classes"]),
+        meta["kernel"],
+        arrays["weights"],
+        arrays["bias"],
+        arrays.get("pair_index"),  # None for logistic models
+        meta["feature_dim"],
+        gamma=gamma,
+        support_vectors=arrays.get("support_vectors"),
+        sv_sq_norms=arrays.get("sv_sq_norms"),
+        preprocess_weights=arrays.get("preprocess_weights"),
+        preprocess_bias=arrays.get("preprocess_bias"),
+    )
+
+
+# ✅ **Pickled Pipeline Metadata**
+# <Models/SVM>/pipeline.json  – preprocessing the pickled model was trained behind, in the order applied
+def write_pipeline(pipeline_path, preprocessing):
+    """Record which preprocessing steps ("pca", "scaler") belong to the pickled model."""
+    tmp_path = f"{pipeline_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"preprocessing": list(preprocessing)}, f, indent=2)
+    os.replace(tmp_path, pipeline_path)
+
+
+def pipeline_uses_pca(pipeline_path):
+    """True only if training recorded PCA as part of the pickled pipeline.
+
+    A pca.pkl on disk is not enough: a scaler fitted on raw landmarks gives the SVM garbage
+    once PCA has rotated its input. Without metadata the pickles are scaler → model.
+    """
+    try:
+        with open(pipeline_path, "r", encoding="utf-8") as f:
+            return "pca" in json.load(f).get("preprocessing", [])
+    except (OSError, ValueError, AttributeError):
+        return False
+
+
+class LazyPredictor:
+    """Defers loading an artifact until the first prediction (or attribute access)."""
+
+    def __init__(self, artifact_path, mmap=True):
+        self.artifact_path = artifact_path
+        self.mmap = mmap
+        self._predictor = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._predictor is not None
+
+    def get(self):
+        """Load on first use and return the underlying CompiledPredictor."""
+        if self._predictor is None:
+            with self._lock:
+                if self._predictor is None:
+                    with startup_profile.span("model:artifact", "model"):
+                        self._predictor = load_artifact(self.artifact_path, self.mmap)
+                    print(f"✅ Model artifact loaded from {self.artifact_path}")
+                    startup_profile.flush("model_loaded")
+        return self._predictor
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+# ✅ **Command Line Entry Point**
+if __name__ == "__main__":
+    import joblib
+    from conversion import MODEL_PATH, SCALER_PATH, PCA_PATH, PIPELINE_PATH, ARTIFACT_PATH
+
+    parser = argparse.ArgumentParser(description="Export the trained SVM pipeline as a compact model artifact.")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--scaler", default=SCALER_PATH)
+    parser.add_argument("--pca", default=None,
+                        help="PCA the model was trained behind (default: pca.pkl if training's pipeline.json lists it)")
+    parser.add_argument("--output", default=ARTIFACT_PATH)
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    scaler = joblib.load(args.scaler)
+    if args.pca is None:
+        args.pca = PCA_PATH if pipeline_uses_pca(PIPELINE_PATH) else None
+    pca = joblib.load(args.pca) if args.pca else None
+
+    meta = export_artifact(args.output, model, scaler, pca)
+    size = sum(os.path.getsize(os.path.join(args.output, f)) for f in os.listdir(args.output))
+    print(f"✅ Model artifact written to: {args.output} ({size / 1024:.0f} KB, {len(meta['classes'])} classes)")
+    print(f"   Parity vs sklearn: {meta['parity']['agreement']:.1%} agreement, max error {meta['parity']['max_abs_error']:.2e}")
@@ -0,0 +1,253 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import joblib
+import numpy as np
+from feature_store import FeatureStore
+
+# ✅ **Set Paths**
+BASE_PATH = r"C:\Users\Kingshuk Maji\Documents\Sign_Connect\Sign Connect"
+STORE_PATH = os.path.join(BASE_PATH, "Models", "SVM", "landmark_store")  # Written by training.py
+FOLD_CACHE_PATH = os.path.join(BASE_PATH, "Models", "SVM", "fold_cache")
+SELECTION_PATH = os.path.join(BASE_PATH, "Models", "SVM", "model_selection.json")  # Read by training.py
+FOLD_VERSION = 1  # Bump when the per-fold preprocessing changes, so cached folds are rebuilt
+LATENCY_ROWS = 300
+
+
+# ✅ **Candidate Models**
+def candidate_grid():
+    """(name, unfitted estimator) pairs: linear SVM C grid, RBF SVM, logistic regression and kNN.
+
+    kNN is reported for comparison only: the app serves compiled predictors, so `pick_model`
+    only picks candidates `compiled_model.can_compile` supports.
+    """
+    from sklearn.svm import SVC
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.neighbors import KNeighborsClassifier
+
+    candidates = [(f"svm-linear C={C}", SVC(kernel="linear", C=C)) for C in (0.1, 1, 10, 100)]
+    candidates += [(f"svm-rbf C={C}", SVC(kernel="rbf", C=C, gamma="scale")) for C in (1, 10, 100)]
+    candidates += [(f"logistic C={C}", LogisticRegression(C=C, max_iter=2000)) for C in (1, 10)]
+    candidates += [(f"knn k={k}", KNeighborsClassifier(n_neighbors=k)) for k in (3, 5, 9)]
+    return candidates
+
+
+# ✅ **Cached Cross-Validation Folds**
+# <cache>/<key>/fold<i>.npz        – preprocessed X_train, y_train, X_val, y_val of fold i
+# <cache>/<key>/preprocess<i>.pkl  – the (pca, scaler) fitted on fold i's training rows
+def fold_cache_key(store, folds, seed):
+    """Changes whenever the store's rows, the fold split or the preprocessing code change."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([FOLD_VERSION, folds, seed, store.classes, len(store)]).encode("utf-8"))
+    digest.update(np.ascontiguousarray(store.features).tobytes())
+    digest.update(np.ascontiguousarray(store.labels).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def prepare_folds(store, cache_path, folds=5, seed=42):
+    """Split the store into stratified folds, fit PCA → scaler per fold and cache the results.
+
+    Every candidate of a search reuses the same preprocessed folds, and a repeated search
+    over an unchanged store skips this step entirely; folds of older keys are deleted.
+    Returns the fold file paths.
+    """
+    from sklearn.decomposition import PCA
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.model_selection import StratifiedKFold
+
+    key = fold_cache_key(store, folds, seed)
+    fold_dir = os.path.join(cache_path, key)
+    paths = [os.path.join(fold_dir, f"fold{i}.npz") for i in range(folds)]
+    prune_fold_cache(cache_path, keep=key)
+    preprocess_paths = [os.path.join(fold_dir, f"preprocess{i}.pkl") for i in range(folds)]
+    if all(os.path.exists(path) for path in paths + preprocess_paths):
+        print(f"✅ Reusing {folds} cached folds from {fold_dir}")
+        return paths
+
+    X = np.asarray(store.features, dtype=np.float32)
+    y = np.array(store.classes, dtype=object)[np.asarray(store.labels)].astype(str)
+    os.makedirs(fold_dir, exist_ok=True)
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed)
+    for i, (train_idx, val_idx) in enumerate(splitter.split(X, y)):
+        pca = PCA(n_components=X.shape[1]).fit(X[train_idx])
+        scaler = StandardScaler().fit(pca.transform(X[train_idx]))
+        transform = lambda rows: scaler.transform(pca.transform(rows)).astype(np.float32)
+
+        # The preprocessing goes first, so an existing npz always has its pkl next to it
+        joblib.dump((pca, scaler), preprocess_paths[i])
+        tmp_path = f"{paths[i]}.tmp.npz"
+        np.savez(tmp_path, X_train=transform(X[train_idx]), y_train=y[train_idx],
+                 X_val=transform(X[val_idx]), y_val=y[val_idx], X_val_raw=X[val_idx])
+        os.replace(tmp_path, paths[i])
+    print(f"✅ Prepared {folds} folds of {len(X)} rows in {fold_dir}")
+    return paths
+
+
+def prune_fold_cache(cache_path, keep):
+    """Delete the fold directories of every other cache key (older stores or fold settings)."""
+    if not os.path.isdir(cache_path):
+        return
+    for name in os.listdir(cache_path):
+        if name != keep and os.path.isdir(os.path.join(cache_path, name)):
+            shutil.rmtree(os.path.join(cache_path, name), ignore_errors=True)
+
+
+# ✅ **Worker Function (runs in a separate process)**
+def evaluate_fold(name, estimator, fold_path, keep_model=False):
+    """Fit one candidate on one cached fold; returns (name, fold path, accuracy, fit seconds, model or None)."""
+    from sklearn.base import clone
+
+    with np.load(fold_path, allow_pickle=False) as fold:
+        X_train, y_train, X_val, y_val = fold["X_train"], fold["y_train"], fold["X_val"], fold["y_val"]
+    model = clone(estimator)
+    started = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
+    accuracy = float(np.mean(model.predict(X_val) == y_val))
+    return name, fold_path, accuracy, fit_seconds, model if keep_model else None
+
+
+# ✅ **Inference Latency** (measured in this process, after the pool has finished)
+def measure_latency(model, pca, scaler, raw_rows):
+    """Per-sample latency of classifying one raw landmark row, the way the live path does.
+
+    `sklearn_us` is the PCA → scaler → predict path; `compiled_us` is the compiled
+    predictor the app serves (None for models it cannot compile).
+    """
+    from benchmark import time_calls
+    from compiled_model import compile_predictor, can_compile
+
+    rows = [row.reshape(1, -1) for row in raw_rows]
+    sklearn = time_calls(lambda row: model.predict(scaler.transform(pca.transform(row))), rows)
+    latency = {"sklearn_us": round(sklearn["p50_ms"] * 1000, 1), "compiled_us": None}
+
+    if can_compile(model):
+        predictor = compile_predictor(model, scaler, pca)
+        if predictor is not None:
+            compiled = time_calls(predictor.predict, rows)
+            latency["compiled_us"] = round(compiled["p50_ms"] * 1000, 1)
+    return latency
+
+
+# ✅ **Parallel Search**
+def run_search(store, candidates=None, folds=5, workers=None, cache_path=FOLD_CACHE_PATH, seed=42):
+    """Evaluate every candidate on every fold in worker processes; returns one result row per candidate."""
+    candidates = candidates or candidate_grid()
+    fold_paths = prepare_folds(store, cache_path, folds, seed)
+    workers = workers or os.cpu_count() or 1
+
+    started = time.perf_counter()
+    scores = {name: [] for name, _ in candidates}
+    fit_times = {name: [] for name, _ in candidates}
+    fold0_models = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(evaluate_fold, name, estimator, path, keep_model=(i == 0))
+            for name, estimator in candidates for i, path in enumerate(fold_paths)
+        ]
+        for future in futures:
+            name, _, accuracy, fit_seconds, model = future.result()
+            scores[name].append(accuracy)
+            fit_times[name].append(fit_seconds)
+            if model is not None:
+                fold0_models[name] = model
+    print(f"✅ {len(futures)} fits ({len(candidates)} candidates × {folds} folds) "
+          f"in {time.perf_counter() - started:.1f}s on {workers} workers")
+
+    # Latency on a quiet CPU: every candidate's fold-0 model on fold 0's raw validation rows
+    pca, scaler = joblib.load(os.path.join(os.path.dirname(fold_paths[0]), "preprocess0.pkl"))
+    with np.load(fold_paths[0], allow_pickle=False) as fold:
+        raw_rows = fold["X_val_raw"][:LATENCY_ROWS]
+
+    results = []
+    for name, _ in candidates:
+        results.append({
+            "name": name,
+            "accuracy": round(float(np.mean(scores[name])), 4),
+            "accuracy_std": round(float(np.std(scores[name])), 4),
+            "fit_seconds": round(float(np.mean(fit_times[name])), 3),
+            **measure_latency(fold0_models[name], pca, scaler, raw_rows),
+        })
+    return results
+
+
+def effective_latency(result):
+    """The latency the app would see: compiled when the model compiles, sklearn otherwise."""
+    return result["compiled_us"] if result["compiled_us"] is not None else result["sklearn_us"]
+
+
+def pick_model(results, min_accuracy):
+    """Fastest compiled candidate that meets the accuracy bar, or the most accurate compiled one if none does.
+
+    Only compiled candidates are eligible: the model artifact, the recognition server and
+    the batch/multi-stream workers all serve compiled predictors.
+    """
+    compiled = [r for r in results if r["compiled_us"] is not None]
+    if not compiled:
+        raise ValueError("No candidate could be compiled.")
+    eligible = [r for r in compiled if r["accuracy"] >= min_accuracy]
+    if eligible:
+        return min(eligible, key=effective_latency)
+    return max(compiled, key=lambda r: r["accuracy"])
+
+
+def selected_estimator(selection_path=SELECTION_PATH):
+    """Unfitted estimator of the last search's pick, or None if no (compilable) pick has been saved."""
+    from compiled_model import can_compile
+
+    try:
+        with open(selection_path, "r", encoding="utf-8") as f:
+            pick = json.load(f)["pick"]
+    except (OSError, ValueError, KeyError):
+        return None
+    estimator = dict(candidate_grid()).get(pick)
+    return estimator if estimator is not None and can_compile(estimator) else None
+
+
+def print_results(results, chosen):
+    print(f"   {'candidate':<22} {'accuracy':>14} {'fit s':>8} {'sklearn µs':>11} {'compiled µs':>12}")
+    for r in sorted(results, key=effective_latency):
+        compiled = f"{r['compiled_us']:.1f}" if r["compiled_us"] is not None else "-"
+        marker = "  ← pick" if r is chosen else ""
+        print(f"   {r['name']:<22} {r['accuracy'] * 100:7.2f}% ±{r['accuracy_std'] * 100:4.1f} "
+              f"{r['fit_seconds']:8.3f} {r['sklearn_us']:11.1f} {compiled:>12}{marker}")
+
+
+# ✅ **Command Line Entry Point**
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cross-validated model search over the landmark feature store.")
+    parser.add_argument("--store", default=STORE_PATH)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--min-accuracy", type=float, default=0.95, help="Accuracy bar for picking the fastest model")
+    parser.add_argument("--cache", default=FOLD_CACHE_PATH)
+    parser.add_argument("--output", default=SELECTION_PATH, help="Results JSON; its pick is what training.py trains")
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.store, "meta.json")):
+        print(f"❌ ERROR: No feature store at {args.store}; run training first.")
+        raise SystemExit(1)
+    store = FeatureStore(args.store)
+
+    results = run_search(store, folds=args.folds, workers=args.workers, cache_path=args.cache)
+    try:
+        chosen = pick_model(results, args.min_accuracy)
+    except ValueError as e:
+        print(f"❌ ERROR: {e}")
+        raise SystemExit(1)
+    print_results(results, chosen)
+    if chosen["accuracy"] >= args.min_accuracy:
+        print(f"🔮 Fastest model with ≥ {args.min_accuracy:.0%} accuracy: {chosen['name']}")
+    else:
+        print(f"⚠️ No compiled candidate reaches {args.min_accuracy:.0%}; most accurate: {chosen['name']}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        report = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "folds": args.folds,
+                  "min_accuracy": args.min_accuracy, "pick": chosen["name"], "results": results}
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
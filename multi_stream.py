@@ -0,0 +1,306 @@
+import time
+import queue
+import argparse
+import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from pipeline import LatestFrameBuffer
+from frame_source import open_source
+from sign_events import SignEventEngine
+
+
+# ✅ **Classifier Loading** (same in the parent's check and in every worker)
+def load_predictor(model_paths):
+    """Predictor for `model_paths`; raises RuntimeError if the model cannot be compiled.
+
+    `model_paths` is either a model artifact directory (memory-mapped, so all workers
+    share one copy of the weights) or a (model, scaler, pca) tuple of pickle paths.
+    """
+    if isinstance(model_paths, str):
+        from model_artifact import load_artifact
+        return load_artifact(model_paths)
+
+    import joblib
+    from compiled_model import compile_predictor
+
+    model_path, scaler_path, pca_path = model_paths
+    model = joblib.load(model_path)
+    scaler = joblib.load(scaler_path)
+    pca = joblib.load(pca_path) if pca_path else None
+    predictor = compile_predictor(model, scaler, pca)
+    if predictor is None:
+        raise RuntimeError("Model could not be compiled for multi-stream classification.")
+    return predictor
+
+
+# ✅ **Worker Process: own MediaPipe trackers + compiled classifier**
+def recognition_worker(model_paths, tasks, results):
+    """Classify frames for the streams pinned to this worker until a None task arrives."""
+    from conversion import HandTracker
+
+    predictor = load_predictor(model_paths)
+    trackers = {}
+    segments = {}
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        stream_id, seq, shm_name, shape, captured_at = task
+
+        # Frames arrive through a per-stream shared-memory slot, not through the pipe
+        if stream_id not in segments or segments[stream_id].name != shm_name:
+            if stream_id in segments:
+                segments[stream_id].close()  # The parent replaced the slot with a larger one
+            segments[stream_id] = shared_memory.SharedMemory(name=shm_name)
+        frame = np.ndarray(shape, dtype=np.uint8, buffer=segments[stream_id].buf)
+
+        tracker = trackers.setdefault(stream_id, HandTracker())
+        feature = tracker.detect(frame)
+        if np.any(feature):
+            labels, scores = predictor.predict_with_scores(feature)
+            sign, score = str(labels[0]), float(scores[0])
+        else:
+            sign, score = "None", 1.0
+        results.put((stream_id, seq, sign, score, captured_at))
+
+    for tracker in trackers.values():
+        tracker.close()
+    for segment in segments.values():
+        segment.close()
+
+
+class MultiStreamEngine:
+    """Runs several camera/video streams through a pool of recognition processes.
+
+    Every stream has a capture thread with a latest-frame-wins buffer. Streams are pinned
+    to workers (so video-mode tracking keeps its state), at most one frame per stream is
+    in flight, and the scheduler visits streams round-robin so a busy stream cannot starve
+    the others. `on_result(stream_id, sign, score, event)` is called for every classified
+    frame from the collector thread; `event` is a SignEvent when the stable sign changed.
+
+    A worker that dies, or holds a frame longer than `task_timeout` seconds, is restarted
+    and its streams' frames are rescheduled; after `max_restarts` its streams are marked
+    failed instead.
+    """
+
+    def __init__(self, sources, model_paths, on_result=None, workers=None, task_timeout=30.0, max_restarts=3):
+        self.sources = list(sources)
+        self.model_paths = model_paths
+        self.on_result = on_result
+        self.n_workers = max(1, min(workers or mp.cpu_count(), len(self.sources)))
+        self.task_timeout = task_timeout
+        self.max_restarts = max_restarts
+
+        self.buffers = [LatestFrameBuffer() for _ in self.sources]
+        self.events = [SignEventEngine() for _ in self.sources]
+        self.in_flight = [None] * len(self.sources)  # seq of the frame a stream's worker is classifying
+        self.sent_at = [0.0] * len(self.sources)
+        self.failed = [False] * len(self.sources)
+        self.last_seq = [0] * len(self.sources)
+        self.segments = [None] * len(self.sources)
+        self.stats = [{"captured": 0, "classified": 0, "latency_sum": 0.0} for _ in self.sources]
+
+        self._context = mp.get_context("spawn")
+        self.task_queues = [self._context.Queue() for _ in range(self.n_workers)]
+        self.result_queue = self._context.Queue()
+        self.processes = [self._new_worker(i) for i in range(self.n_workers)]
+        self.restarts = [0] * self.n_workers
+
+        self._running = threading.Event()
+        self._wake = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """Start worker processes, capture threads, the scheduler and the result collector.
+
+        The model is loaded here first, so a model that cannot be compiled fails in the
+        caller instead of silently killing every worker.
+        """
+        load_predictor(self.model_paths)
+        self._running.set()
+        for process in self.processes:
+            process.start()
+        for stream_id, source in enumerate(self.sources):
+            self._threads.append(threading.Thread(target=self._capture_loop, args=(stream_id, source), daemon=True))
+        self._threads.append(threading.Thread(target=self._schedule_loop, daemon=True))
+        self._threads.append(threading.Thread(target=self._collect_loop, daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def _new_worker(self, worker):
+        return self._context.Process(
+            target=recognition_worker, args=(self.model_paths, self.task_queues[worker], self.result_queue), daemon=True
+        )
+
+    def stop(self):
+        """Stop all threads and worker processes and free the shared frame slots."""
+        self._running.clear()
+        self._wake.set()
+        for buffer in self.buffers:
+            buffer.close()
+        for thread in self._threads:
+            thread.join(1.0)
+        for tasks in self.task_queues:
+            tasks.put(None)
+        for process in self.processes:
+            process.join(2.0)
+        for segment in self.segments:
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+
+    def _capture_loop(self, stream_id, source):
+        """Read one stream as fast as it delivers frames (video files are paced like a camera)."""
+        capture = open_source(source)
+        if not capture.isOpened():
+            print(f"❌ ERROR: Stream {stream_id} ({source}) not accessible!")
+            return
+
+        while self._running.is_set():
+            ret, frame = capture.read()
+            if not ret:
+                print(f"⚠️ Stream {stream_id} ended.")
+                break
+            self.buffers[stream_id].put((time.monotonic(), frame))
+            self.stats[stream_id]["captured"] += 1
+            self._wake.set()
+        capture.release()
+
+    def _schedule_loop(self):
+        """Round-robin over streams, sending each idle stream's freshest frame to its worker."""
+        next_stream = 0
+        while self._running.is_set():
+            self._wake.wait(0.05)
+            self._wake.clear()
+            self._check_workers()
+
+            for offset in range(len(self.sources)):
+                stream_id = (next_stream + offset) % len(self.sources)
+                if self.failed[stream_id] or self.in_flight[stream_id] is not None:
+                    continue
+                seq, item = self.buffers[stream_id].peek(self.last_seq[stream_id])
+                if item is None:
+                    continue
+
+                captured_at, frame = item
+                self.last_seq[stream_id] = seq
+                self._send(stream_id, seq, frame, captured_at)
+            next_stream = (next_stream + 1) % len(self.sources)
+
+    def _send(self, stream_id, seq, frame, captured_at):
+        """Copy the frame into the stream's shared-memory slot and queue it for its worker."""
+        segment = self.segments[stream_id]
+        if segment is None or segment.size < frame.nbytes:
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+            segment = shared_memory.SharedMemory(create=True, size=frame.nbytes)
+            self.segments[stream_id] = segment
+
+        np.ndarray(frame.shape, dtype=np.uint8, buffer=segment.buf)[:] = frame
+        self.in_flight[stream_id] = seq
+        self.sent_at[stream_id] = time.monotonic()
+        worker = stream_id % self.n_workers
+        self.task_queues[worker].put((stream_id, seq, segment.name, frame.shape, captured_at))
+
+    def _check_workers(self):
+        """Restart a worker that died or sat on a frame longer than `task_timeout`.
+
+        Its streams' in-flight frames are dropped, so the scheduler sends them fresh ones.
+        """
+        now = time.monotonic()
+        for worker, process in enumerate(self.processes):
+            streams = [s for s in range(worker, len(self.sources), self.n_workers) if not self.failed[s]]
+            if not streams:
+                continue
+            hung = any(self.in_flight[s] is not None and now - self.sent_at[s] > self.task_timeout for s in streams)
+            if process.is_alive() and not hung:
+                continue
+
+            reason = "stopped responding" if process.is_alive() else f"exited with code {process.exitcode}"
+            process.terminate()
+            process.join(1.0)
+            for stream_id in streams:
+                self.in_flight[stream_id] = None
+
+            if self.restarts[worker] >= self.max_restarts:
+                print(f"❌ ERROR: Recognition worker {worker} {reason}; giving up on streams {streams}.")
+                for stream_id in streams:
+                    self.failed[stream_id] = True
+                continue
+            self.restarts[worker] += 1
+            print(f"⚠️ Recognition worker {worker} {reason}; restarting it "
+                  f"({self.restarts[worker]}/{self.max_restarts}).")
+            self.task_queues[worker].cancel_join_thread()  # Its pending frames are stale; don't flush them
+            self.task_queues[worker].close()
+            self.task_queues[worker] = self._context.Queue()
+            self.processes[worker] = self._new_worker(worker)
+            self.processes[worker].start()
+
+    def _collect_loop(self):
+        """Receive results, debounce them per stream and hand them to the callback."""
+        while self._running.is_set():
+            try:
+                stream_id, seq, sign, score, captured_at = self.result_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            if self.in_flight[stream_id] == seq:  # Not a late result from a restarted worker
+                self.in_flight[stream_id] = None
+            self._wake.set()
+
+            stats = self.stats[stream_id]
+            stats["classified"] += 1
+            stats["latency_sum"] += time.monotonic() - captured_at
+
+            event = self.events[stream_id].update(sign, score)
+            if self.on_result:
+                self.on_result(stream_id, sign, score, event)
+
+    def summary(self):
+        """Per-stream captured/classified counts, mean capture-to-result latency and failure state."""
+        return [
+            {
+                "stream": stream_id,
+                "captured": stats["captured"],
+                "classified": stats["classified"],
+                "latency_ms": round(stats["latency_sum"] / stats["classified"] * 1000, 1) if stats["classified"] else None,
+                "failed": self.failed[stream_id],
+            }
+            for stream_id, stats in enumerate(self.stats)
+        ]
+
+
+# ✅ **Command Line Entry Point**
+if __name__ == "__main__":
+    import os
+    from conversion import MODEL_PATH, SCALER_PATH, PCA_PATH, PIPELINE_PATH, ARTIFACT_PATH
+    from model_artifact import pipeline_uses_pca
+
+    parser = argparse.ArgumentParser(description="Run recognition on several cameras/videos at once.")
+    parser.add_argument("sources", nargs="+", help="Camera indices or video files")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    args = parser.parse_args()
+
+    sources = [int(s) if s.isdigit() else s for s in args.sources]
+    pca_path = PCA_PATH if pipeline_uses_pca(PIPELINE_PATH) else None
+    model_paths = ARTIFACT_PATH if os.path.exists(ARTIFACT_PATH) else (MODEL_PATH, SCALER_PATH, pca_path)
+
+    def print_event(stream_id, sign, score, event):
+        if event:
+            print(f"🔮 Stream {stream_id}: {event.sign}")
+
+    engine = MultiStreamEngine(sources, model_paths, print_event, args.workers)
+    try:
+        engine.start()
+    except RuntimeError as e:
+        print(f"❌ ERROR: {e}")
+        raise SystemExit(1)
+    try:
+        time.sleep(args.seconds)
+    finally:
+        engine.stop()
+    for row in engine.summary():
+        print(f"   {row}")
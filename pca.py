@@ -1,45 +1,52 @@
 import os
 import joblib
 import numpy as np
-from sklearn.decomposition import PCA
+from sklearn.decomposition import IncrementalPCA
+from feature_store import FeatureStore
 
 # ✅ **Set Paths**
 FEATURES_PATH = r"C:\Users\Kingshuk Maji\Documents\Sign_Connect\Sign Connect\Features"
-PCA_PATH = r"C:\Users\Kingshuk Maji\Documents\Sign_Connect\Sign Connect\Models\SVM\pca.pkl"
-
-# ✅ **Load Features from `.npy` Files**
-feature_list = []
-for file in os.listdir(FEATURES_PATH):
+STORE_PATH = os.path.join(FEATURES_PATH, "landmark_store")
+# Not pca.pkl: that one belongs to the scaler/SVM training.py fitted with it, and the app loads them together
+PCA_PATH = r"C:\Users\Kingshuk Maji\Documents\Sign_Connect\Sign Connect\Models\SVM\pca_standalone.pkl"
+BATCH_SIZE = 4096
+
+# ✅ **Stream Features from `.npy` Files into the Memory-Mapped Store**
+# (training.py fits PCA together with the scaler and SVM; this refits PCA alone from saved landmark files)
+# Files are opened memory-mapped and copied over in batches, so no file is ever fully loaded
+store = FeatureStore.create(STORE_PATH, 63)
+for file in sorted(os.listdir(FEATURES_PATH)):
     if file.endswith(".npy"):
         file_path = os.path.join(FEATURES_PATH, file)
-        features = np.load(file_path)
+        features = np.load(file_path, mmap_mode="r")
 
         # ✅ **Ensure Features are 2D**
-        if len(features.shape) == 3:  
+        if len(features.shape) == 3:
             features = features.reshape(features.shape[0], -1)  # Convert (N, 21, 3) → (N, 63)
 
-        elif features.shape[1] == 12288:  
-            print(f"⚠️ {file} has image pixel data! Skipping.")  
-            continue  # Skip image-based feature files
-
-        elif features.shape[1] != 63:  
-            print(f"⚠️ {file} has unexpected shape {features.shape}. Skipping.")  
+        elif features.shape[1] != 63:
+            print(f"⚠️ {file} has unexpected shape {features.shape}. Skipping.")
             continue  # Skip files with incorrect feature dimensions
 
-        feature_list.append(features)
+        label_id = len(store.classes)  # One class per feature file
+        for start in range(0, len(features), BATCH_SIZE):
+            store.append(features[start:start + BATCH_SIZE], label_id)
+        store.set_classes(store.classes + [os.path.splitext(file)[0]])
+store.flush()
 
-# ✅ **Stack Features**
-if feature_list:
-    X = np.vstack(feature_list)  # (N, 63)
-    print(f"🔍 Features Shape Before PCA: {X.shape}")
+if len(store) >= 63:
+    print(f"🔍 Features Shape Before PCA: {store.features.shape}")
 else:
-    print("❌ No valid feature files found!")
+    print("❌ Not enough valid features found (PCA needs at least 63 rows)!")
     exit()
 
-# ✅ **Apply PCA (Reduce from 63 → 63 for consistency)**
-pca = PCA(n_components=63)
-X_reduced = pca.fit_transform(X)
-print(f"✅ Features Shape After PCA: {X_reduced.shape}")
+# ✅ **Apply PCA (Reduce from 63 → 63 for consistency)** – fitted batch by batch
+pca = IncrementalPCA(n_components=63)
+n_batches = -(-len(store) // BATCH_SIZE)
+batch_size = -(-len(store) // n_batches)  # Equal batches, so none is smaller than the 63 rows partial_fit needs
+for X, _ in store.iter_batches(batch_size):
+    pca.partial_fit(X)
+print(f"✅ Features Shape After PCA: ({len(store)}, {pca.n_components_})")
 
 # ✅ **Save PCA Model**
 joblib.dump(pca, PCA_PATH)
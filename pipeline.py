@@ -0,0 +1,224 @@
+import threading
+import time
+import cv2
+from stage_metrics import get_stage_metrics, log
+
+
+# ✅ **Single-Slot Buffer Between Stages**
+class LatestFrameBuffer:
+    """Bounded one-slot buffer: a newer item replaces any unread one (latest frame wins)."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._seq = 0
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        """Store the newest item, discarding the previous one if nobody consumed it."""
+        with self._cond:
+            if self._item is not None:
+                self.dropped += 1
+            self._item = item
+            self._seq += 1
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """Block until an item is available and take it out of the buffer; returns None once closed."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._item is not None or self._closed, timeout):
+                return None
+            item, self._item = self._item, None
+            return item
+
+    def peek(self, last_seq=0):
+        """Return (seq, item) for the newest item without consuming it, or (last_seq, None) if nothing new."""
+        with self._cond:
+            if self._seq == last_seq or self._item is None:
+                return last_seq, None
+            return self._seq, self._item
+
+    def close(self):
+        """Wake up any waiting consumer so its stage can exit."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+# ✅ **Idle-Aware Recognition Rate**
+class AdaptiveRate:
+    """Decides when the next frame should be recognised, based on whether hands are around.
+
+    While a hand has been seen within `idle_after` seconds the recogniser runs at full rate
+    (`active_fps`, or as fast as frames arrive when None). After that it drops to a
+    low-rate "watch" mode at `watch_fps`, just enough to notice a hand appearing, and goes
+    straight back to full rate on the first frame that has one. `duty_cycle` is the
+    fraction of wall time spent recognising over the last `window` seconds.
+    """
+
+    ACTIVE = "active"
+    WATCH = "watch"
+
+    def __init__(self, active_fps=None, watch_fps=2.0, idle_after=10.0, window=5.0):
+        self.active_fps = active_fps
+        self.watch_fps = watch_fps
+        self.idle_after = idle_after
+        self.window = window
+
+        now = time.monotonic()
+        self.mode = self.ACTIVE
+        self.last_hand_at = now
+        self.next_due = now
+        self.duty_cycle = 0.0  # Reported after the first window
+        self._busy = 0.0
+        self._window_start = now
+
+    def interval(self):
+        fps = self.active_fps if self.mode == self.ACTIVE else self.watch_fps
+        return 1.0 / fps if fps else 0.0
+
+    def wait_time(self, now=None):
+        """Seconds until the next frame is due (0 if it is due now)."""
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.next_due - now)
+
+    def due(self, now=None):
+        return self.wait_time(now) == 0.0
+
+    def update(self, hand_present, started, now=None):
+        """Record one recognised frame (processing began at `started`) and plan the next one."""
+        now = time.monotonic() if now is None else now
+        if hand_present:
+            self.last_hand_at = now
+            if self.mode != self.ACTIVE:
+                self.mode = self.ACTIVE
+                print("✅ Hand detected: recognition back at full rate.")
+        elif self.mode == self.ACTIVE and now - self.last_hand_at >= self.idle_after:
+            self.mode = self.WATCH
+            print(f"⚠️ No hand for {self.idle_after:.0f}s: recognition in watch mode ({self.watch_fps:g} fps).")
+
+        self.next_due = started + self.interval()
+
+        self._busy += now - started
+        elapsed = now - self._window_start
+        if elapsed >= self.window:
+            self.duty_cycle = min(1.0, self._busy / elapsed)
+            self._busy = 0.0
+            self._window_start = now
+
+    def stats(self):
+        return {"mode": self.mode, "duty_cycle": round(self.duty_cycle, 3)}
+
+
+# ✅ **Capture → Recognition → Render Pipeline**
+class RecognitionPipeline:
+    """Runs capture and recognition on their own threads, connected by latest-frame-wins buffers.
+
+    The render stage stays with the caller: the UI polls `latest_frame()` at display rate
+    and gets the raw camera frame (orientation is handled by the texture), while
+    recognition results are handed to `on_result` through `dispatch` (e.g. Kivy's
+    `mainthread`) so that widgets are only touched from the UI thread. With an
+    `AdaptiveRate`, the recognition stage sleeps between frames while no hand is around
+    (the preview keeps running at camera rate).
+    """
+
+    def __init__(self, video_capture, recognition, on_result=None, flip_code=-1, dispatch=None, metrics=None,
+                 rate=None):
+        self.video_capture = video_capture
+        self.recognition = recognition
+        self.on_result = on_result
+        self.flip_code = flip_code
+        self.dispatch = dispatch or (lambda callback, *args: callback(*args))
+        self.metrics = metrics or get_stage_metrics()
+        self.rate = rate
+
+        self.preview_buffer = LatestFrameBuffer()
+        self.inference_buffer = LatestFrameBuffer()
+        self._running = threading.Event()
+        self._stopped = threading.Event()  # Interrupts the watch-mode sleep
+        self._threads = []
+
+        self.captured_frames = 0
+        self.recognized_frames = 0
+        self._flip_buffer = None  # Reused destination for the recognition-side flip
+
+    def start(self):
+        """Start the capture and recognition stages."""
+        if self._running.is_set():
+            return
+        self._running.set()
+        self._stopped.clear()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="capture-stage", daemon=True),
+            threading.Thread(target=self._recognition_loop, name="recognition-stage", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stop both stages and wait briefly for them to exit."""
+        self._running.clear()
+        self._stopped.set()
+        self.preview_buffer.close()
+        self.inference_buffer.close()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    @property
+    def running(self):
+        return self._running.is_set()
+
+    def latest_frame(self, last_seq=0):
+        """Return (seq, frame) for the newest captured frame, or (last_seq, None) if unchanged."""
+        return self.preview_buffer.peek(last_seq)
+
+    def _capture_loop(self):
+        """Capture stage: read frames at camera rate and publish them to both buffers."""
+        while self._running.is_set():
+            start = self.metrics.now()
+            ret, frame = self.video_capture.read()
+            if not ret:
+                log.error("frame_read_failed", stage="capture")
+                time.sleep(0.05)
+                continue
+
+            self.metrics.record("capture", start)
+            self.metrics.tick("capture")
+            self.captured_frames += 1
+            self.preview_buffer.put(frame)
+            self.inference_buffer.put(frame)
+
+    def _recognition_loop(self):
+        """Recognition stage: always classify the freshest frame, skipping any that went stale."""
+        last_sign = None
+        while self._running.is_set():
+            if self.rate is not None:
+                # Watch mode: sleep until the next frame is due (wakes early on stop)
+                wait = self.rate.wait_time()
+                if wait and self._stopped.wait(wait):
+                    break
+
+            frame = self.inference_buffer.get(timeout=0.5)
+            if frame is None:
+                continue
+            started = time.monotonic()
+
+            if self.flip_code is not None:
+                # Flip into a reused buffer: the preview may still be reading `frame`
+                start = self.metrics.now()
+                if self._flip_buffer is None or self._flip_buffer.shape != frame.shape:
+                    self._flip_buffer = frame.copy()
+                frame = cv2.flip(frame, self.flip_code, dst=self._flip_buffer)
+                self.metrics.record("flip", start)
+
+            _, kannada_sign = self.recognition.process_frame(frame)
+            self.recognized_frames += 1
+            if self.rate is not None:
+                self.rate.update(getattr(self.recognition, "hand_present", True), started)
+
+            # Only wake the UI thread when the (debounced) sign actually changes
+            if self.on_result and self._running.is_set() and kannada_sign != last_sign:
+                last_sign = kannada_sign
+                self.dispatch(self.on_result, kannada_sign)
@@ -0,0 +1,248 @@
+import os
+import json
+import time
+import argparse
+import threading
+import urllib.request
+from concurrent.futures import Future
+import cv2
+import numpy as np
+from sign_events import SignEventEngine
+from stage_metrics import log
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5055
+
+
+# ✅ **Micro-Batching Classifier**
+class MicroBatcher:
+    """Merges landmark rows from concurrent requests into single classifier calls.
+
+    The first request to arrive opens a batch; rows from other requests join it until
+    `max_batch` rows are waiting or `max_wait` seconds have passed, then one
+    `predict_with_scores` call answers everybody.
+    """
+
+    def __init__(self, predictor, max_batch=256, max_wait=0.002):
+        self.predictor = predictor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending = []  # (rows, future)
+        self._pending_rows = 0
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+        self.batches = 0
+        self.rows = 0
+
+    def submit(self, rows):
+        """Queue an (N, 63) array; returns a Future resolving to (labels, scores)."""
+        future = Future()
+        with self._cond:
+            self._pending.append((rows, future))
+            self._pending_rows += len(rows)
+            self._cond.notify()
+        return future
+
+    def classify(self, rows, timeout=5.0):
+        """Blocking helper around submit()."""
+        return self.submit(rows).result(timeout)
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or not self._running)
+                if not self._running:
+                    return
+                deadline = time.monotonic() + self.max_wait
+                while self._pending_rows < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending, self._pending_rows = self._pending, [], 0
+
+            try:
+                labels, scores = self.predictor.predict_with_scores(np.vstack([rows for rows, _ in batch]))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.rows += len(labels)
+            start = 0
+            for rows, future in batch:
+                stop = start + len(rows)
+                future.set_result((labels[start:stop], scores[start:stop]))
+                start = stop
+
+
+# ✅ **HTTP Service**
+def create_app(predictor, max_batch=256, max_wait=0.002):
+    """Flask app exposing /health, /landmarks (63-float rows) and /frames (JPEG images).
+
+    Malformed requests (bad JSON, wrong row width, empty or undecodable uploads) get a
+    400 with an `{"error": ...}` body instead of reaching the classifier.
+    """
+    from flask import Flask, jsonify, request
+    from conversion import detect_hand_landmarks
+
+    app = Flask(__name__)
+    batcher = MicroBatcher(predictor, max_batch, max_wait)
+    detector_lock = threading.Lock()  # The static MediaPipe graph is not thread-safe
+
+    def results_json(labels, scores, found):
+        return [
+            {"sign": str(label) if hit else "None", "score": round(float(score), 4) if hit else 0.0}
+            for label, score, hit in zip(labels, scores, found)
+        ]
+
+    @app.get("/health")
+    def health():
+        return jsonify({
+            "classes": [str(c) for c in predictor.classes_],
+            "feature_dim": int(predictor.n_features_in_),
+            "batches": batcher.batches,
+            "rows": batcher.rows,
+        })
+
+    def bad_request(message):
+        return jsonify({"error": message}), 400
+
+    @app.post("/landmarks")
+    def classify_landmarks():
+        payload = request.get_json(force=True, silent=True)
+        if not isinstance(payload, dict) or not isinstance(payload.get("landmarks"), list):
+            return bad_request('expected a JSON object {"landmarks": [[...], ...]}')
+        try:
+            rows = np.asarray(payload["landmarks"], dtype=np.float32)
+        except (TypeError, ValueError):
+            return bad_request("landmarks must be rows of numbers of equal length")
+        if rows.ndim == 1 and len(rows):
+            rows = rows.reshape(1, -1)  # A single flat row
+        if rows.size == 0:
+            return bad_request("no landmark rows")
+        if rows.ndim != 2 or rows.shape[1] != predictor.n_features_in_:
+            return bad_request(f"each landmark row must have {predictor.n_features_in_} values")
+        if not np.all(np.isfinite(rows)):
+            return bad_request("landmarks must be finite numbers")
+        labels, scores = batcher.classify(rows)
+        return jsonify({"results": results_json(labels, scores, np.any(rows != 0, axis=1))})
+
+    @app.post("/frames")
+    def classify_frames():
+        # Either multipart files named "frames" or a single raw JPEG body
+        blobs = [f.read() for f in request.files.getlist("frames")] or [request.get_data()]
+        if not all(blobs):
+            return bad_request("empty frame upload")
+        rows = np.zeros((len(blobs), 63), dtype=np.float32)
+        for i, blob in enumerate(blobs):
+            frame = cv2.imdecode(np.frombuffer(blob, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if frame is None:
+                return bad_request(f"frame {i} is not a decodable image")
+            with detector_lock:
+                rows[i] = detect_hand_landmarks(frame)[0]
+        labels, scores = batcher.classify(rows)
+        return jsonify({"results": results_json(labels, scores, np.any(rows != 0, axis=1))})
+
+    app.batcher = batcher
+    return app
+
+
+# ✅ **Thin Client**
+class RecognitionClient:
+    """Minimal HTTP client for the recognition server (standard library only)."""
+
+    def __init__(self, url=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout=2.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _post(self, path, data, content_type):
+        req = urllib.request.Request(self.url + path, data=data, headers={"Content-Type": content_type})
+        with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            return json.loads(response.read().decode("utf-8"))["results"]
+
+    def classify_landmarks(self, rows):
+        """Classify a batch of 63-float landmark rows; returns [{"sign", "score"}, ...]."""
+        body = json.dumps({"landmarks": np.asarray(rows, dtype=float).reshape(-1, 63).tolist()}).encode("utf-8")
+        return self._post("/landmarks", body, "application/json")
+
+    def classify_frame(self, frame, quality=80):
+        """JPEG-encode one BGR frame and classify it on the server."""
+        ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            return {"sign": "None", "score": 0.0}
+        return self._post("/frames", jpeg.tobytes(), "image/jpeg")[0]
+
+
+class RemoteRecognition:
+    """Drop-in for RealTimeRecognition.process_frame that delegates to a recognition server.
+
+    MediaPipe still runs locally (video-mode tracking is cheap), only the 63 landmark
+    floats go over the wire, and the client keeps its own debouncer.
+    """
+
+    def __init__(self, url, tracking=True):
+        from conversion import HandTracker
+
+        self.client = RecognitionClient(url)
+        self.tracker = HandTracker() if tracking else None
+        self.events = SignEventEngine()
+        self.last_event = None
+        self.hand_present = False
+
+    def process_frame(self, frame):
+        from conversion import detect_hand_landmarks
+
+        feature = detect_hand_landmarks(frame, self.tracker)
+        self.hand_present = bool(np.any(feature))
+        if not self.hand_present:
+            predicted_sign, score = "None", 1.0
+        else:
+            try:
+                result = self.client.classify_landmarks(feature)[0]
+                predicted_sign, score = result["sign"], result["score"]
+            except Exception as e:
+                log.warning("remote_recognition_failed", url=self.client.url, error=e)
+                return "None", self.events.current
+
+        self.last_event = self.events.update(predicted_sign, score)
+        return predicted_sign, self.events.current
+
+
+# ✅ **Command Line Entry Point**
+if __name__ == "__main__":
+    import joblib
+    from compiled_model import compile_predictor
+    from conversion import MODEL_PATH, SCALER_PATH, PCA_PATH, PIPELINE_PATH, ARTIFACT_PATH
+    from model_artifact import load_artifact, pipeline_uses_pca
+
+    parser = argparse.ArgumentParser(description="Headless recognition service for thin clients.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    if os.path.exists(ARTIFACT_PATH):
+        predictor = load_artifact(ARTIFACT_PATH)
+    else:
+        model = joblib.load(MODEL_PATH)
+        scaler = joblib.load(SCALER_PATH)
+        pca = joblib.load(PCA_PATH) if pipeline_uses_pca(PIPELINE_PATH) else None
+        predictor = compile_predictor(model, scaler, pca)
+    if predictor is None:
+        print("❌ ERROR: Model could not be compiled!")
+        raise SystemExit(1)
+
+    app = create_app(predictor, args.max_batch, args.max_wait_ms / 1000.0)
+    print(f"✅ Recognition server listening on http://{args.host}:{args.port}")
+    app.run(host=args.host, port=args.port, threaded=True)
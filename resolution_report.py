@@ -0,0 +1,98 @@
+import os
+import time
+import argparse
+import cv2
+import numpy as np
+from conversion import HandTracker
+from batch_recognition import list_images
+
+
+def load_frames(source, limit=300):
+    """Read up to `limit` BGR frames from a video file or frame directory."""
+    if os.path.isdir(source):
+        frames = [cv2.imread(path) for path in list_images(source)[:limit]]
+        return [frame for frame in frames if frame is not None]
+
+    capture = cv2.VideoCapture(source)
+    frames = []
+    while len(frames) < limit:
+        ret, frame = capture.read()
+        if not ret:
+            break
+        frames.append(frame)
+    capture.release()
+    return frames
+
+
+def run_tracker(frames, **tracker_options):
+    """Run one tracker over all frames; returns (landmarks (N, 63), latencies in seconds)."""
+    tracker = HandTracker(**tracker_options)
+    landmarks = np.zeros((len(frames), 63))
+    latencies = np.zeros(len(frames))
+    for i, frame in enumerate(frames):
+        started = time.perf_counter()
+        landmarks[i] = tracker.detect(frame)[0]
+        latencies[i] = time.perf_counter() - started
+    tracker.close()
+    return landmarks, latencies
+
+
+# ✅ **Accuracy / Latency at Each Inference Scale**
+def evaluate_scales(frames, widths, crop_padding=None):
+    """Compare each inference width against full-resolution detection.
+
+    Accuracy is reported as agreement on whether a hand was found and as the mean
+    landmark distance (in full-frame normalised units) where both found one.
+    """
+    reference, reference_latency = run_tracker(frames)
+    reference_found = np.any(reference != 0, axis=1)
+
+    report = [{
+        "width": frames[0].shape[1] if frames else None,
+        "crop_padding": None,
+        "detection_agreement": 1.0,
+        "mean_landmark_error": 0.0,
+        "latency_ms_mean": round(float(reference_latency.mean()) * 1000, 2),
+        "latency_ms_p95": round(float(np.percentile(reference_latency, 95)) * 1000, 2),
+    }]
+
+    for width in widths:
+        landmarks, latency = run_tracker(frames, inference_width=width, crop_padding=crop_padding)
+        found = np.any(landmarks != 0, axis=1)
+        both = found & reference_found
+
+        error = None
+        if both.any():
+            diff = (landmarks[both] - reference[both]).reshape(-1, 21, 3)[:, :, :2]
+            error = round(float(np.linalg.norm(diff, axis=2).mean()), 5)
+
+        report.append({
+            "width": width,
+            "crop_padding": crop_padding,
+            "detection_agreement": round(float(np.mean(found == reference_found)), 4),
+            "mean_landmark_error": error,
+            "latency_ms_mean": round(float(latency.mean()) * 1000, 2),
+            "latency_ms_p95": round(float(np.percentile(latency, 95)) * 1000, 2),
+        })
+
+    return report
+
+
+# ✅ **Command Line Entry Point**
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Landmark accuracy/latency at several inference resolutions.")
+    parser.add_argument("source", help="Video file or directory of frame images")
+    parser.add_argument("--widths", type=int, nargs="+", default=[640, 480, 320, 240])
+    parser.add_argument("--crop-padding", type=float, default=None, help="Crop around the previous hand box")
+    parser.add_argument("--limit", type=int, default=300, help="Maximum number of frames to evaluate")
+    args = parser.parse_args()
+
+    frames = load_frames(args.source, args.limit)
+    if not frames:
+        print("❌ ERROR: No frames could be read!")
+        raise SystemExit(1)
+
+    print(f"📊 {len(frames)} frames at {frames[0].shape[1]}x{frames[0].shape[0]}")
+    for row in evaluate_scales(frames, args.widths, args.crop_padding):
+        print(f"   width={row['width']}  crop={row['crop_padding']}  agreement={row['detection_agreement']}  "
+              f"error={row['mean_landmark_error']}  latency={row['latency_ms_mean']} ms (p95 {row['latency_ms_p95']} ms)")
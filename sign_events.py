@@ -0,0 +1,76 @@
+import time
+from collections import Counter, deque, namedtuple
+
+# ✅ **Event Emitted When the Stable Sign Changes**
+SignEvent = namedtuple("SignEvent", ["sign", "previous", "score", "timestamp"])
+
+NO_SIGN = "None"
+
+
+class SignEventEngine:
+    """Sliding-window vote over per-frame predictions that only emits an event on a real change.
+
+    - window: number of recent frames that vote
+    - vote: "majority" (one vote per frame) or "score" (votes weighted by classifier score;
+      scores are clipped to [0, 1], the range of the predictors' confidences and of no-hand frames)
+    - min_share: fraction of the window the leading sign needs before it can take over
+    - hysteresis: how far the challenger's share must exceed the current sign's share
+    - min_hold: seconds a sign stays stable before another one may replace it
+    """
+
+    def __init__(self, window=9, vote="majority", min_share=0.6, hysteresis=0.2, min_hold=0.4):
+        if vote not in ("majority", "score"):
+            raise ValueError(f"Unknown vote mode: {vote}")
+        self.window = deque(maxlen=window)
+        self.vote = vote
+        self.min_share = min_share
+        self.hysteresis = hysteresis
+        self.min_hold = min_hold
+
+        self.current = NO_SIGN
+        self.changed_at = float("-inf")
+        self.frames_seen = 0
+        self.events_emitted = 0
+
+    def reset(self):
+        """Forget the window and return to the no-sign state."""
+        self.window.clear()
+        self.current = NO_SIGN
+        self.changed_at = float("-inf")
+
+    def _tally(self):
+        """Return the vote weight of every sign in the window."""
+        weights = Counter()
+        for sign, score in self.window:
+            weights[sign] += min(max(score, 0.0), 1.0) if self.vote == "score" else 1.0
+        return weights
+
+    def update(self, sign, score=1.0, timestamp=None):
+        """Feed one frame's prediction; returns a SignEvent if the stable sign changed, else None."""
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        sign = str(sign) if sign is not None and str(sign).strip() else NO_SIGN
+
+        self.window.append((sign, score))
+        self.frames_seen += 1
+
+        weights = self._tally()
+        total = sum(weights.values())
+        if total <= 0:
+            return None
+
+        leader, leader_weight = weights.most_common(1)[0]
+        if leader == self.current:
+            return None
+
+        leader_share = leader_weight / total
+        current_share = weights.get(self.current, 0.0) / total
+        if leader_share < self.min_share or leader_share - current_share < self.hysteresis:
+            return None
+        if timestamp - self.changed_at < self.min_hold:
+            return None
+
+        event = SignEvent(leader, self.current, leader_share, timestamp)
+        self.current = leader
+        self.changed_at = timestamp
+        self.events_emitted += 1
+        return event
@@ -0,0 +1,235 @@
+import os
+import json
+import time
+import argparse
+import threading
+import numpy as np
+
+# ✅ **Enable file export with:**  SIGNCONNECT_METRICS=stage_metrics.json python main.py
+ENV_VAR = "SIGNCONNECT_METRICS"
+DEFAULT_WINDOW = 512
+DEFAULT_EXPORT_INTERVAL = 5.0
+
+# Hot-path stages, in pipeline order (anything else recorded is reported after these)
+STAGES = ("capture", "flip", "convert", "mediapipe", "pca", "scale", "predict", "tts_enqueue", "texture_upload")
+
+
+class RollingHistogram:
+    """Fixed-size ring of the most recent samples (milliseconds); percentiles on demand."""
+
+    def __init__(self, size=DEFAULT_WINDOW):
+        self.samples = np.zeros(size, dtype=np.float64)
+        self.count = 0
+
+    def add(self, value):
+        self.samples[self.count % len(self.samples)] = value
+        self.count += 1
+
+    def summary(self):
+        window = self.samples[:min(self.count, len(self.samples))]
+        if not len(window):
+            return None
+        p50, p95, p99 = np.percentile(window, (50, 95, 99))
+        return {
+            "count": self.count,
+            "mean_ms": round(float(window.mean()), 3),
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+        }
+
+
+class RateCounter:
+    """Frames per second over the most recent ticks."""
+
+    def __init__(self, size=64):
+        self.ticks = np.zeros(size, dtype=np.float64)
+        self.count = 0
+
+    def tick(self, now):
+        self.ticks[self.count % len(self.ticks)] = now
+        self.count += 1
+
+    def fps(self):
+        n = min(self.count, len(self.ticks))
+        if n < 2:
+            return 0.0
+        newest = self.ticks[(self.count - 1) % len(self.ticks)]
+        oldest = self.ticks[(self.count - n) % len(self.ticks)]
+        return (n - 1) / (newest - oldest) if newest > oldest else 0.0
+
+
+# ✅ **Per-Stage Latency Monitor**
+class StageMetrics:
+    """Low-overhead stage timer for the recognition hot path.
+
+    Recording is a `perf_counter()` call plus one array store, so it stays on in normal
+    runs; percentiles are only computed when a snapshot is asked for (overlay, export).
+
+        start = metrics.now()
+        ...work...
+        start = metrics.record("mediapipe", start)   # returns the new "now" for the next stage
+        metrics.tick("recognition")                   # counts a frame for the FPS figure
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self.histograms = {}
+        self.rates = {}
+        self.sources = {}
+        self._lock = threading.Lock()
+        self._export_thread = None
+        self._export_stop = threading.Event()
+
+    now = staticmethod(time.perf_counter)
+
+    def record(self, stage, start):
+        """Record the time since `start` under `stage`; returns the end time."""
+        end = time.perf_counter()
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(stage, RollingHistogram(self.window))
+        histogram.add((end - start) * 1000.0)
+        return end
+
+    def tick(self, loop):
+        """Count one completed iteration of `loop` (e.g. "capture", "recognition", "render")."""
+        rate = self.rates.get(loop)
+        if rate is None:
+            with self._lock:
+                rate = self.rates.setdefault(loop, RateCounter())
+        rate.tick(time.perf_counter())
+
+    def add_source(self, name, snapshot_fn):
+        """Include `snapshot_fn()` (a JSON-friendly dict) under `name` in every snapshot."""
+        with self._lock:
+            self.sources[name] = snapshot_fn
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+            self.rates = {}
+
+    def snapshot(self):
+        """Machine-readable view: per-stage percentiles plus FPS per loop."""
+        with self._lock:
+            histograms = dict(self.histograms)
+            rates = dict(self.rates)
+            sources = dict(self.sources)
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        stages = {}
+        for stage in sorted(histograms, key=lambda s: (order.get(s, len(order)), s)):
+            summary = histograms[stage].summary()
+            if summary:
+                stages[stage] = summary
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "fps": {loop: round(rate.fps(), 1) for loop, rate in rates.items()},
+            "stages": stages,
+            **{name: snapshot_fn() for name, snapshot_fn in sources.items()},
+        }
+
+    def overlay_text(self):
+        """Compact multi-line text for the on-screen overlay."""
+        snapshot = self.snapshot()
+        lines = []
+        if snapshot["fps"]:
+            lines.append("  ".join(f"{loop} {fps:.0f} fps" for loop, fps in snapshot["fps"].items()))
+        for stage, summary in snapshot["stages"].items():
+            lines.append(f"{stage:<14} p50 {summary['p50_ms']:6.2f}  p95 {summary['p95_ms']:6.2f}  p99 {summary['p99_ms']:6.2f} ms")
+        return "\n".join(lines)
+
+    # ✅ **Periodic File Export**
+    def export(self, path):
+        """Write the current snapshot as JSON (atomically, so readers never see half a file)."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    def start_export(self, path, interval=DEFAULT_EXPORT_INTERVAL):
+        """Export the snapshot every `interval` seconds from a background thread."""
+        if self._export_thread is not None:
+            return
+
+        def run():
+            while not self._export_stop.wait(interval):
+                try:
+                    self.export(path)
+                except OSError as e:
+                    log.warning("metrics_export_failed", path=path, error=e)
+
+        self._export_stop.clear()
+        self._export_thread = threading.Thread(target=run, name="metrics-export", daemon=True)
+        self._export_thread.start()
+
+    def stop_export(self):
+        self._export_stop.set()
+        self._export_thread = None
+
+
+# ✅ **Rate-Limited Structured Logging** (replaces per-frame prints)
+class RateLimitedLog:
+    """Prints `<emoji> event key=value ...` lines, at most once per `interval` per event.
+
+    Repeats inside the interval are counted and reported as `suppressed=N` on the next
+    line that gets through, so a per-frame error costs a dict lookup instead of a print.
+    """
+
+    LEVELS = {"info": "🔮", "warning": "⚠️", "error": "❌"}
+
+    def __init__(self, interval=2.0):
+        self.interval = interval
+        self._last = {}
+        self._suppressed = {}
+
+    def emit(self, level, event, **fields):
+        now = time.monotonic()
+        if now - self._last.get(event, -self.interval) < self.interval:
+            self._suppressed[event] = self._suppressed.get(event, 0) + 1
+            return False
+        self._last[event] = now
+        suppressed = self._suppressed.pop(event, 0)
+        if suppressed:
+            fields["suppressed"] = suppressed
+        details = " ".join(f"{key}={value}" for key, value in fields.items())
+        print(f"{self.LEVELS[level]} {event} {details}".rstrip())
+        return True
+
+    def info(self, event, **fields):
+        return self.emit("info", event, **fields)
+
+    def warning(self, event, **fields):
+        return self.emit("warning", event, **fields)
+
+    def error(self, event, **fields):
+        return self.emit("error", event, **fields)
+
+
+# ✅ **Process-Wide Instances**
+metrics = StageMetrics()
+log = RateLimitedLog()
+
+
+def get_stage_metrics():
+    """Shared monitor; starts the periodic export once if the environment variable is set."""
+    export_path = os.environ.get(ENV_VAR)
+    if export_path and metrics._export_thread is None:
+        metrics.start_export(export_path)
+    return metrics
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print an exported stage-metrics snapshot.")
+    parser.add_argument("snapshot")
+    args = parser.parse_args()
+
+    with open(args.snapshot, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    print(f"⏱ {snapshot['timestamp']}  " + "  ".join(f"{loop}: {fps} fps" for loop, fps in snapshot["fps"].items()))
+    for stage, summary in snapshot["stages"].items():
+        print(f"   {stage:<14} n={summary['count']:<7} p50 {summary['p50_ms']:7.2f}  "
+              f"p95 {summary['p95_ms']:7.2f}  p99 {summary['p99_ms']:7.2f} ms")
+    if "audio" in snapshot:
+        print("🔊 " + "  ".join(f"{key}={value}" for key, value in snapshot["audio"].items()))
@@ -0,0 +1,231 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from contextlib import contextmanager, nullcontext
+from importlib.abc import MetaPathFinder
+
+# ✅ **Enable with:**  SIGNCONNECT_PROFILE_STARTUP=startup_report.json python main.py
+ENV_VAR = "SIGNCONNECT_PROFILE_STARTUP"
+
+
+class StartupProfiler:
+    """Records a timeline of imports, screen builds, model/font loads and the first frame.
+
+    The report is written at the first frame and rewritten by every later `flush()`, so
+    work that happens after the window is up (background prefetch, lazy model loads)
+    still lands in it.
+    """
+
+    def __init__(self, report_path):
+        self.report_path = report_path
+        self.origin = time.perf_counter()
+        self.events = []
+        self._lock = threading.Lock()
+        self._import_stack = threading.local()
+        self.finished = False
+
+    def _now_ms(self):
+        return (time.perf_counter() - self.origin) * 1000
+
+    def record(self, name, category, start_ms, duration_ms, self_ms=None):
+        with self._lock:
+            self.events.append({
+                "name": name,
+                "category": category,
+                "start_ms": round(start_ms, 2),
+                "duration_ms": round(duration_ms, 2),
+                "self_ms": round(self_ms if self_ms is not None else duration_ms, 2),
+                "thread": threading.current_thread().name,
+            })
+
+    @contextmanager
+    def span(self, name, category):
+        """Time a block of startup work."""
+        start = self._now_ms()
+        try:
+            yield
+        finally:
+            self.record(name, category, start, self._now_ms() - start)
+
+    def mark(self, name, category="milestone"):
+        """Record an instant (e.g. the first rendered frame)."""
+        self.record(name, category, self._now_ms(), 0.0)
+
+    # ✅ **Import Timing** (self time excludes nested imports)
+    def time_import(self, fullname, exec_module, module):
+        stack = getattr(self._import_stack, "frames", None)
+        if stack is None:
+            stack = self._import_stack.frames = []
+        start = self._now_ms()
+        stack.append(0.0)
+        try:
+            exec_module(module)
+        finally:
+            nested = stack.pop()
+            duration = self._now_ms() - start
+            if stack:
+                stack[-1] += duration
+            self.record(fullname, "import", start, duration, duration - nested)
+
+    def report(self, top=15):
+        """Machine-readable report: every event plus per-category totals and top offenders."""
+        with self._lock:
+            events = sorted(self.events, key=lambda e: e["start_ms"])
+        first_frame = next((e["start_ms"] for e in events if e["name"] == "first_frame"), None)
+        totals = {}
+        for event in events:
+            totals[event["category"]] = round(totals.get(event["category"], 0.0) + event["self_ms"], 2)
+        return {
+            "python": sys.version.split()[0],
+            "first_frame_ms": first_frame,
+            "total_ms": round(self._now_ms(), 2),
+            "category_self_ms": totals,
+            "top_offenders": sorted(events, key=lambda e: e["self_ms"], reverse=True)[:top],
+            "events": events,
+        }
+
+    def write(self, top=15):
+        """Write the JSON report and print a short human summary."""
+        report = self.report(top)
+        with open(self.report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        self.finished = True
+        print(summarize(report, top))
+        print(f"✅ Startup report written to: {self.report_path}")
+        return report
+
+
+class _TimingFinder(MetaPathFinder):
+    """Meta path hook that wraps every loader's exec_module with the profiler's timer."""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            loader = spec.loader
+            # Per-module loader instances are patched in place so their type stays intact;
+            # class-level loaders (builtin/frozen modules) are cheap and left alone.
+            if loader is not None and not isinstance(loader, type) and hasattr(loader, "exec_module"):
+                if not getattr(loader, "_startup_profiled", False):
+                    exec_module = loader.exec_module
+                    profiler = self.profiler
+                    loader.exec_module = lambda module: profiler.time_import(fullname, exec_module, module)
+                    loader._startup_profiled = True
+            return spec
+        return None
+
+
+# ✅ **Process-Wide Profiler**
+profiler = None
+
+
+def install(report_path):
+    """Start profiling now; call as early as possible (before heavy imports)."""
+    global profiler
+    if profiler is None:
+        profiler = StartupProfiler(report_path)
+        sys.meta_path.insert(0, _TimingFinder(profiler))
+    return profiler
+
+
+def install_from_env():
+    """Enable profiling if the environment variable names a report path."""
+    report_path = os.environ.get(ENV_VAR)
+    return install(report_path) if report_path else None
+
+
+def span(name, category):
+    """Context manager that times a block when profiling is on, and costs nothing otherwise."""
+    return profiler.span(name, category) if profiler is not None else nullcontext()
+
+
+def first_frame_rendered():
+    """Mark the first rendered frame and write the report (only once)."""
+    if profiler is not None and not profiler.finished:
+        profiler.mark("first_frame")
+        profiler.write()
+
+
+def flush(milestone):
+    """Mark a later milestone (e.g. "prefetch_done") and rewrite the report with everything so far."""
+    if profiler is not None and profiler.finished:
+        profiler.mark(milestone)
+        profiler.write()
+
+
+# ✅ **Human Summary & Run-to-Run Diff**
+def summarize(report, top=15):
+    first_frame = report.get("first_frame_ms")
+    if first_frame is not None:
+        lines = [f"⏱ Startup: {first_frame:.0f} ms to first frame, {report['total_ms']:.0f} ms recorded"]
+    else:
+        lines = [f"⏱ Startup: {report['total_ms']:.0f} ms"]
+    for category, total in sorted(report["category_self_ms"].items(), key=lambda kv: -kv[1]):
+        lines.append(f"   {category:<10} {total:9.1f} ms")
+    lines.append("   Top offenders (self time):")
+    for event in report["top_offenders"][:top]:
+        lines.append(f"   {event['self_ms']:9.1f} ms  [{event['category']}] {event['name']}")
+    return "\n".join(lines)
+
+
+def diff_reports(old, new, threshold_ms=20.0, threshold_ratio=0.2):
+    """Return (regressions, improvements) per event name, beyond both thresholds."""
+    def by_name(report):
+        merged = {}
+        for event in report["events"]:
+            key = (event["category"], event["name"])
+            merged[key] = merged.get(key, 0.0) + event["self_ms"]
+        return merged
+
+    old_events, new_events = by_name(old), by_name(new)
+    regressions, improvements = [], []
+    for key in set(old_events) | set(new_events):
+        before, after = old_events.get(key, 0.0), new_events.get(key, 0.0)
+        delta = after - before
+        if abs(delta) < threshold_ms or abs(delta) < threshold_ratio * max(before, 1.0):
+            continue
+        (regressions if delta > 0 else improvements).append((key[0], key[1], round(before, 1), round(after, 1)))
+
+    # Reports flushed later also cover idle time, so compare time to first frame when both have it
+    field = "first_frame_ms" if old.get("first_frame_ms") is not None and new.get("first_frame_ms") is not None else "total_ms"
+    total = ("total", field, old[field], new[field])
+    if new[field] - old[field] >= threshold_ms and new[field] > old[field] * (1 + threshold_ratio):
+        regressions.append(total)
+    return sorted(regressions, key=lambda r: r[2] - r[3]), sorted(improvements, key=lambda r: r[3] - r[2])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarise or diff startup profiling reports.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    show = sub.add_parser("show")
+    show.add_argument("report")
+    compare = sub.add_parser("diff")
+    compare.add_argument("old")
+    compare.add_argument("new")
+    compare.add_argument("--threshold-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    if args.command == "show":
+        with open(args.report, encoding="utf-8") as f:
+            print(summarize(json.load(f)))
+    else:
+        with open(args.old, encoding="utf-8") as f:
+            old = json.load(f)
+        with open(args.new, encoding="utf-8") as f:
+            new = json.load(f)
+        regressions, improvements = diff_reports(old, new, args.threshold_ms)
+        print(f"⏱ Total: {old['total_ms']:.0f} ms → {new['total_ms']:.0f} ms")
+        for category, name, before, after in regressions:
+            print(f"❌ Regression [{category}] {name}: {before} ms → {after} ms")
+        for category, name, before, after in improvements:
+            print(f"✅ Improvement [{category}] {name}: {before} ms → {after} ms")
+        raise SystemExit(1 if regressions else 0)
@@ -0,0 +1,70 @@
+import heapq
+import threading
+from audio_worker import AudioWorker, PRIORITY_EMERGENCY, PRIORITY_SIGN
+
+# The worker thread is never started: these tests inspect the queue `speak` builds
+
+
+def pending(worker):
+    """Queued texts in the order the worker would play them."""
+    return [item[3] for item in heapq.nsmallest(len(worker._heap), worker._heap)]
+
+
+def test_newer_sign_replaces_a_waiting_one():
+    worker = AudioWorker()
+    worker.speak("hello")
+    worker.speak("thanks")
+    worker.speak("water")
+
+    assert pending(worker) == ["water"]
+    assert worker.metrics()["coalesced"] == 2
+
+
+def test_emergency_is_kept_and_plays_first():
+    worker = AudioWorker()
+    worker.speak("hello")
+    worker.speak_emergency("help")
+    worker.speak("thanks")
+
+    assert pending(worker) == ["help", "thanks"]
+    assert worker.queue_depth == 2
+
+
+def test_empty_and_none_are_not_queued():
+    worker = AudioWorker()
+    worker.speak("  ")
+    worker.speak(None)
+
+    assert worker.queue_depth == 0
+
+
+def test_emergency_preempts_sign_playback():
+    worker = AudioWorker()
+    worker._playing_priority = PRIORITY_SIGN
+    worker.speak("thanks")
+    assert not worker._preempt.is_set()
+
+    worker.speak_emergency("help")
+    assert worker._preempt.is_set()
+
+
+def test_sign_does_not_preempt_emergency_playback():
+    worker = AudioWorker()
+    worker._playing_priority = PRIORITY_EMERGENCY
+    worker.speak("thanks")
+
+    assert not worker._preempt.is_set()
+
+
+def test_stale_signs_are_dropped():
+    worker = AudioWorker(max_sign_age=0.0)
+    worker._running = True
+    worker.speak("hello")
+    worker.speak_emergency("help")
+
+    assert worker._next_item()[2] == "help"  # Emergencies are never too old
+    stopper = threading.Timer(0.2, worker.stop)
+    stopper.start()
+    assert worker._next_item() is None  # "hello" went stale, so the worker waits until stopped
+    stopper.join()
+    assert worker.metrics()["dropped_stale"] == 1
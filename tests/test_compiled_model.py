@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from compiled_model import CompiledPredictor, compile_predictor
+
+
+def make_dataset(n_classes, n_features=63, per_class=40, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(scale=3.0, size=(n_classes, n_features))
+    X = np.vstack([center + rng.normal(size=(per_class, n_features)) for center in centers])
+    y = np.repeat([f"sign{i}" for i in range(n_classes)], per_class)
+    return X, y
+
+
+def fit(model, X, y, use_pca):
+    from sklearn.decomposition import PCA
+    from sklearn.preprocessing import StandardScaler
+
+    pca = PCA(n_components=20).fit(X) if use_pca else None
+    reduced = pca.transform(X) if pca is not None else X
+    scaler = StandardScaler().fit(reduced)
+    model.fit(scaler.transform(reduced), y)
+    return model, scaler, pca
+
+
+def candidates():
+    from sklearn.svm import SVC
+    from sklearn.linear_model import LogisticRegression
+
+    return {
+        "linear": lambda: SVC(kernel="linear"),
+        "rbf": lambda: SVC(kernel="rbf", gamma="scale"),
+        "logistic": lambda: LogisticRegression(max_iter=2000),
+    }
+
+
+@pytest.mark.parametrize("kind", ["linear", "rbf", "logistic"])
+@pytest.mark.parametrize("n_classes", [2, 4])
+@pytest.mark.parametrize("use_pca", [False, True])
+def test_verify_matches_sklearn(kind, n_classes, use_pca):
+    X, y = make_dataset(n_classes)
+    model, scaler, pca = fit(candidates()[kind](), X, y, use_pca)
+
+    predictor = CompiledPredictor.from_sklearn(model, scaler, pca)
+    agreement, max_error = predictor.verify(model, scaler, pca, X=X)
+
+    assert agreement == 1.0
+    assert max_error < 1e-3
+    assert list(predictor.predict(X)) == list(y)
+
+
+def test_ovo_decision_shape_is_verified():
+    from sklearn.svm import SVC
+
+    X, y = make_dataset(4)
+    model, scaler, _ = fit(SVC(kernel="linear", decision_function_shape="ovo"), X, y, False)
+
+    _, max_error = CompiledPredictor.from_sklearn(model, scaler).verify(model, scaler, X=X)
+    assert max_error < 1e-3
+
+
+def test_compile_predictor_rejects_unsupported_models():
+    from sklearn.neighbors import KNeighborsClassifier
+
+    X, y = make_dataset(3)
+    model, scaler, _ = fit(KNeighborsClassifier(), X, y, False)
+
+    assert compile_predictor(model, scaler) is None
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from feature_store import FeatureStore
+
+
+def rows(n, dim=3, start=0):
+    return np.arange(start * dim, (start + n) * dim, dtype=np.float32).reshape(n, dim)
+
+
+def test_append_grows_across_chunks(tmp_path):
+    store = FeatureStore.create(str(tmp_path / "store"), 3, chunk_rows=4)
+    store.append(rows(3), [0, 1, 2])
+    store.append(rows(6, start=3), [3] * 6)
+
+    assert len(store) == 9
+    assert store.meta["capacity"] == 12
+    np.testing.assert_array_equal(store.features, rows(9))
+    np.testing.assert_array_equal(store.labels, [0, 1, 2] + [3] * 6)
+
+
+def test_take_returns_the_requested_rows_sorted(tmp_path):
+    store = FeatureStore.create(str(tmp_path / "store"), 3, chunk_rows=4)
+    store.append(rows(10), np.arange(10))
+
+    X, y = store.take(np.array([7, 2, 5]), dtype=np.float64)
+    assert X.dtype == np.float64
+    np.testing.assert_array_equal(y, [2, 5, 7])
+    np.testing.assert_array_equal(X, rows(10)[[2, 5, 7]])
+
+
+def test_only_flushed_rows_are_visible_on_reopen(tmp_path):
+    path = str(tmp_path / "store")
+    store = FeatureStore.create(path, 3, chunk_rows=4)
+    store.set_classes(["hello", "thanks"])
+    store.append(rows(2), [0, 1])
+    store.flush()
+    store.append(rows(2, start=2), [1, 1])  # Never flushed
+
+    reopened = FeatureStore(path)
+    assert len(reopened) == 2
+    assert reopened.classes == ["hello", "thanks"]
+    np.testing.assert_array_equal(reopened.features, rows(2))
+
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    path = str(tmp_path / "store")
+    FeatureStore.create(path, 3)
+
+    with pytest.raises(ValueError):
+        FeatureStore(path, feature_dim=4)
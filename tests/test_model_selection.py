@@ -0,0 +1,45 @@
+import numpy as np
+from feature_store import FeatureStore
+from model_selection import fold_cache_key
+
+
+def make_store(path, n=12, chunk_rows=4):
+    store = FeatureStore.create(str(path), 3, chunk_rows=chunk_rows)
+    store.set_classes(["hello", "thanks"])
+    store.append(np.arange(n * 3, dtype=np.float32).reshape(n, 3), np.arange(n) % 2)
+    return store
+
+
+def test_key_is_stable_for_the_same_rows(tmp_path):
+    assert fold_cache_key(make_store(tmp_path / "a"), 5, 42) == fold_cache_key(make_store(tmp_path / "b"), 5, 42)
+
+
+def test_key_ignores_spare_capacity(tmp_path):
+    tight = make_store(tmp_path / "tight")
+    roomy = make_store(tmp_path / "roomy", chunk_rows=64)  # Zero-filled rows past len(store) are not data
+
+    assert roomy.meta["capacity"] > tight.meta["capacity"]
+    assert fold_cache_key(roomy, 5, 42) == fold_cache_key(tight, 5, 42)
+
+
+def test_key_changes_with_split_and_data(tmp_path):
+    store = make_store(tmp_path / "store")
+    key = fold_cache_key(store, 5, 42)
+
+    assert fold_cache_key(store, 3, 42) != key
+    assert fold_cache_key(store, 5, 7) != key
+
+    store.features[0, 0] += 1.0
+    assert fold_cache_key(store, 5, 42) != key
+    store.features[0, 0] -= 1.0
+
+    store.labels[0] = 1
+    assert fold_cache_key(store, 5, 42) != key
+    store.labels[0] = 0
+
+    store.set_classes(["hello", "water"])
+    assert fold_cache_key(store, 5, 42) != key
+
+    store.append(np.zeros((1, 3)), [0])
+    store.set_classes(["hello", "thanks"])
+    assert fold_cache_key(store, 5, 42) != key
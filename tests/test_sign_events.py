@@ -0,0 +1,60 @@
+from sign_events import SignEventEngine, NO_SIGN
+
+
+def feed(engine, signs, start=0.0, step=0.1):
+    """Feed one sign per frame at `step` second intervals; returns the emitted events."""
+    events = []
+    for i, sign in enumerate(signs):
+        event = engine.update(sign, 1.0, timestamp=start + i * step)
+        if event is not None:
+            events.append(event)
+    return events
+
+
+def test_stable_sign_emits_once():
+    engine = SignEventEngine(window=5, min_share=0.6, hysteresis=0.2, min_hold=0.0)
+    events = feed(engine, ["hello"] * 20)
+
+    assert [(e.sign, e.previous) for e in events] == [("hello", NO_SIGN)]
+    assert engine.current == "hello"
+
+
+def test_single_frame_flicker_is_ignored():
+    engine = SignEventEngine(window=5, min_share=0.6, hysteresis=0.2, min_hold=0.0)
+    feed(engine, ["hello"] * 5)
+    events = feed(engine, ["thanks", "hello", "hello", "thanks", "hello"], start=1.0)
+
+    assert events == []
+    assert engine.current == "hello"
+
+
+def test_hysteresis_blocks_a_narrow_lead():
+    # 3 of 5 frames give the challenger 0.6 against the current sign's 0.4: a 0.2 lead
+    engine = SignEventEngine(window=5, min_share=0.6, hysteresis=0.3, min_hold=0.0)
+    feed(engine, ["hello"] * 5)
+    assert feed(engine, ["thanks"] * 3, start=1.0) == []
+
+    events = feed(engine, ["thanks"], start=2.0)
+    assert [(e.sign, e.previous) for e in events] == [("thanks", "hello")]
+
+
+def test_min_hold_delays_the_next_change():
+    engine = SignEventEngine(window=3, min_share=0.6, hysteresis=0.2, min_hold=1.0)
+    feed(engine, ["hello"] * 3, step=0.01)
+    assert feed(engine, ["thanks"] * 3, start=0.1, step=0.01) == []
+
+    events = feed(engine, ["thanks"], start=1.5)
+    assert [e.sign for e in events] == ["thanks"]
+
+
+def test_score_vote_weights_frames_by_confidence():
+    frames = [("hello", 0.1), ("hello", 0.1), ("thanks", 0.9)]
+    signs = {}
+    for vote in ("majority", "score"):
+        engine = SignEventEngine(window=4, vote=vote, min_share=0.6, hysteresis=0.2, min_hold=0.0)
+        for i, (sign, score) in enumerate(frames):
+            engine.update(sign, score, timestamp=i * 0.1)
+        signs[vote] = engine.current
+
+    # One confident frame outweighs two unsure ones only when votes carry the score
+    assert signs == {"majority": "hello", "score": "thanks"}
@@ -0,0 +1,28 @@
+from stage_metrics import RollingHistogram
+
+
+def test_empty_histogram_has_no_summary():
+    assert RollingHistogram(size=4).summary() is None
+
+
+def test_summary_of_a_partial_window():
+    histogram = RollingHistogram(size=8)
+    for value in (1.0, 2.0, 3.0):
+        histogram.add(value)
+
+    summary = histogram.summary()
+    assert summary["count"] == 3
+    assert summary["mean_ms"] == 2.0
+    assert summary["p50_ms"] == 2.0
+    assert summary["p99_ms"] <= 3.0
+
+
+def test_old_samples_roll_out_of_the_window():
+    histogram = RollingHistogram(size=4)
+    for value in (100.0, 100.0, 100.0, 100.0, 1.0, 1.0, 1.0, 1.0):
+        histogram.add(value)
+
+    summary = histogram.summary()
+    assert summary["count"] == 8  # Total seen, the percentiles only cover the last 4
+    assert summary["mean_ms"] == 1.0
+    assert summary["p99_ms"] == 1.0
@@ -1,21 +1,26 @@
 import os
+import threading
 import numpy as np
 import joblib
-import cv2
+from kivy.app import App
 from kivy.clock import Clock
-from sklearn.svm import SVC
-from sklearn.preprocessing import LabelEncoder
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import confusion_matrix, accuracy_score, classification_report
-import matplotlib.pyplot as plt
-import seaborn as sns
 from kivy.uix.screenmanager import Screen
-from ultralytics import YOLO
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
 
+# ✅ **File Paths**
+BASE_PATH = r"C:\Users\Kingshuk Maji\Documents\Sign_Connect\Sign Connect"
+DATA_PATH = os.path.join(BASE_PATH, "Datasets")
+FEATURE_CACHE_PATH = os.path.join(BASE_PATH, "Models", "SVM", "landmark_cache")
+FEATURE_STORE_PATH = os.path.join(BASE_PATH, "Models", "SVM", "landmark_store")
+SVM_MODEL_SAVE_PATH = os.path.join(BASE_PATH, "Models", "SVM", "svm_model.pkl")
+SCALER_SAVE_PATH = os.path.join(BASE_PATH, "Models", "SVM", "scaler.pkl")
+PCA_SAVE_PATH = os.path.join(BASE_PATH, "Models", "SVM", "pca.pkl")
+PIPELINE_SAVE_PATH = os.path.join(BASE_PATH, "Models", "SVM", "pipeline.json")
+ARTIFACT_SAVE_PATH = os.path.join(BASE_PATH, "Models", "SVM", "svm_artifact")
+ONLINE_MODEL_PATH = os.path.join(BASE_PATH, "Models", "SVM", "online_model.pkl")
 
 class LearningScreen(Screen):
     def __init__(self, **kwargs):
@@ -33,9 +38,28 @@ class LearningScreen(Screen):
         layout.add_widget(self.label_input)
 
         # ✅ **Start Learning Button**
-        start_learning_button = Button(text="Start Learning", size_hint=(1, 0.15))
-        start_learning_button.bind(on_press=self.start_learning)
-        layout.add_widget(start_learning_button)
+        self.start_learning_button = Button(text="Start Learning", size_hint=(1, 0.15))
+        self.start_learning_button.bind(on_press=self.start_learning)
+        layout.add_widget(self.start_learning_button)
+
+        # ✅ **Add Sign Button** (incremental: learns only the entered label, in seconds)
+        self.add_sign_button = Button(text="Add Sign (Quick)", size_hint=(1, 0.15))
+        self.add_sign_button.bind(on_press=self.start_add_sign)
+        layout.add_widget(self.add_sign_button)
+
+        # ✅ **Progress of the background extraction/training**
+        self.status_label = Label(text="", size_hint=(1, 0.1))
+        layout.add_widget(self.status_label)
+        self.worker = None
+        self.cancel_event = threading.Event()
+        self.online_model = None
+        self.consolidator = None
+        self.consolidation_cancel = threading.Event()  # Set only when the app stops
+
+        # ✅ Bound here, on the UI thread; the consolidation thread only reads the event
+        app = App.get_running_app()
+        if app is not None:
+            app.bind(on_stop=lambda *args: self.consolidation_cancel.set())
 
         # ✅ **Back Button**
         back_button = Button(text="Back", size_hint=(1, 0.15))
@@ -53,107 +77,237 @@ class LearningScreen(Screen):
             print("❌ Error: 'second' screen not found in ScreenManager.")
 
     def start_learning(self, instance):
-        """Handles YOLO feature extraction and SVM training."""
+        """Validate the input and run extraction + full training on a background thread."""
+        self.start_worker(self.train)
+
+    def start_add_sign(self, instance):
+        """Validate the input and learn only the entered sign on a background thread."""
+        self.start_worker(self.add_sign)
+
+    def start_worker(self, task):
         label_name = self.label_input.text.strip()
         if not label_name:
             print("❌ Error: Please enter a label before training!")
             return
+        if self.worker is not None and self.worker.is_alive():
+            print("⚠️ Training is already running.")
+            return
 
-        # ✅ **File Paths**
-        BASE_PATH = r"C:\Users\Kingshuk Maji\Documents\Sign_Connect\Sign Connect"
-        DATA_PATH = os.path.join(BASE_PATH, "Datasets")
-        YOLO_MODEL_PATH = os.path.join(BASE_PATH, "Models", "Yolo", "yolov8_model.pt")
-        YOLO_FEATURES_SAVE_PATH = os.path.join(BASE_PATH, "Models", "Yolo", "yolov8_model.pkl")
-        SVM_MODEL_SAVE_PATH = os.path.join(BASE_PATH, "Models", "SVM", "svm_model.pkl")
+        self.set_buttons_disabled(True)
+        self.set_status("Preparing feature extraction...")
+        self.worker = threading.Thread(target=self.run_learning, args=(task, label_name), daemon=True)
+        self.worker.start()
+
+    def set_buttons_disabled(self, disabled):
+        self.start_learning_button.disabled = disabled
+        self.add_sign_button.disabled = disabled
+
+    def set_status(self, text):
+        """Update the status label from any thread."""
+        Clock.schedule_once(lambda dt: setattr(self.status_label, 'text', text))
+
+    def on_leave(self, *args):
+        """Leaving the screen cancels a running extraction (between batches)."""
+        self.cancel_event.set()
+
+    def run_learning(self, task, label_name):
+        """Background thread: parallel landmark extraction, then training."""
+        try:
+            self.cancel_event.clear()
+            task(label_name)
+        except Exception as e:
+            print(f"❌ Training Error: {e}")
+            self.set_status(f"Training failed: {e}")
+        finally:
+            Clock.schedule_once(lambda dt: self.set_buttons_disabled(False))
+
+    def update_feature_cache(self, samples):
+        """Extract landmarks of new or changed images only; returns None if the run was cancelled."""
+        from feature_extraction import LandmarkExtractor, landmark_version
+        from feature_cache import FeatureCache
+
+        cache = FeatureCache(FEATURE_CACHE_PATH, landmark_version())
+        cache.update(
+            [path for path, _ in samples],
+            LandmarkExtractor,
+            progress=lambda done, total: self.set_status(f"Extracting new images: {done}/{total}"),
+            cancel=self.cancel_event,
+        )
+        if self.cancel_event.is_set():
+            self.set_status("Training cancelled.")
+            return None
+        return cache
+
+    def build_store(self, cache, classes, samples):
+        """Stream the cached landmarks of the whole dataset into a fresh memory-mapped store."""
+        from feature_extraction import LANDMARK_DIM
+        from feature_store import FeatureStore
+
+        store = FeatureStore.create(FEATURE_STORE_PATH, LANDMARK_DIM)
+        store.set_classes(classes)
+        cache.export(samples, store)
+        return store
+
+    def wait_for_consolidation(self):
+        """Adding rows while the consolidation thread reads the store would remap it under the reader."""
+        if self.consolidator is not None and self.consolidator.running:
+            self.set_status("Waiting for background consolidation...")
+            self.consolidator.thread.join()
+
+    def start_consolidation(self, store, force=False):
+        """Full retrain of the online model in the background once enough signs were added.
+
+        It keeps running when the user leaves this screen and is only cancelled when the app stops.
+        """
+        from incremental_training import Consolidator
+
+        if self.consolidator is None:
+            self.consolidator = Consolidator(ONLINE_MODEL_PATH)
+            self.consolidator.cancel = self.consolidation_cancel
+        self.consolidator.maybe_start(self.online_model, store, on_done=lambda fresh: setattr(self, 'online_model', fresh),
+                                      force=force)
+
+    def add_sign(self, label_name):
+        """Incremental learning: extract the entered sign's new images and add it to the online model.
+
+        A new sign only appends its own rows to the feature store and trains one linear
+        classifier against a replayed sample of the other signs; the full model is
+        consolidated in the background every few additions.
+        """
+        from feature_extraction import list_dataset
+        from feature_store import FeatureStore
+        from incremental_training import OnlineSignModel, sample_rows, save_model
+
+        if not os.path.isdir(os.path.join(DATA_PATH, label_name)):
+            print(f"❌ Error: No images found in Datasets/{label_name}!")
+            self.set_status(f"No images for '{label_name}'!")
+            return
 
-        # ✅ **Check if YOLO Model Exists**
-        if not os.path.exists(YOLO_MODEL_PATH):
-            print("❌ Error: YOLO model file not found!")
+        # ✅ **Extract Features** (every other sign comes straight from the cache)
+        classes, samples = list_dataset(DATA_PATH)
+        cache = self.update_feature_cache(samples)
+        if cache is None:
+            return
+        sign_samples = [(path, 0) for path, label_id in samples if classes[label_id] == label_name]
+        self.wait_for_consolidation()
+
+        # ✅ **Append the Sign to the Store** (a missing store or a re-recorded sign is rebuilt)
+        try:
+            store = FeatureStore(FEATURE_STORE_PATH)
+        except ValueError:
+            store = None
+        if store is None or label_name in store.classes or not len(store):
+            self.set_status("Rebuilding feature store...")
+            store = self.build_store(cache, classes, samples)
+        else:
+            label_id = len(store.classes)
+            store.set_classes(store.classes + [label_name])
+            cache.export([(path, label_id) for path, _ in sign_samples], store)
+        label_id = store.classes.index(label_name)
+        X_sign = np.asarray(store.features[np.flatnonzero(np.asarray(store.labels) == label_id)])
+        if not len(X_sign):
+            print(f"❌ Error: No hands found in the images of '{label_name}'!")
+            self.set_status("No features extracted.")
             return
 
-        # ✅ **Load YOLO Model**
-        yolo_model = YOLO(YOLO_MODEL_PATH)
+        # ✅ **Online Model** (loaded once; built from the store on the very first run)
+        if self.online_model is None and os.path.exists(ONLINE_MODEL_PATH):
+            self.online_model = joblib.load(ONLINE_MODEL_PATH)
+        if self.online_model is None or self.online_model.feature_dim != store.feature_dim:
+            self.set_status("Building online model (first run)...")
+            self.online_model = OnlineSignModel(store.feature_dim)
+            if not self.online_model.consolidate(store, cancel=self.cancel_event):
+                self.online_model = None
+                self.set_status("Training cancelled.")
+                return
+
+        # ✅ **Learn the Sign**
+        self.set_status(f"Learning '{label_name}'...")
+        X_others, y_others = sample_rows(store, exclude_label=label_id)
+        self.online_model.add_sign(label_name, X_sign, X_others, y_others)
+        save_model(self.online_model, ONLINE_MODEL_PATH)
+        print(f"✅ Added '{label_name}' ({len(X_sign)} samples); online model saved at: {ONLINE_MODEL_PATH}")
+        self.set_status(f"Added '{label_name}' ({len(X_sign)} samples)")
+
+        self.start_consolidation(store)
+
+    def train(self, label_name):
+        """Handles landmark extraction and PCA → scaler → SVM training on the live path's features."""
+        # ✅ **Heavy training dependencies are only imported when training starts**
+        from sklearn.svm import SVC
+        from sklearn.decomposition import PCA
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import confusion_matrix, accuracy_score
+        import matplotlib
+        matplotlib.use("Agg")  # Only saves a PNG; never opens a window from a worker
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        from feature_extraction import list_dataset, LANDMARK_DIM
+        from model_artifact import export_artifact, write_pipeline
+        from model_selection import selected_estimator
 
         # ✅ **Check if Dataset Exists**
         if not os.path.exists(DATA_PATH) or not os.listdir(DATA_PATH):
             print("❌ Error: No dataset found in 'Datasets' directory!")
+            self.set_status("No dataset found!")
             return
 
-        # ✅ **Extract Features using YOLO**
-        features, labels = [], []
-        CLASSES_LIST = os.listdir(DATA_PATH)
-
+        # ✅ **Extract Hand Landmarks** (only new or changed images; the rest comes from the cache)
+        CLASSES_LIST, samples = list_dataset(DATA_PATH)
         print("📂 **Classes Found:**", CLASSES_LIST)
 
-        for label_id, sign_name in enumerate(CLASSES_LIST):
-            sign_path = os.path.join(DATA_PATH, sign_name)
-            if not os.path.isdir(sign_path):
-                continue  # Skip if not a directory
-
-            for filename in os.listdir(sign_path):
-                image_path = os.path.join(sign_path, filename)
-                image = cv2.imread(image_path)
-
-                if image is None:
-                    print(f"⚠️ Warning: Could not read {image_path}. Skipping.")
-                    continue
-
-                # ✅ **Perform YOLO inference**
-                results = yolo_model.predict(image)
-
-                # ✅ **Extract YOLO bounding box features**
-                for result in results:
-                    for box in result.boxes:
-                        x1, y1, x2, y2 = map(int, box.xyxy[0])
-
-                        # ✅ **Ensure bounding box is within image dimensions**
-                        h, w, _ = image.shape
-                        x1, y1, x2, y2 = max(0, x1), max(0, y1), min(w, x2), min(h, y2)
-
-                        crop = image[y1:y2, x1:x2]
-                        if crop.size == 0:
-                            continue  # Skip invalid crops
-
-                        resized_crop = cv2.resize(crop, (64, 64))
-                        feature_vector = resized_crop.flatten()  # ✅ Convert image to 1D feature vector
-
-                        features.append(feature_vector)
-                        labels.append(label_id)
-
-        # ✅ **Convert Features to NumPy Arrays**
-        features = np.array(features)
-        labels = np.array(labels)
-
-        # ✅ **Save Extracted Features**
-        joblib.dump((features, labels), YOLO_FEATURES_SAVE_PATH)
-        print(f"\n✅ YOLO features saved at: {YOLO_FEATURES_SAVE_PATH}")
-
-        # ✅ **Train SVM Model**
-        label_encoder = LabelEncoder()
-        labels_encoded = label_encoder.fit_transform(labels)
-
-        # ✅ **Split Dataset**
-        X_train, X_test, y_train, y_test = train_test_split(features, labels_encoded, test_size=0.2, random_state=42)
-
-        # ✅ **Train SVM**
-        svm_model = SVC(kernel='linear')
-        svm_model.fit(X_train, y_train)
+        cache = self.update_feature_cache(samples)
+        if cache is None:
+            return
 
-        # ✅ **Save SVM Model**
+        # ✅ **Memory-Mapped Training Matrix** (streamed from the cache, never stacked in RAM)
+        self.wait_for_consolidation()
+        store = self.build_store(cache, CLASSES_LIST, samples)
+        if not len(store):
+            print("❌ Error: No hands found in the dataset images!")
+            self.set_status("No features extracted.")
+            return
+        self.set_status("Training SVM...")
+
+        # ✅ **Split Dataset** (63 floats per row, so each split fits in memory)
+        # Labels are the sign names themselves, so the model predicts what the live path displays
+        train_idx, test_idx = train_test_split(np.arange(len(store)), test_size=0.2, random_state=42)
+        X_train, y_train = store.take(train_idx)
+        X_test, y_test = store.take(test_idx)
+        class_names = np.array(CLASSES_LIST)
+        y_train, y_test = class_names[y_train], class_names[y_test]
+
+        # ✅ **Fit PCA → Scaler → Classifier** (the order `RealTimeRecognition.classify` applies them)
+        pca = PCA(n_components=LANDMARK_DIM).fit(X_train)
+        scaler = StandardScaler().fit(pca.transform(X_train))
+        # The model picked by model_selection.py (fastest compiled one above the accuracy bar), else a linear SVM
+        svm_model = selected_estimator() or SVC(kernel='linear')
+        print(f"🔮 Training {svm_model}")
+        svm_model.fit(scaler.transform(pca.transform(X_train)), y_train)
+        del X_train
+
+        # ✅ **Save SVM Model, Scaler, PCA and the Compiled Artifact the app loads first**
         joblib.dump(svm_model, SVM_MODEL_SAVE_PATH)
+        joblib.dump(scaler, SCALER_SAVE_PATH)
+        joblib.dump(pca, PCA_SAVE_PATH)
+        write_pipeline(PIPELINE_SAVE_PATH, ["pca", "scaler"])  # The app applies pca.pkl only when this says so
+        export_artifact(ARTIFACT_SAVE_PATH, svm_model, scaler, pca)  # selected_estimator only returns compilable models
         print(f"\n✅ SVM model saved at: {SVM_MODEL_SAVE_PATH}")
+        self.start_consolidation(store, force=True)  # Keep the online model in step with the rebuilt store
 
         # ✅ **Evaluate Model**
-        y_pred = svm_model.predict(X_test)
+        y_pred = svm_model.predict(scaler.transform(pca.transform(X_test)))
         accuracy = accuracy_score(y_test, y_pred)
         print(f"\n✅ Overall Accuracy: {accuracy * 100:.2f}%")
+        self.set_status(f"Training complete: {accuracy * 100:.2f}% accuracy")
 
         # ✅ **Display Confusion Matrix**
-        conf_matrix = confusion_matrix(y_test, y_pred)
+        conf_matrix = confusion_matrix(y_test, y_pred, labels=CLASSES_LIST)
         plt.figure(figsize=(10, 8))
         sns.heatmap(conf_matrix, annot=True, fmt="d", cmap="Blues", xticklabels=CLASSES_LIST, yticklabels=CLASSES_LIST)
         plt.xlabel("Predicted Labels")
         plt.ylabel("True Labels")
         plt.title("Confusion Matrix")
         plt.savefig('confusion_matrix.png')
-       
+        plt.close()
@@ -0,0 +1,236 @@
+import io
+import os
+import math
+import time
+import wave
+import struct
+import hashlib
+import threading
+
+# ✅ **Cache Location** (next to the app, like users.json and the Kannada font)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tts_cache")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+# ✅ **Synthesis Backends**
+class GTTSBackend:
+    """Google TTS over the network (the voice the app has always used)."""
+    name = "gtts"
+    extension = "mp3"
+
+    def synthesize(self, text, lang, voice=None):
+        from gtts import gTTS
+
+        buffer = io.BytesIO()
+        tld = voice or "com"  # gTTS picks the accent/voice through the Google domain
+        gTTS(text=text, lang=lang, tld=tld).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class OfflineToneBackend:
+    """Local stand-in that needs no network: a short chime pattern unique to each text.
+
+    It keeps the kiosk audibly responsive when gTTS is unreachable; the real voice
+    replaces it the next time the text is synthesised with the network available.
+    """
+    name = "offline"
+    extension = "wav"
+
+    def __init__(self, sample_rate=22050, note_seconds=0.12):
+        self.sample_rate = sample_rate
+        self.note_seconds = note_seconds
+
+    def synthesize(self, text, lang, voice=None):
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        frequencies = [440.0 * 2 ** ((b % 12) / 12.0) for b in digest[:3]]
+
+        samples = []
+        n = int(self.sample_rate * self.note_seconds)
+        for frequency in frequencies:
+            for i in range(n):
+                envelope = min(1.0, i / 200.0, (n - i) / 200.0)
+                samples.append(int(12000 * envelope * math.sin(2 * math.pi * frequency * i / self.sample_rate)))
+
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+        return buffer.getvalue()
+
+
+# ✅ **Content-Addressed Audio Cache with LRU Size Limit**
+class TTSCache:
+    """On-disk audio cache keyed by (text, language, voice, backend).
+
+    Hits are served from disk (or memory) without any network round trip. Entries are
+    touched on use and the least recently used files are evicted once the cache exceeds
+    `max_bytes`. If the primary backend fails (e.g. no network) the fallback's audio is
+    cached under the fallback's own key, so the real voice is still synthesised and cached
+    once reachable. After a failure the primary backend is skipped for `backoff` seconds,
+    doubling per consecutive failure up to `max_backoff`, instead of every utterance
+    waiting on a network timeout.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, backend=None, fallback=None,
+                 backoff=5.0, max_backoff=300.0):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.backend = backend or GTTSBackend()
+        self.fallback = fallback if fallback is not None else OfflineToneBackend()
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._memory = {}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self._failures = 0  # Consecutive primary backend failures
+        self._retry_at = 0.0  # time.monotonic() before which the primary backend is skipped
+
+    def key(self, text, lang, voice=None, backend=None):
+        """Content address of one utterance."""
+        backend = backend or self.backend
+        raw = "\0".join([backend.name, lang, voice or "", text])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key, extension):
+        return os.path.join(self.cache_dir, f"{key}.{extension}")
+
+    def get(self, text, lang="kn", voice=None):
+        """Return (audio_bytes, extension) for the text, synthesising it on a miss."""
+        text = str(text).strip()
+        data = self._lookup(text, lang, voice, self.backend, count_hit=True)
+        if data is not None:
+            return data, self.backend.extension
+
+        with self._lock:
+            self.misses += 1
+            backend_down = self.fallback is not None and time.monotonic() < self._retry_at
+        if not backend_down:
+            try:
+                data = self.backend.synthesize(text, lang, voice)
+            except Exception as e:
+                if self.fallback is None:
+                    raise
+                self._backend_failed(e)
+            else:
+                with self._lock:
+                    self._failures, self._retry_at = 0, 0.0
+                key = self.key(text, lang, voice)
+                self._store(key, self._path(key, self.backend.extension), data)
+                return data, self.backend.extension
+
+        # ✅ Primary backend unavailable: the fallback's audio, cached under its own key
+        data = self._lookup(text, lang, voice, self.fallback)
+        if data is None:
+            data = self.fallback.synthesize(text, lang, voice)
+            key = self.key(text, lang, voice, self.fallback)
+            self._store(key, self._path(key, self.fallback.extension), data)
+        return data, self.fallback.extension
+
+    def _lookup(self, text, lang, voice, backend, count_hit=False):
+        """Cached audio of one utterance from memory or disk, or None."""
+        key = self.key(text, lang, voice, backend)
+        path = self._path(key, backend.extension)
+
+        with self._lock:
+            if key in self._memory:
+                if count_hit:
+                    self.hits += 1
+                self._touch(path)
+                return self._memory[key]
+
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                data = f.read()
+            with self._lock:
+                self._memory[key] = data
+                if count_hit:
+                    self.hits += 1
+            self._touch(path)
+            return data
+        return None
+
+    def _backend_failed(self, error):
+        """Skip the primary backend for a while; the wait doubles with every consecutive failure."""
+        with self._lock:
+            self._failures += 1
+            delay = min(self.max_backoff, self.backoff * 2 ** (self._failures - 1))
+            self._retry_at = time.monotonic() + delay
+        print(f"⚠️ TTS backend '{self.backend.name}' failed ({error}); "
+              f"using the '{self.fallback.name}' fallback, retrying in {delay:g}s.")
+
+    def _store(self, key, path, data):
+        """Write an entry atomically and enforce the size limit."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._memory[key] = data
+        self._evict()
+
+    def _touch(self, path):
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Delete least recently used files until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            key = os.path.splitext(os.path.basename(path))[0]
+            with self._lock:
+                self._memory.pop(key, None)
+
+    def prewarm(self, texts, lang="kn", voice=None):
+        """Synthesise every text ahead of time; returns how many were newly synthesised."""
+        before = self.misses
+        for text in texts:
+            if str(text).strip() and str(text) != "None":
+                try:
+                    self.get(text, lang, voice)
+                except Exception as e:
+                    print(f"⚠️ Could not pre-warm '{text}': {e}")
+        return self.misses - before
+
+    def prewarm_from_model(self, model, lang="kn", voice=None):
+        """Pre-warm every class label of a loaded classifier."""
+        return self.prewarm([str(label) for label in getattr(model, "classes_", [])], lang, voice)
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_tts_cache():
+    """Shared process-wide cache instance."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = TTSCache()
+        return _default_cache
+
+
+def prewarm_in_background(model, lang="kn"):
+    """Pre-warm the shared cache from a model's labels without blocking the caller."""
+    thread = threading.Thread(target=get_tts_cache().prewarm_from_model, args=(model, lang), daemon=True)
+    thread.start()
+    return thread
+